@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import make_operations
+from src.accounts import aggregate_accounts
+from src.accounts import list_statements
+
+DATE = "2021-12-20 23:59:59"
+
+
+def main(n_accounts: int = 16, n_rows: int = 50_000) -> None:
+    """
+    Разбор и агрегация каталога выписок при разном числе процессов: строк в секунду и ускорение
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        for account in range(n_accounts):
+            make_operations(n_rows, seed=account, raw=True).to_csv(Path(tmp) / f"account_{account}.csv", index=False)
+        paths = list_statements(tmp)
+
+        workers = 1
+        single = None
+        print(f"Счетов: {n_accounts}, строк в выписке: {n_rows}, ядер: {os.cpu_count()}")
+        while workers <= max(os.cpu_count() or 1, 2):
+            start = time.perf_counter()
+            aggregate_accounts(paths, DATE, max_workers=workers, use_cache=False)
+            elapsed = time.perf_counter() - start
+            single = single or elapsed
+            rate = n_accounts * n_rows / elapsed
+            print(f"  процессов {workers:>3}: {elapsed:7.2f} s, {rate:10.0f} строк/с (x{single / elapsed:.1f})")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+import sys
+import timeit
+from typing import Callable
+
+from benchmarks.synthetic import make_operations
+from src import memo
+from src.dataset import Snapshot
+from src.memo import ResultCache
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+
+DATE = "2021-12-20 23:59:59"
+
+
+def _best_ms(func: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main(n_rows: int = 1_000_000) -> None:
+    """
+    Задержка одного вызова get_cards и get_cash_month движками pandas и numpy
+    на маленьком (месяц) и большом (вся таблица) окне
+    """
+    memo.result_cache = ResultCache(max_size=0)
+    operations = make_operations(n_rows)
+    snapshot = Snapshot(operations, version="bench")
+    snapshot.cube
+    windows = {
+        "get_cards (месяц)": (get_cards, (get_filter_date_df(snapshot, DATE),), 200),
+        "get_cards (вся таблица)": (get_cards, (operations,), 3),
+        "get_cash_month (снимок)": (get_cash_month, (snapshot, 2021, 6), 200),
+        "get_cash_month (таблица)": (get_cash_month, (operations, 2021, 6), 10),
+    }
+
+    print(f"Строк: {n_rows}")
+    for name, (func, args, number) in windows.items():
+        pandas_ms = _best_ms(lambda: func(*args, backend="pandas"), number)
+        numpy_ms = _best_ms(lambda: func(*args, backend="numpy"), number)
+        print(f"  {name:>26}: pandas {pandas_ms:8.2f} ms, numpy {numpy_ms:8.2f} ms (x{pandas_ms / numpy_ms:.1f})")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,37 @@
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_operations
+from src.dataset import Snapshot
+from src.reports import spending_by_categories
+from src.reports import spending_by_category
+
+
+def main(n_rows: int = 1_000_000) -> None:
+    """
+    Траты по всем категориям на каждый конец месяца: цикл одиночных вызовов против одного пакетного
+    """
+    snapshot = Snapshot(make_operations(n_rows), version="bench")
+    categories = sorted(snapshot.operations["Категория"].dropna().unique())
+    dates = [str(date) for date in pd.date_range("2019-04-30", "2021-12-31", freq="ME")]
+    snapshot.cube
+
+    start = time.perf_counter()
+    for date in dates:
+        for category in categories:
+            spending_by_category(snapshot, category, date)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    spending_by_categories(snapshot, categories, dates)
+    bulk = time.perf_counter() - start
+
+    print(f"Строк: {n_rows}, дат: {len(dates)}, категорий: {len(categories)}")
+    print(f"  одиночные вызовы: {loop * 1000:8.0f} ms")
+    print(f"  пакетный вызов:   {bulk * 1000:8.0f} ms  (x{loop / bulk:.0f})")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
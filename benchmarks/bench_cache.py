@@ -0,0 +1,35 @@
+import time
+
+import config
+from src.cache import get_cache_path
+from src.utils import read_excel
+
+
+def main() -> None:
+    """
+    Сравнение холодной загрузки xlsx и тёплой загрузки из колоночного кэша
+    """
+    path_xl = str(config.PATH_TO_OPERATIONS)
+    get_cache_path(path_xl).unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    read_excel(path_xl)
+    cold_xlsx = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_excel(path_xl, use_cache=True)
+    cold_cache = time.perf_counter() - start
+
+    warm = []
+    for _ in range(10):
+        start = time.perf_counter()
+        read_excel(path_xl, use_cache=True)
+        warm.append(time.perf_counter() - start)
+
+    print(f"xlsx без кэша:          {cold_xlsx * 1000:.1f} ms")
+    print(f"xlsx + запись кэша:     {cold_cache * 1000:.1f} ms")
+    print(f"тёплый кэш (min из 10): {min(warm) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from benchmarks.synthetic import make_operations
+from src.cache import load_frame
+from src.cache import save_frame
+from src.columnar import export_columns
+from src.columnar import open_columns
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import get_top
+
+DATE = "2021-12-20 23:59:59"
+
+
+def _memory_kib() -> dict:
+    """
+    Rss и Pss процесса (Pss делит общие страницы между процессами, которые их отображают)
+    """
+    memory = {}
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss"):
+                memory[name] = int(value.split()[0])
+    return memory
+
+
+def _read_stats(process: "subprocess.Popen[str]") -> List[float]:
+    """
+    Строка замеров, которую печатает worker: время загрузки, Rss и Pss в КиБ
+    """
+    line = process.stdout.readline() if process.stdout is not None else ""
+    return [float(value) for value in line.split()]
+
+
+def worker(mode: str, path: str) -> None:
+    start = time.perf_counter()
+    operations = open_columns(Path(path)) if mode == "mmap" else load_frame(Path(path))
+    month = get_filter_date_df(operations, DATE)
+    get_cards(month)
+    get_top(month)
+    memory = _memory_kib()
+    print(f"{time.perf_counter() - start:.3f} {memory['Rss']} {memory['Pss']}", flush=True)
+    sys.stdin.read()
+
+
+def main(n_workers: int = 4, n_rows: int = 2_000_000) -> None:
+    """
+    Память n_workers процессов, каждый из которых держит таблицу операций:
+    своя копия из колоночного кэша .npz против общего отображённого в память файла
+    """
+    operations = make_operations(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"npz": Path(tmp) / "operations.npz", "mmap": Path(tmp) / "operations.columns"}
+        save_frame(operations, paths["npz"], {})
+        export_columns(operations, paths["mmap"], "bench")
+        del operations
+
+        print(f"Процессов: {n_workers}, строк: {n_rows}")
+        for mode, path in paths.items():
+            command = [sys.executable, "-m", "benchmarks.bench_columnar", "worker", mode, str(path)]
+            workers = [
+                subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                for _ in range(n_workers)
+            ]
+            stats = [_read_stats(process) for process in workers]
+            for process in workers:
+                process.communicate("")
+            load = max(stat[0] for stat in stats)
+            rss = sum(stat[1] for stat in stats) / 1024
+            pss = sum(stat[2] for stat in stats) / 1024
+            print(f"  {mode:>4}: загрузка {load:6.2f} s, сумма Rss {rss:8.0f} MiB, сумма Pss {pss:8.0f} MiB")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["worker"]:
+        worker(*sys.argv[2:4])
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,41 @@
+import sys
+import time
+from typing import Callable
+
+from benchmarks.synthetic import make_operations
+from src import memo
+from src.dataset import Snapshot
+from src.memo import ResultCache
+from src.reports import spending_by_category
+from src.services import get_cash_month
+
+
+def per_call_ms(func: Callable[[], object], repeat: int = 10) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(n_rows: int = 3_000_000) -> None:
+    """
+    Агрегация по строкам окна против готового куба (месяц, категория, карта, статус)
+    """
+    memo.result_cache = ResultCache(max_size=0)  # измеряется расчёт, а не повторная выдача результата
+    operations = make_operations(n_rows)
+    snapshot = Snapshot(operations, version="bench")
+
+    start = time.perf_counter()
+    cube = snapshot.cube
+    print(f"Строк: {n_rows}, ячеек куба: {len(cube)}, построение: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for name, data in (("строки", operations), ("куб", snapshot)):
+        cash_ms = per_call_ms(lambda: get_cash_month(data, 2021, 6))
+        spend_ms = per_call_ms(lambda: spending_by_category(data, "Супермаркеты", "2021-12-20"))
+        print(f"{name:>7}: get_cash_month {cash_ms:.2f} ms, spending_by_category {spend_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,37 @@
+import sys
+import time
+from typing import Callable
+
+from benchmarks.synthetic import make_operations
+from src.dataset import Snapshot
+from src.index import slice_by_date
+from src.utils import get_filter_date_df
+
+
+def per_call_ms(func: Callable[[], object], repeat: int = 10) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(n_rows: int = 3_000_000) -> None:
+    """
+    Полный просмотр булевой маской против бинарного поиска по отсортированной дате
+    """
+    indexed = make_operations(n_rows)
+    snapshot = Snapshot(indexed, version="bench", date_sorted=True)
+    print(f"Строк: {n_rows}")
+
+    for name, operations, sorted_by_date in (("маска", indexed, False), ("searchsorted", snapshot, True)):
+        filter_ms = per_call_ms(lambda: get_filter_date_df(operations, "2021-12-20 23:59:59"))
+        slice_ms = per_call_ms(
+            lambda: slice_by_date(indexed, "2021-12-01", "2021-12-20 23:59:59", "both", sorted_by_date)
+        )
+        print(f"{name:>12}: get_filter_date_df {filter_ms:.2f} ms, slice_by_date {slice_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
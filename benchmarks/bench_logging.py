@@ -0,0 +1,46 @@
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from src.logging_config import setup_logging
+from src.logging_config import shutdown_logging
+
+logger_bench = logging.getLogger("bench")
+
+
+def per_call_ns(func: Callable[[int], None], n_calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(n_calls):
+        func(i)
+    return (time.perf_counter() - start) / n_calls * 1e9
+
+
+def main(n_calls: int = 200_000) -> None:
+    """
+    Стоимость одного вызова логгера: синхронная запись в файл против очереди с фоновым потоком
+    """
+    date = "2021-12-20 12:00:00"
+    calls = {
+        "info, f-строка": lambda i: logger_bench.info(f"Function run for {date}: {i}"),
+        "info, %-формат": lambda i: logger_bench.info("Function run for %s: %s", date, i),
+        "debug при INFO": lambda i: logger_bench.debug("Function run for %s: %s", date, i),
+    }
+    baseline = per_call_ns(lambda i: None, n_calls)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for use_queue in (False, True):
+            setup_logging("INFO", Path(tmp) / "bench.log", use_queue=use_queue)
+            mode = "очередь" if use_queue else "синхронно"
+            for name, call in calls.items():
+                print(f"{mode:>10}, {name:<15}: {per_call_ns(call, n_calls) - baseline:8.0f} ns/вызов")
+            start = time.perf_counter()
+            shutdown_logging()
+            print(f"{mode:>10}: дописывание очереди при остановке {(time.perf_counter() - start) * 1000:.0f} ms")
+        logging.getLogger().handlers.clear()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,36 @@
+import sys
+import timeit
+from typing import Callable
+
+from benchmarks.synthetic import make_operations
+from src.dataset import Snapshot
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+
+DATE = "2021-12-20 23:59:59"
+
+
+def _best_ms(func: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main(*sizes: int) -> None:
+    """
+    Задержка get_cards за месяц по строкам (pandas, numpy) и по накопленным суммам снимка
+    при росте числа операций в месяце: по накопленным суммам она от него не зависит
+    """
+    for n_rows in sizes or (100_000, 1_000_000, 3_000_000):
+        snapshot = Snapshot(make_operations(n_rows), version="bench")
+        snapshot.card_prefix
+        month_rows = len(get_filter_date_df(snapshot, DATE))
+        pandas_ms = _best_ms(lambda: get_cards(get_filter_date_df(snapshot, DATE), backend="pandas"), 20)
+        numpy_ms = _best_ms(lambda: get_cards(get_filter_date_df(snapshot, DATE), backend="numpy"), 20)
+        prefix_ms = _best_ms(lambda: get_cards(snapshot, date=DATE), 200)
+        print(
+            f"Строк {n_rows:>9}, в месяце {month_rows:>7}: pandas {pandas_ms:7.2f} ms, "
+            f"numpy {numpy_ms:7.2f} ms, накопленные суммы {prefix_ms:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,43 @@
+import time
+from typing import Callable
+
+import config
+from src.reports import spending_by_category
+from src.schema import normalize_operations
+from src.services import get_cash_month
+from src.utils import get_filter_date_df
+from src.utils import read_excel
+
+
+def per_call_ms(func: Callable[[], object], repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    """
+    Память и время одного вызова на сырой таблице (даты-строки разбираются при каждом вызове)
+    и на таблице, приведённой к схеме при загрузке
+    """
+    raw = read_excel(str(config.PATH_TO_OPERATIONS), use_cache=True)
+    normalized = normalize_operations(raw)
+
+    print(f"Память, сырая таблица:     {raw.memory_usage(deep=True).sum() / 2**20:.2f} MiB")
+    print(f"Память, типизированная:    {normalized.memory_usage(deep=True).sum() / 2**20:.2f} MiB")
+
+    for name, df in (("сырая", raw), ("типизированная", normalized)):
+        filter_ms = per_call_ms(lambda: get_filter_date_df(df, "2021-12-20 23:59:59"))
+        cash_ms = per_call_ms(lambda: get_cash_month(df, 2021, 12))
+        spend_ms = per_call_ms(lambda: spending_by_category(df, "Супермаркеты", "2021-12-20"))
+        print(
+            f"{name:>15}: get_filter_date_df {filter_ms:.2f} ms, "
+            f"get_cash_month {cash_ms:.2f} ms, spending_by_category {spend_ms:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
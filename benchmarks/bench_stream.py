@@ -0,0 +1,63 @@
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import make_operations
+from src.reports import spending_by_category
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import iter_excel
+from src.utils import iter_filter_date
+from src.utils import read_excel
+
+
+def write_xlsx(path: Path, n_rows: int) -> None:
+    import openpyxl
+
+    operations = make_operations(n_rows, raw=True)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(operations.columns))
+    for row in operations.itertuples(index=False):
+        sheet.append([None if value != value else value for value in row])
+    workbook.save(path)
+
+
+def run(mode: str, path_xlsx: str) -> None:
+    """
+    Выполняет три отчёта по файлу целиком (full) или по частям (stream) и печатает пиковый RSS
+    """
+    date = "2021-12-20 23:59:59"
+    start = time.perf_counter()
+    if mode == "full":
+        operations = read_excel(path_xlsx)
+        get_cards(get_filter_date_df(operations, date))
+        get_cash_month(operations, 2021, 6)
+        spending_by_category(operations, "Супермаркеты", "2021-12-20")
+    else:
+        get_cards(iter_filter_date(iter_excel(path_xlsx), date))
+        get_cash_month(iter_excel(path_xlsx), 2021, 6)
+        spending_by_category(iter_excel(path_xlsx), "Супермаркеты", "2021-12-20")
+    elapsed = time.perf_counter() - start
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>6}: peak RSS {peak_mib:.0f} MiB, {elapsed:.1f} s")
+
+
+def main(n_rows: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path_xlsx = Path(tmp) / "operations.xlsx"
+        write_xlsx(path_xlsx, n_rows)
+        print(f"Строк: {n_rows}, файл: {path_xlsx.stat().st_size / 2**20:.1f} MiB")
+        for mode in ("full", "stream"):
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_stream", mode, str(path_xlsx)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] in ("full", "stream"):
+        run(sys.argv[1], sys.argv[2])
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,54 @@
+import sys
+import time
+from typing import Callable
+
+from pandas import DataFrame
+
+from benchmarks.synthetic import make_operations
+from src.utils import get_top
+from src.utils import get_top_grouped
+
+
+def get_top_sorted(df: DataFrame, top: int = 5) -> list[dict]:
+    """
+    Прежняя реализация: полная сортировка и форматирование дат построчно
+    """
+    df = df[df["Статус"] == "OK"]
+    df_top = df.sort_values(by="Сумма операции с округлением", ascending=False)[:top]
+    df_top = df_top[["Дата операции", "Сумма платежа", "Категория", "Описание"]]
+    df_top["Дата операции"] = df_top["Дата операции"].apply(lambda x: x.strftime("%d.%m.%Y"))
+    records: list[dict] = df_top.rename(
+        columns={
+            "Дата операции": "date",
+            "Сумма платежа": "amount",
+            "Категория": "category",
+            "Описание": "description",
+        }
+    ).to_dict("records")
+    return records
+
+
+def best_ms(func: Callable[[], object], repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(n_rows: int = 1_000_000) -> None:
+    operations = make_operations(n_rows)
+    print(f"Строк: {n_rows}")
+    print(f"  sort_values, top-5:          {best_ms(lambda: get_top_sorted(operations)):8.1f} ms")
+    print(f"  get_top, top-5:              {best_ms(lambda: get_top(operations)):8.1f} ms")
+    chunks = [
+        operations.iloc[start:end]
+        for start, end in zip(range(0, n_rows, 100_000), range(100_000, n_rows + 100_000, 100_000))
+    ]
+    print(f"  get_top по частям, top-5:    {best_ms(lambda: get_top(iter(chunks))):8.1f} ms")
+    print(f"  get_top_grouped, top-3 x3:   {best_ms(lambda: get_top_grouped(operations)):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,85 @@
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import requests
+
+PATHS = [
+    "/dashboard?date=2021-12-20 23:59:59",
+    "/cashback?year=2021&month=6",
+    "/spending?category=Супермаркеты&date=2021-12-20",
+    "/health",
+]
+
+
+def percentile(latencies: List[float], q: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def run_client(url: str, n_requests: int, offset: int) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {path.split("?")[0]: [] for path in PATHS}
+    with requests.Session() as session:
+        for i in range(n_requests):
+            path = PATHS[(offset + i) % len(PATHS)]
+            start = time.perf_counter()
+            response = session.get(url + path, timeout=30)
+            response.raise_for_status()
+            latencies[path.split("?")[0]].append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def load_test(url: str, clients: int, n_requests: int) -> None:
+    """
+    clients параллельных клиентов, каждый делает n_requests запросов по кругу из PATHS
+    """
+    run_client(url, len(PATHS), 0)  # прогрев: загрузка таблицы и куба
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        results = list(executor.map(run_client, [url] * clients, [n_requests] * clients, range(clients)))
+    elapsed = time.perf_counter() - start
+
+    by_path: Dict[str, List[float]] = {}
+    for result in results:
+        for path, latencies in result.items():
+            by_path.setdefault(path, []).extend(latencies)
+    total = [latency for latencies in by_path.values() for latency in latencies]
+
+    print(f"Клиентов: {clients}, запросов: {len(total)}, {len(total) / elapsed:.0f} req/s")
+    for path, latencies in [*by_path.items(), ("всего", total)]:
+        print(
+            f"{path:>12}: p50 {statistics.median(latencies):6.1f} ms, "
+            f"p99 {percentile(latencies, 99):6.1f} ms, max {max(latencies):6.1f} ms"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP-сервиса отчётов")
+    parser.add_argument("--url", help="адрес запущенного сервиса; по умолчанию сервис поднимается в этом процессе")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="запросов на клиента")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        load_test(args.url.rstrip("/"), args.clients, args.requests)
+        return
+
+    from src.server import DashboardServer
+
+    server = DashboardServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        load_test(f"http://127.0.0.1:{server.server_address[1]}", args.clients, args.requests)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from unittest.mock import patch
+
+from benchmarks.synthetic import make_operations
+from src import memo
+from src.dataset import Snapshot
+from src.memo import ResultCache
+from src.reports import spending_by_category
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import get_top
+from src.utils import read_excel
+from src.views import str_main
+
+PATH_TO_BASELINES = Path(__file__).parent / "baselines.json"
+SIZES = [10_000, 100_000, 1_000_000]
+MAX_EXCEL_ROWS = 100_000  # запись и разбор xlsx большего размера занимают минуты
+DATE = "2021-12-20 23:59:59"
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def measure(func: Callable[[], Any], repeat: int, warm_up: bool = True) -> Dict[str, float]:
+    """
+    Лучшее время из repeat запусков и пик памяти, выделенной за один запуск (tracemalloc).
+    Память измеряется отдельным запуском, чтобы трассировка не искажала время
+    """
+    if warm_up:
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(min(timings) * 1000, 3), "peak_mib": round(peak / 2**20, 3)}
+
+
+def cases(n_rows: int, tmp: Path, with_excel: bool = True) -> Dict[str, Callable[[], Any]]:
+    operations = make_operations(n_rows)
+    snapshot = Snapshot(operations, version=f"bench-{n_rows}")
+    snapshot.cube
+    month = get_filter_date_df(snapshot, DATE)
+    currency = [{"currency": "USD", "rate": 90.0}]
+    stock = [{"stock": "AAPL", "price": 150.0}]
+
+    def dashboard() -> Any:
+        with patch("src.views.get_snapshot", return_value=snapshot), patch(
+            "src.views.get_currency", return_value=currency
+        ), patch("src.views.get_stock", return_value=stock):
+            return str_main(DATE, deadline=600)
+
+    result = {
+        "get_filter_date_df": lambda: get_filter_date_df(snapshot, DATE),
+        "get_cards": lambda: get_cards(operations),
+        "get_cards (месяц)": lambda: get_cards(month),
+        "get_top": lambda: get_top(operations),
+        "get_cash_month": lambda: get_cash_month(snapshot, 2021, 6),
+        "spending_by_category": lambda: spending_by_category(snapshot, "Супермаркеты", "2021-12-20"),
+        "str_main": dashboard,
+    }
+    if with_excel and n_rows <= MAX_EXCEL_ROWS:
+        from benchmarks.bench_stream import write_xlsx
+
+        path_xlsx = tmp / f"operations_{n_rows}.xlsx"
+        write_xlsx(path_xlsx, n_rows)
+        result["read_excel"] = lambda: read_excel(str(path_xlsx))
+    return result
+
+
+def run(sizes: List[int], only: Optional[List[str]] = None) -> Results:
+    """
+    Запускает все замеры: {функция: {число строк: {"ms": ..., "peak_mib": ...}}}.
+    Кэш результатов отчётов отключён, измеряется расчёт
+    """
+    memo.result_cache = ResultCache(max_size=0)
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in sizes:
+            for name, func in cases(n_rows, Path(tmp), not only or "read_excel" in only).items():
+                if only and name not in only:
+                    continue
+                repeat = 5 if n_rows <= 1_000_000 else 2
+                if name == "read_excel":
+                    results.setdefault(name, {})[str(n_rows)] = measure(func, 1, warm_up=False)
+                else:
+                    results.setdefault(name, {})[str(n_rows)] = measure(func, repeat)
+                stats = results[name][str(n_rows)]
+                print(f"{name:>22} {n_rows:>10}: {stats['ms']:10.2f} ms, {stats['peak_mib']:8.1f} MiB", flush=True)
+    return results
+
+
+def compare(results: Results, baselines: Results, threshold: float, min_ms: float = 1.0) -> List[str]:
+    """
+    Регрессии: время или пик памяти выросли больше чем на threshold (доля) относительно базовых.
+    Замеры короче min_ms по времени не сравниваются — их разброс больше порога
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for n_rows, stats in by_size.items():
+            base = baselines.get(name, {}).get(n_rows)
+            if base is None:
+                continue
+            if stats["ms"] >= min_ms and stats["ms"] > base["ms"] * (1 + threshold):
+                regressions.append(f"{name} [{n_rows}]: {base['ms']:.2f} -> {stats['ms']:.2f} ms")
+            if stats["peak_mib"] > base["peak_mib"] * (1 + threshold) + 0.5:
+                regressions.append(f"{name} [{n_rows}]: {base['peak_mib']:.1f} -> {stats['peak_mib']:.1f} MiB")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    python -m benchmarks.suite [--sizes 10000,100000,1000000,10000000] [--save | --check] [--threshold 0.3]
+    """
+    parser = argparse.ArgumentParser(description="Замеры времени и памяти публичных функций на синтетических данных")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--only", help="через запятую: имена функций")
+    parser.add_argument("--save", action="store_true", help="записать результаты как базовые")
+    parser.add_argument("--check", action="store_true", help="сравнить с базовыми, код возврата 1 при регрессии")
+    parser.add_argument("--threshold", type=float, default=0.3, help="допустимый рост относительно базовых")
+    parser.add_argument("--baselines", type=Path, default=PATH_TO_BASELINES)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.only.split(",") if args.only else None)
+
+    if args.save:
+        baselines = json.loads(args.baselines.read_text(encoding="utf-8")) if args.baselines.exists() else {}
+        for name, by_size in results.items():
+            baselines.setdefault(name, {}).update(by_size)
+        args.baselines.write_text(json.dumps(baselines, ensure_ascii=False, indent=4) + "\n", encoding="utf-8")
+        print(f"Базовые значения записаны в {args.baselines}")
+
+    if args.check:
+        baselines = json.loads(args.baselines.read_text(encoding="utf-8"))
+        regressions = compare(results, baselines, args.threshold)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"Регрессий нет (порог {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
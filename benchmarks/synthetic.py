@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.index import sort_by_date
+from src.schema import DATE_FORMAT
+from src.schema import normalize_operations
+
+CARDS = ["*7197", "*5091", "*4556", "*1112", "*5507", "*6002", "*5441", "*3348"]
+CATEGORIES = {
+    "Супермаркеты": (5411, ["Колхоз", "Магнит", "Пятёрочка", "Перекрёсток"]),
+    "Фастфуд": (5814, ["Макдоналдс", "KFC", "Шаурма"]),
+    "Транспорт": (4111, ["Метро", "Яндекс Такси", "Автобус"]),
+    "Рестораны": (5812, ["Ресторан", "Кафе"]),
+    "Аптеки": (5912, ["Аптека Ригла", "Аптека 36.6"]),
+    "Одежда и обувь": (5651, ["Спортмастер", "Zara"]),
+    "Связь": (4814, ["МТС", "Билайн"]),
+    "Развлечения": (7832, ["Кинотеатр", "Боулинг"]),
+    "Переводы": (6538, ["Перевод с карты"]),
+    "Каршеринг": (7512, ["Ситидрайв", "Делимобиль"]),
+    "Цветы": (5992, ["Цветочный"]),
+    "Топливо": (5541, ["Лукойл", "Роснефть"]),
+}
+CURRENCIES = ["RUB", "USD", "EUR", "CNY", "TRY"]
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return weights / float(weights.sum())
+
+
+def make_operations(n_rows: int, seed: int = 0, years: int = 3, raw: bool = False) -> DataFrame:
+    """
+    Синтетическая выписка со схемой operations.xlsx.
+    Карты и категории распределены по закону Ципфа, 98% операций успешны,
+    даты равномерно покрывают years лет до конца 2021 года.
+    raw=True возвращает таблицу как после pd.read_excel (даты и категории строками),
+    иначе — нормализованную и отсортированную по дате
+    """
+    rng = np.random.default_rng(seed)
+
+    end = np.datetime64("2022-01-01T00:00:00", "s")
+    span = years * 365 * 24 * 3600
+    dates = pd.to_datetime(end - rng.integers(1, span, n_rows).astype("timedelta64[s]")).astype("datetime64[ns]")
+
+    category_names = list(CATEGORIES)
+    category_idx = rng.choice(len(category_names), n_rows, p=_zipf_weights(len(category_names)))
+    mcc = np.array([CATEGORIES[name][0] for name in category_names], dtype=float)[category_idx]
+    description_names = [d for name in category_names for d in CATEGORIES[name][1]]
+    first_description = np.cumsum([0] + [len(CATEGORIES[name][1]) for name in category_names])
+    sizes = np.diff(first_description)
+    description_idx = first_description[category_idx] + (rng.random(n_rows) * sizes[category_idx]).astype(np.int64)
+
+    card_idx = rng.choice(len(CARDS), n_rows, p=_zipf_weights(len(CARDS)))
+    status_idx = (rng.random(n_rows) >= 0.98).astype(np.int64)
+    currency_idx = rng.choice(len(CURRENCIES), n_rows, p=[0.9, 0.04, 0.03, 0.02, 0.01])
+
+    amount = -np.round(rng.lognormal(mean=6.0, sigma=1.2, size=n_rows), 2)
+    income = rng.random(n_rows) < 0.05
+    amount[income] = -amount[income]
+    rounded = np.abs(amount)
+    cashback = np.where((rng.random(n_rows) < 0.1) & ~income, np.round(rounded / 100), np.nan)
+    bonuses = np.floor(rounded / 100).astype(np.int64)
+
+    def column(names: list, codes: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes, categories=names)
+
+    operations = DataFrame(
+        {
+            "Дата операции": dates,
+            "Дата платежа": dates.strftime("%d.%m.%Y") if raw else dates.normalize(),
+            "Номер карты": column(CARDS, card_idx),
+            "Статус": column(["OK", "FAILED"], status_idx),
+            "Сумма операции": amount,
+            "Валюта операции": column(CURRENCIES, currency_idx),
+            "Сумма платежа": amount,
+            "Валюта платежа": "RUB",
+            "Кэшбэк": cashback,
+            "Категория": column(category_names, category_idx),
+            "MCC": mcc,
+            "Описание": np.array(description_names, dtype=object)[description_idx],
+            "Бонусы (включая кэшбэк)": bonuses,
+            "Округление на инвесткопилку": 0,
+            "Сумма операции с округлением": rounded,
+        }
+    )
+    if raw:
+        operations["Дата операции"] = dates.strftime(DATE_FORMAT)
+        for col in ["Номер карты", "Статус", "Валюта операции", "Категория"]:
+            operations[col] = operations[col].astype(object)
+        return operations
+    return sort_by_date(normalize_operations(operations))
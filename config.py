@@ -4,3 +4,32 @@ PATH = Path(__file__).parent  # путь к корню проекта
 PATH_TO_OPERATIONS = PATH / "data" / "operations.xlsx"
 PATH_TO_USER_SETTINGS = PATH / "user_settings.json"
 PATH_TO_LOGGER = PATH / "logs"
+AMOUNT_DTYPE = "float64"  # тип денежных колонок: "float64" или "float32"
+PATH_TO_INGESTED = PATH / "data" / "ingested.npz"  # строки, добавленные командой python -m src.ingest
+HTTP_TIMEOUT = 10  # таймаут одного запроса к API курсов и акций, секунды
+HTTP_MAX_WORKERS = 8  # максимум одновременных запросов к API
+PATH_TO_QUOTE_CACHE = PATH / "data" / "quotes.json"  # кэш курсов валют и котировок акций
+QUOTE_TTL = {"currency": 3600, "stock": 300}  # время жизни, секунды; можно задать и для символа: "stock:TSLA"
+QUOTE_CACHE_SIZE = 256
+QUOTE_STALE_WHILE_REVALIDATE = True  # отдавать устаревшую котировку, пока свежая загружается в фоне
+DASHBOARD_DEADLINE = 5.0  # общий бюджет времени str_main, секунды
+DASHBOARD_MAX_WORKERS = 4  # потоки расчёта по операциям в str_main, общие для всех запросов
+DASHBOARD_API_WORKERS = 4  # потоки запросов str_main к каждому API (курсы, акции), общие для всех запросов
+SERVER_HOST = "127.0.0.1"  # адрес HTTP-сервиса python -m src.server
+SERVER_PORT = 8000
+SERVER_RELOAD_INTERVAL = 2.0  # как часто сервис проверяет изменение operations.xlsx, секунды
+RESULT_CACHE_SIZE = 1024  # число запомненных результатов отчётов; 0 — не запоминать
+RESULT_CACHE_VERSIONS = 4  # сколько последних версий данных хранят запомненные результаты
+PATH_TO_RESULT_CACHE = None  # каталог для вытесненных результатов, например PATH / "data" / "results"
+LOG_LEVEL = "INFO"  # уровень логирования точек входа (main, server, ingest)
+PATH_TO_LOG_FILE = PATH_TO_LOGGER / "utils.log"
+LOG_QUEUE = True  # писать лог из фонового потока через очередь
+LOG_DEBUG_SAMPLE = 0.0  # доля DEBUG-записей, попадающих в лог при уровне выше DEBUG
+PATH_TO_TRACES = None  # разбивка запросов str_main по этапам (folded stacks): PATH_TO_LOGGER / "traces.folded"
+PATH_TO_METRICS = None  # выгрузка метрик: *.prom — формат Prometheus, *.jsonl — строки JSON
+PATH_TO_ACCOUNTS = PATH / "data" / "accounts"  # выписки счетов для python -m src.accounts, по файлу на счёт
+ACCOUNTS_MAX_WORKERS = None  # число процессов разбора выписок; None — по числу ядер
+PATH_TO_COLUMNS = None  # колоночный файл, общий для процессов сервиса, например PATH / "data" / "operations.columns"
+COMPUTE_BACKEND = "pandas"  # движок get_cards и get_cash_month: "pandas" или "numpy", ответы совпадают
+QUERY_MAX_WORKERS = 4  # потоки QueryExecutor для параллельных запросов отчётов
+QUERY_STREAM_RECENT = 1024  # сколько последних разных запросов QueryExecutor.stream помнит, чтобы не повторять
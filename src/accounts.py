@@ -0,0 +1,176 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+import config
+from src.cache import cached_read
+from src.cube import build_cube
+from src.index import sort_by_date
+from src.ingest import read_statement
+from src.logging_config import log_path
+from src.logging_config import setup_logging
+from src.logging_config import setup_worker_logging
+from src.metrics import inc
+from src.metrics import traced
+from src.schema import as_money
+from src.schema import normalize_operations
+from src.utils import card_records
+from src.utils import get_filter_date_df
+from src.utils import sum_by_card
+
+logger_accounts = logging.getLogger("accounts")
+
+STATEMENT_SUFFIXES = (".xlsx", ".csv")
+CARD_COLUMNS = ["Сумма операции с округлением", "Кэшбэк"]
+
+
+@dataclass(frozen=True)
+class AccountPartials:
+    """
+    Частичные агрегаты одной выписки. Суммы разных счетов складываются без исходных строк:
+    cards — расходы и кешбэк по картам (индекс — номер карты),
+    cashback — кешбэк по (месяц "YYYY-MM", категория)
+    """
+
+    account: str
+    rows: int
+    cards: DataFrame
+    cashback: pd.Series
+
+
+def list_statements(directory: str | Path) -> List[Path]:
+    """
+    Выписки (xlsx и csv) в каталоге, по одной на счёт; имя счёта — имя файла без расширения
+    """
+    return sorted(
+        path for path in Path(directory).iterdir() if path.is_file() and path.suffix.lower() in STATEMENT_SUFFIXES
+    )
+
+
+def _monthly_cashback(operations: DataFrame) -> pd.Series:
+    cube = build_cube(operations)
+    if "cashback_count" not in cube or "Статус" not in cube:
+        return pd.Series(dtype="float64", index=pd.MultiIndex.from_arrays([[], []], names=["month", "Категория"]))
+    cells = cube[(cube["cashback_count"] > 0) & (cube["Статус"] == "OK")]
+    cells = cells.assign(month=cells["month"].dt.strftime("%Y-%m"), Категория=cells["Категория"].astype(str))
+    return cells.groupby(["month", "Категория"])["cashback_positive"].sum()
+
+
+def account_partials(
+    path_statement: str, date: Optional[str] = None, use_cache: bool = True
+) -> AccountPartials | None:
+    """
+    Разбирает выписку счёта и считает её частичные агрегаты.
+    Суммы по картам — с начала месяца даты date по date (как в get_cards), без date — за всю выписку.
+    При use_cache=True разобранная выписка берётся из колоночного кэша рядом с файлом
+    """
+    account = Path(path_statement).stem
+    if not os.path.exists(path_statement) or os.path.getsize(path_statement) == 0:
+        logger_accounts.error("Statement %s does not exist or is empty", path_statement)
+        return None
+    try:
+        operations = cached_read(path_statement, read_statement) if use_cache else read_statement(path_statement)
+        operations = sort_by_date(normalize_operations(operations))
+        rows = operations if date is None else get_filter_date_df(operations, date)
+        cards = sum_by_card(rows) if rows is not None and not rows.empty else DataFrame(columns=CARD_COLUMNS)
+        cards.index = cards.index.astype(str)
+        partials = AccountPartials(account, len(operations), cards, _monthly_cashback(operations))
+    except Exception as e:
+        logger_accounts.error("Statement %s failed: %s", path_statement, e)
+        return None
+    logger_accounts.info("Account %s: %s rows aggregated", account, partials.rows)
+    return partials
+
+
+def merge_partials(partials: Iterable[AccountPartials]) -> AccountPartials:
+    """
+    Складывает частичные агрегаты счетов; совпадающие карты и (месяц, категория) суммируются
+    """
+    partials = list(partials)
+    cards = pd.concat([part.cards for part in partials]).groupby(level=0).sum()
+    cashback = pd.concat([part.cashback for part in partials]).groupby(level=[0, 1]).sum()
+    return AccountPartials("total", sum(part.rows for part in partials), cards, cashback)
+
+
+def account_report(partials: AccountPartials) -> Dict[str, Any]:
+    """
+    {"rows": ..., "cards": ответ get_cards, "cashback": {"YYYY-MM": {категория: кешбэк}}}
+    """
+    cashback: Dict[str, Dict[str, float]] = {}
+    for (month, category), value in as_money(partials.cashback).items():
+        cashback.setdefault(month, {})[category] = value
+    return {"rows": partials.rows, "cards": card_records(partials.cards), "cashback": cashback}
+
+
+@traced()
+def aggregate_accounts(
+    paths: Iterable[str | Path],
+    date: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Агрегаты по нескольким выпискам: {"accounts": {счёт: отчёт}, "total": отчёт, "failed": [файлы]}.
+    Выписки разбираются и агрегируются параллельно в пуле процессов
+    (max_workers, по умолчанию config.ACCOUNTS_MAX_WORKERS или число ядер);
+    из процессов возвращаются только частичные суммы, которые складываются здесь
+    """
+    statements = [str(path) for path in paths]
+    workers = min(max_workers or config.ACCOUNTS_MAX_WORKERS or os.cpu_count() or 1, len(statements))
+    logger_accounts.info("Aggregating %s statements with %s workers", len(statements), workers)
+    task = partial(account_partials, date=date, use_cache=use_cache)
+
+    if workers <= 1:
+        results = [task(path) for path in statements]
+    else:
+        # spawn, а не fork: в родителе работают фоновые потоки (лог, обновление снимка),
+        # и копия их блокировок в дочернем процессе может остаться захваченной навсегда
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=setup_worker_logging,
+            initargs=(log_path(),),
+        ) as executor:
+            results = list(executor.map(task, statements))
+
+    done = [partials for partials in results if partials is not None]
+    failed = [path for path, partials in zip(statements, results) if partials is None]
+    inc("rows_scanned", sum(partials.rows for partials in done), stage="accounts")
+    return {
+        "accounts": {partials.account: account_report(partials) for partials in done},
+        "total": account_report(merge_partials(done)) if done else None,
+        "failed": failed,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:  # pragma: no cover
+    """
+    python -m src.accounts [каталог] [--date "YYYY-MM-DD HH:MM:SS"] [--workers N]
+    """
+    parser = argparse.ArgumentParser(description="Расходы по картам и кешбэк по выпискам нескольких счетов")
+    parser.add_argument("directory", nargs="?", default=config.PATH_TO_ACCOUNTS)
+    parser.add_argument("--date", help="суммы по картам с начала месяца по эту дату")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    result = aggregate_accounts(list_statements(args.directory), args.date, args.workers)
+    print(json.dumps(result, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
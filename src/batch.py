@@ -0,0 +1,112 @@
+import argparse
+import contextlib
+import json
+import logging
+import sys
+from collections import deque
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TextIO
+
+from src.dataset import Snapshot
+from src.executor import QueryExecutor
+from src.logging_config import setup_logging
+from src.store import OperationsStore
+from src.store import operations_store
+
+logger_batch = logging.getLogger("batch")
+
+
+def _error(e: BaseException) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+def _result(result: Any) -> Any:
+    """
+    Отчёты get_cash_month и spending_by_category возвращают строку JSON — в ответ она попадает как значение
+    """
+    return json.loads(result) if isinstance(result, str) else result
+
+
+def write_results(
+    lines: Iterable[str], out: TextIO, executor: QueryExecutor, snapshot: Optional[Snapshot] = None
+) -> Dict[str, int]:
+    """
+    Читает запросы по строке JSON и пишет ответы строками JSON в порядке запросов:
+    {"line": номер строки, "query": запрос, "result": ответ} или {"line": ..., "error": "..."}.
+    Запросы выполняются по мере чтения (QueryExecutor.stream), поэтому файл не загружается в память целиком;
+    ошибка в одной строке не прерывает пакет
+    """
+    records: deque = deque()
+    stats = {"queries": 0, "errors": 0}
+
+    def queries() -> Iterator[Dict[str, Any]]:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                query = json.loads(line)
+            except ValueError as e:
+                records.append({"line": number, "error": _error(e)})
+                continue
+            records.append({"line": number, "query": query})
+            yield query
+
+    def write(record: Dict[str, Any]) -> None:
+        stats["queries"] += 1
+        stats["errors"] += "error" in record
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    for future in executor.stream(queries(), snapshot):
+        while "error" in records[0]:
+            write(records.popleft())
+        record = records.popleft()
+        try:
+            record["result"] = _result(future.result())
+        except Exception as e:
+            record["error"] = _error(e)
+        write(record)
+    while records:
+        write(records.popleft())
+
+    logger_batch.info("Batch done: %s queries, %s errors", stats["queries"], stats["errors"])
+    return stats
+
+
+def run_batch(
+    source: str,
+    output: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    store: OperationsStore = operations_store,
+) -> Dict[str, int]:
+    """
+    Пакетный режим: запросы из файла JSONL (source, "-" — stdin), ответы в файл JSONL (output, по умолчанию stdout).
+    Таблица загружается и индексируется один раз, все запросы читают один снимок
+    """
+    with contextlib.ExitStack() as stack:
+        lines = sys.stdin if source == "-" else stack.enter_context(open(source, encoding="utf-8"))
+        out = sys.stdout if output in (None, "-") else stack.enter_context(open(output, "w", encoding="utf-8"))
+        executor = stack.enter_context(QueryExecutor(max_workers=max_workers, store=store))
+        return write_results(lines, out, executor)
+
+
+def main(argv: Optional[List[str]] = None) -> None:  # pragma: no cover
+    """
+    python -m src.batch запросы.jsonl [--output ответы.jsonl] [--workers N]
+    """
+    parser = argparse.ArgumentParser(description="Пакетное выполнение запросов отчётов из файла JSONL")
+    parser.add_argument("source", help='файл запросов JSONL, "-" — stdin')
+    parser.add_argument("--output", help="файл ответов JSONL, по умолчанию stdout")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    run_batch(args.source, args.output, args.workers)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
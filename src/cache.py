@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.metrics import inc
+
+logger_cache = logging.getLogger("cache")
+
+CACHE_SUFFIX = ".cache.npz"
+CACHE_FORMAT = 1
+
+
+def get_cache_path(path_source: str) -> Path:
+    """
+    Возвращает путь к файлу кэша, который лежит рядом с исходным файлом
+    """
+    source = Path(path_source)
+    return source.with_name(source.stem + CACHE_SUFFIX)
+
+
+def file_hash(path_source: str) -> str:
+    """
+    Считает sha256 содержимого файла
+    """
+    digest = hashlib.sha256()
+    with open(path_source, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_source_key(path_source: str, with_hash: bool = True) -> Dict[str, Any]:
+    """
+    Ключ кэша: размер, время изменения и хэш содержимого исходного файла
+    """
+    stat = os.stat(path_source)
+    key: Dict[str, Any] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        key["sha256"] = file_hash(path_source)
+    return key
+
+
+def _encode_column(name: str, series: pd.Series, prefix: str, arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Переводит колонку в numpy-массивы фиксированной ширины.
+    Строковые колонки хранятся словарём: коды + уникальные значения
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        arrays[prefix + "_codes"] = series.cat.codes.to_numpy()
+        arrays[prefix + "_categories"] = np.asarray(series.cat.categories.astype(str), dtype=str)
+        return {"name": name, "kind": "category", "ordered": bool(series.cat.ordered)}
+
+    if series.dtype == object:
+        values = series.to_numpy()
+        mask = pd.isna(values)
+        if not all(isinstance(v, str) for v in values[~mask]):
+            raise TypeError(f"Column {name} contains non-string objects")
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        arrays[prefix + "_codes"] = codes.astype(np.int32)
+        arrays[prefix + "_categories"] = np.asarray(uniques, dtype=str)
+        return {"name": name, "kind": "object"}
+
+    arrays[prefix + "_values"] = series.to_numpy()
+    return {"name": name, "kind": "values"}
+
+
+def _decode_column(column: Dict[str, Any], prefix: str, arrays: Any) -> Any:
+    """
+    Восстанавливает колонку из numpy-массивов
+    """
+    if column["kind"] == "values":
+        return arrays[prefix + "_values"]
+
+    codes = arrays[prefix + "_codes"]
+    categories = arrays[prefix + "_categories"]
+    if column["kind"] == "category":
+        return pd.Categorical.from_codes(codes, categories=categories, ordered=column["ordered"])
+
+    values = categories.astype(object)[codes]
+    values[codes == -1] = np.nan
+    return values
+
+
+def save_frame(df: DataFrame, path_cache: Path, key: Dict[str, Any]) -> None:
+    """
+    Записывает таблицу в колоночный файл .npz вместе с ключом исходного файла
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    columns = [_encode_column(str(name), df[name], f"c{i}", arrays) for i, name in enumerate(df.columns)]
+    meta = {"format": CACHE_FORMAT, "key": key, "columns": columns}
+    arrays["__meta__"] = np.array(json.dumps(meta, ensure_ascii=False))
+
+    tmp_path = path_cache.with_name(path_cache.name + ".tmp")
+    members: Dict[str, Any] = dict(arrays)
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **members)
+    os.replace(tmp_path, path_cache)
+    logger_cache.info("Cache written: %s", path_cache)
+
+
+def load_meta(path_cache: Path) -> Optional[Dict[str, Any]]:
+    """
+    Читает служебные данные кэша без загрузки колонок
+    """
+    if not path_cache.exists():
+        return None
+    try:
+        with np.load(path_cache, allow_pickle=False) as arrays:
+            meta: Dict[str, Any] = json.loads(str(arrays["__meta__"]))
+    except Exception as e:
+        logger_cache.error("Cache is broken: %s", e)
+        return None
+    if meta.get("format") != CACHE_FORMAT:
+        return None
+    return meta
+
+
+def load_frame(path_cache: Path) -> DataFrame:
+    """
+    Читает таблицу из колоночного файла .npz
+    """
+    with np.load(path_cache, allow_pickle=False) as arrays:
+        meta = json.loads(str(arrays["__meta__"]))
+        data = {column["name"]: _decode_column(column, f"c{i}", arrays) for i, column in enumerate(meta["columns"])}
+    return DataFrame(data, columns=[column["name"] for column in meta["columns"]])
+
+
+def is_fresh(meta: Optional[Dict[str, Any]], path_source: str) -> bool:
+    """
+    Проверяет, соответствует ли кэш исходному файлу.
+    Если размер и время изменения совпали, хэш не пересчитывается
+    """
+    if meta is None:
+        return False
+    key = meta["key"]
+    current = get_source_key(path_source, with_hash=False)
+    if current["size"] != key["size"]:
+        return False
+    if current["mtime_ns"] == key["mtime_ns"]:
+        return True
+    return bool(file_hash(path_source) == key["sha256"])
+
+
+def cached_read(path_source: str, reader: Callable[[str], DataFrame]) -> DataFrame:
+    """
+    Возвращает таблицу из кэша, если он актуален, иначе читает исходный файл
+    через reader и пересобирает кэш.
+    Если файл был только «тронут» (время изменения новое, содержимое то же), в ключ кэша
+    записывается новое время изменения, чтобы следующие чтения не пересчитывали хэш
+    """
+    path_cache = get_cache_path(path_source)
+    meta = load_meta(path_cache)
+
+    if meta is not None and is_fresh(meta, path_source):
+        try:
+            df = load_frame(path_cache)
+            logger_cache.info("Cache hit: %s", path_cache)
+            inc("cache_hits", cache="file")
+        except Exception as e:
+            logger_cache.error("Cache read error: %s", e)
+        else:
+            current = get_source_key(path_source, with_hash=False)
+            if current["mtime_ns"] != meta["key"]["mtime_ns"]:
+                try:
+                    save_frame(df, path_cache, {**meta["key"], **current})
+                except (OSError, TypeError, ValueError) as e:
+                    logger_cache.error("Cache write error: %s", e)
+            return df
+
+    logger_cache.info("Cache miss: %s", path_source)
+    inc("cache_misses", cache="file")
+    key = get_source_key(path_source)
+    df = reader(path_source)
+    try:
+        save_frame(df, path_cache, key)
+    except (OSError, TypeError, ValueError) as e:
+        logger_cache.error("Cache write error: %s", e)
+    return df
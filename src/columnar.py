@@ -0,0 +1,153 @@
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.index import is_sorted_by_date
+from src.index import sort_by_date
+from src.schema import normalize_operations
+
+logger_columnar = logging.getLogger("columnar")
+
+MAGIC = b"OPSCOL01"
+COLUMNS_FORMAT = 1
+ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _encode(name: str, series: pd.Series) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Колонка в массив фиксированной ширины. Строковые колонки кодируются словарём:
+    коды — в массиве, уникальные значения — в заголовке файла
+    """
+    if series.dtype == object:
+        values = series.dropna()
+        if not all(isinstance(value, str) for value in values):
+            raise TypeError(f"Column {name} contains non-string objects")
+        series = series.astype("category")
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        column = {
+            "name": name,
+            "kind": "category",
+            "ordered": bool(series.cat.ordered),
+            "categories": [str(category) for category in series.cat.categories],
+        }
+        array = series.cat.codes.to_numpy()
+    else:
+        column = {"name": name, "kind": "values"}
+        array = series.to_numpy()
+    if array.dtype == object:
+        raise TypeError(f"Column {name} has no fixed-width representation")
+    return column, np.ascontiguousarray(array)
+
+
+def export_columns(operations: DataFrame, path: Path, key: str) -> None:
+    """
+    Записывает таблицу операций в колоночный файл для отображения в память (open_columns).
+    Таблица приводится к схеме и сортируется по дате; key — версия исходных данных.
+    Файл пишется рядом и подменяется атомарно, уже открытые отображения остаются рабочими
+    """
+    path = Path(path)
+    operations = normalize_operations(operations)
+    if not is_sorted_by_date(operations):
+        operations = sort_by_date(operations)
+
+    columns: List[Dict[str, Any]] = []
+    arrays: List[np.ndarray] = []
+    offset = 0
+    for name in operations.columns:
+        column, array = _encode(str(name), operations[name])
+        column.update({"dtype": array.dtype.str, "offset": offset})
+        offset = _aligned(offset + array.nbytes)
+        columns.append(column)
+        arrays.append(array)
+
+    meta = {"format": COLUMNS_FORMAT, "key": key, "rows": len(operations), "columns": columns}
+    header = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for column, array in zip(columns, arrays):
+            f.write(b"\0" * (data_start + column["offset"] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    logger_columnar.info("Columns written: %s, %s rows", path, len(operations))
+
+
+def _header(buffer: Any) -> Dict[str, Any]:
+    lo = len(MAGIC)
+    hi = lo + 8
+    if bytes(buffer[:lo]) != MAGIC:
+        raise ValueError("Not a columnar operations file")
+    header_end = hi + int.from_bytes(buffer[lo:hi], "little")
+    meta: Dict[str, Any] = json.loads(bytes(buffer[hi:header_end]).decode("utf-8"))
+    meta["data_start"] = _aligned(header_end)
+    return meta
+
+
+def load_columns_meta(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Заголовок колоночного файла без отображения колонок; None, если файла нет или он не подходит
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            lo = len(MAGIC)
+            start = f.read(lo + 8)
+            meta = _header(start + f.read(int.from_bytes(start[lo:], "little")))
+    except (OSError, ValueError) as e:
+        logger_columnar.error("Columns file is broken: %s", e)
+        return None
+    if meta.get("format") != COLUMNS_FORMAT:
+        return None
+    return meta
+
+
+def open_columns(path: Path) -> DataFrame:
+    """
+    Таблица операций поверх отображённого в память колоночного файла без копирования:
+    числа и даты — представления страниц файла, строковые колонки — category с кодами из файла.
+    Процессы, открывшие один файл, делят одну физическую копию через страничный кэш
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    meta = _header(buffer)
+    if meta.get("format") != COLUMNS_FORMAT:
+        raise ValueError(f"Unsupported columns format {meta.get('format')}")
+
+    data = {}
+    for column in meta["columns"]:
+        dtype = np.dtype(column["dtype"])
+        if meta["rows"]:
+            array = np.frombuffer(
+                buffer, dtype=dtype, count=meta["rows"], offset=meta["data_start"] + column["offset"]
+            )
+        else:
+            array = np.empty(0, dtype=dtype)
+        if column["kind"] == "category":
+            categories = pd.Index(column["categories"], dtype=object)
+            data[column["name"]] = pd.Categorical.from_codes(array, categories=categories, ordered=column["ordered"])
+        else:
+            data[column["name"]] = array
+
+    operations = DataFrame(data, columns=[column["name"] for column in meta["columns"]], copy=False)
+    logger_columnar.info("Columns mapped: %s, %s rows", path, meta["rows"])
+    return operations
@@ -0,0 +1,165 @@
+import logging
+from typing import Any
+from typing import Iterable
+from typing import Literal
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.index import slice_by_date
+from src.schema import DATE_COLUMN
+from src.schema import normalize_operations
+
+logger_cube = logging.getLogger("cube")
+
+CUBE_KEYS = ["month", "Категория", "Номер карты", "Статус"]
+CUBE_MEASURES = ["count", "payment", "rounded", "cashback", "cashback_positive", "cashback_count"]
+
+
+def month_floor(date: Any) -> pd.Timestamp:
+    """
+    Начало месяца, на который выпадает дата
+    """
+    date = pd.Timestamp(date)
+    return pd.Timestamp(year=date.year, month=date.month, day=1)
+
+
+def month_ceil(date: Any) -> pd.Timestamp:
+    """
+    Начало ближайшего месяца, который начинается не раньше даты
+    """
+    start = month_floor(date)
+    return start if start == pd.Timestamp(date) else start + pd.DateOffset(months=1)
+
+
+def build_cube(operations: DataFrame) -> DataFrame:
+    """
+    Агрегирует операции по (месяц, категория, карта, статус):
+    число операций, суммы платежей, сумм с округлением и кэшбэка,
+    а также сумма и число операций с положительным кэшбэком.
+    Отсутствующие в таблице колонки пропускаются
+    """
+    columns = {
+        "month": operations[DATE_COLUMN].to_numpy().astype("datetime64[M]").astype("datetime64[ns]"),
+        "count": np.ones(len(operations), dtype=np.int64),
+    }
+    for key in CUBE_KEYS[1:]:
+        if key in operations:
+            columns[key] = operations[key]
+    if "Сумма платежа" in operations:
+        columns["payment"] = operations["Сумма платежа"]
+    if "Сумма операции с округлением" in operations:
+        columns["rounded"] = operations["Сумма операции с округлением"]
+    if "Кэшбэк" in operations:
+        cashback = operations["Кэшбэк"]
+        positive = cashback > 0
+        columns["cashback"] = cashback
+        columns["cashback_positive"] = cashback.where(positive, 0.0)
+        columns["cashback_count"] = positive.astype(np.int64)
+
+    frame = DataFrame(columns, index=operations.index)
+    keys = [key for key in CUBE_KEYS if key in frame]
+    return frame.groupby(keys, observed=True, dropna=False, sort=True).sum().reset_index()
+
+
+def cube_months(cube: DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> DataFrame:
+    """
+    Ячейки куба за месяцы из интервала [start, end), начала месяцев.
+    Куб отсортирован по месяцу, поэтому границы ищутся бинарным поиском
+    """
+    months = cube["month"].to_numpy()
+    lo = np.searchsorted(months, start.to_datetime64(), side="left")
+    hi = np.searchsorted(months, end.to_datetime64(), side="left")
+    return cube.iloc[lo:hi]
+
+
+def window_cells(
+    operations: DataFrame, start: Any, end: Any, cube: DataFrame | None = None, sorted_by_date: bool = False
+) -> DataFrame:
+    """
+    Ячейки куба за интервал [start, end).
+    Если куб передан, полные месяцы берутся из него, а по строкам
+    агрегируются только неполные месяцы на границах интервала.
+    sorted_by_date — строки отсортированы по дате (см. slice_by_date)
+    """
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    full_start = month_ceil(start)
+    full_end = month_floor(end)
+
+    if cube is None or full_start >= full_end:
+        return build_cube(slice_by_date(operations, start, end, "left", sorted_by_date))
+
+    head = slice_by_date(operations, start, full_start, "left", sorted_by_date)
+    tail = slice_by_date(operations, full_end, end, "left", sorted_by_date)
+    parts = [cube_months(cube, full_start, full_end)]
+    parts += [build_cube(rows) for rows in (head, tail) if not rows.empty]
+    logger_cube.debug("Window %s - %s: %s cube cells for full months", start, end, len(parts[0]))
+    if len(parts) == 1:
+        return parts[0]
+    return pd.concat(parts, ignore_index=True)
+
+
+def merge_cubes(cube: DataFrame, other: DataFrame) -> DataFrame:
+    """
+    Складывает два куба: совпадающие ячейки суммируются, новые добавляются
+    """
+    keys = [key for key in CUBE_KEYS if key in cube]
+    merged = pd.concat([cube, other], ignore_index=True)
+    return merged.groupby(keys, observed=True, dropna=False, sort=True).sum().reset_index()
+
+
+def stream_cells(chunks: Iterable[DataFrame], start: Any, end: Any) -> DataFrame:
+    """
+    Ячейки куба за интервал [start, end) по потоку частей таблицы.
+    В памяти одновременно находятся только текущая часть и накопленный куб
+    """
+    cube: DataFrame | None = None
+    for chunk in chunks:
+        rows = slice_by_date(normalize_operations(chunk), start, end, inclusive="left")
+        if rows.empty:
+            continue
+        cells = build_cube(rows)
+        cube = cells if cube is None else merge_cubes(cube, cells)
+
+    if cube is None:
+        return DataFrame(columns=CUBE_KEYS + CUBE_MEASURES)
+    return cube
+
+
+def window_sums(
+    operations: DataFrame, group: str, value: str, starts: Any, ends: Any, inclusive: str = "both"
+) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+    """
+    Суммы value и число строк по группам для набора окон по дате [starts[i], ends[i]]
+    (inclusive="left" — [starts[i], ends[i])) за один проход по таблице.
+    Строки упорядочиваются по (группа, дата), по ним считаются префиксные суммы в копейках,
+    после чего сумма любого окна — разность двух префиксов, найденных бинарным поиском.
+    Возвращает метки групп и матрицы сумм и количеств размера (окна × группы)
+    """
+    starts = pd.DatetimeIndex(starts).to_numpy()
+    ends = pd.DatetimeIndex(ends).to_numpy()
+    dates = operations[DATE_COLUMN].to_numpy()
+    codes, labels = pd.factorize(operations[group], sort=True)
+    keep = (codes >= 0) & ~np.isnat(dates)
+
+    cents = np.round(operations[value].to_numpy(dtype=np.float64, na_value=0.0) * 100).astype(np.int64)
+    codes, dates, cents = codes[keep], dates[keep], cents[keep]
+    order = np.lexsort((dates, codes))
+    codes, dates = codes[order], dates[order]
+    prefix = np.concatenate([[0], np.cumsum(cents[order])])
+    offsets = np.searchsorted(codes, np.arange(len(labels) + 1), side="left")
+
+    sums = np.zeros((len(starts), len(labels)), dtype=np.int64)
+    counts = np.zeros((len(starts), len(labels)), dtype=np.int64)
+    side: Literal["left", "right"] = "right" if inclusive == "both" else "left"
+    for code in range(len(labels)):
+        first, last = offsets[code], offsets[code + 1]
+        group_dates = dates[first:last]
+        lo = first + np.searchsorted(group_dates, starts, side="left")
+        hi = first + np.searchsorted(group_dates, ends, side=side)
+        sums[:, code] = prefix[hi] - prefix[lo]
+        counts[:, code] = hi - lo
+    return pd.Index(labels), sums / 100, counts
@@ -0,0 +1,117 @@
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+from src.cube import CUBE_KEYS
+from src.cube import build_cube
+from src.cube import merge_cubes
+from src.cube import stream_cells
+from src.cube import window_cells
+from src.index import is_sorted_by_date
+from src.index import sort_by_date
+from src.metrics import traced
+from src.prefix import CardPrefix
+from src.prefix import build_card_prefix
+from src.schema import normalize_operations
+
+pd.options.mode.copy_on_write = True
+
+
+@dataclass(frozen=True, eq=False)
+class Snapshot:
+    """
+    Неизменяемый снимок таблицы операций определённой версии вместе с производными структурами,
+    которые строятся один раз при первом обращении. Отчёты снимок не изменяют: выборки и новые колонки
+    при copy_on_write копируются при записи, массивы накопленных сумм доступны только для чтения,
+    поэтому один снимок можно одновременно читать из нескольких потоков
+    """
+
+    operations: DataFrame
+    version: str
+    date_sorted: Optional[bool] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _derived(self, name: str, build: Callable[[DataFrame], Any]) -> Any:
+        """
+        Производная структура снимка: строится один раз,
+        даже если первыми к ней обратились несколько потоков сразу
+        """
+        if name not in self.__dict__:
+            with self._lock:
+                if name not in self.__dict__:
+                    self.__dict__[name] = build(self.operations)
+        return self.__dict__[name]
+
+    @property
+    def sorted_by_date(self) -> bool:
+        """
+        Отсортированы ли операции по дате: задаётся при создании снимка из sort_by_date
+        или колоночного файла, иначе проверяется один раз при первом обращении
+        """
+        if self.date_sorted is not None:
+            return self.date_sorted
+        checked: bool = self._derived("_sorted_by_date", is_sorted_by_date)
+        return checked
+
+    @property
+    def cube(self) -> DataFrame:
+        """
+        Агрегаты по (месяц, категория, карта, статус)
+        """
+        return self._derived("cube", build_cube)
+
+    @property
+    def card_prefix(self) -> Optional[CardPrefix]:
+        """
+        Накопленные суммы по картам для get_cards; None — если их нельзя построить для этой таблицы
+        """
+        prefix: Optional[CardPrefix] = self._derived("card_prefix", build_card_prefix)
+        return prefix
+
+    def append(self, rows: DataFrame, version: str) -> "Snapshot":
+        """
+        Возвращает новый снимок с добавленными строками.
+        Уже построенный куб не пересчитывается, а дополняется агрегатами новых строк
+        """
+        rows = normalize_operations(rows)
+        operations = pd.concat([self.operations, rows], ignore_index=True)
+        snapshot = Snapshot(sort_by_date(normalize_operations(operations)), version, date_sorted=True)
+        if "cube" in self.__dict__:
+            cube = merge_cubes(self.cube, build_cube(rows))
+            for key in CUBE_KEYS[1:]:
+                if key in cube:
+                    cube[key] = cube[key].astype(snapshot.operations[key].dtype)
+            snapshot.__dict__["cube"] = cube
+        return snapshot
+
+
+def as_frame(operations: DataFrame | Snapshot) -> DataFrame:
+    """
+    Возвращает таблицу операций из снимка или саму таблицу
+    """
+    if isinstance(operations, Snapshot):
+        return operations.operations
+    return operations
+
+
+@traced()
+def get_cells(operations: DataFrame | Snapshot | Iterator[DataFrame], start: Any, end: Any) -> DataFrame:
+    """
+    Ячейки куба агрегатов за интервал [start, end).
+    Для снимка полные месяцы берутся из его куба, для таблицы агрегируются её строки,
+    поток частей таблицы (например, из iter_excel) агрегируется по частям
+    """
+    if isinstance(operations, Snapshot):
+        return window_cells(
+            operations.operations, start, end, cube=operations.cube, sorted_by_date=operations.sorted_by_date
+        )
+    if isinstance(operations, DataFrame):
+        return window_cells(normalize_operations(operations), start, end)
+    return stream_cells(operations, start, end)
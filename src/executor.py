@@ -0,0 +1,156 @@
+import inspect
+import json
+import logging
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+import config
+from src.dataset import Snapshot
+from src.metrics import propagate
+from src.reports import spending_by_category
+from src.services import get_cash_month
+from src.store import OperationsStore
+from src.store import operations_store
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import get_top
+from src.views import get_operations_sections
+
+logger_executor = logging.getLogger("executor")
+
+Query = Dict[str, Any]
+
+
+def dashboard(snapshot: Snapshot, date: str) -> Dict[str, Any]:
+    sections: Dict[str, Any] = get_operations_sections(snapshot, date)
+    return sections
+
+
+def cards(snapshot: Snapshot, date: str) -> list[dict] | None:
+    result: list[dict] | None = get_cards(snapshot, date=date)
+    return result
+
+
+def top(snapshot: Snapshot, date: str) -> list[dict] | None:
+    result: list[dict] | None = get_top(get_filter_date_df(snapshot, date))
+    return result
+
+
+def cashback(snapshot: Snapshot, year: int, month: int) -> str | None:
+    result: str | None = get_cash_month(snapshot, int(year), int(month))
+    return result
+
+
+def spending(snapshot: Snapshot, category: str, date: Optional[str] = None) -> str | None:
+    result: str | None = spending_by_category(snapshot, category, date)
+    return result
+
+
+QUERIES: Dict[str, Callable[..., Any]] = {
+    "dashboard": dashboard,
+    "cards": cards,
+    "top": top,
+    "cashback": cashback,
+    "spending": spending,
+}
+
+
+class QueryExecutor:
+    """
+    Выполняет запросы отчётов параллельно в пуле потоков.
+    Запрос — словарь {"query": "dashboard" | "cards" | "top" | "cashback" | "spending", параметры функции}.
+    Все запросы одного вызова run читают один неизменяемый снимок, поэтому ответы согласованы,
+    даже если хранилище тем временем загрузило новую версию данных
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, store: OperationsStore = operations_store) -> None:
+        self.store = store
+        self.max_workers = max_workers or config.QUERY_MAX_WORKERS
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="query")
+
+    def submit(self, query: Query, snapshot: Snapshot) -> Future:
+        """
+        Ставит запрос в очередь пула. Неизвестный запрос или неподходящие параметры —
+        ValueError / TypeError сразу, ошибки расчёта — из Future.result()
+        """
+        params = dict(query)
+        name = params.pop("query", None)
+        if name not in QUERIES:
+            raise ValueError(f"Unknown query {name!r}, expected one of {sorted(QUERIES)}")
+        func = QUERIES[name]
+        inspect.signature(func).bind(snapshot, **params)
+        return self._pool.submit(propagate(func), snapshot, **params)
+
+    def run(self, queries: Iterable[Query], snapshot: Optional[Snapshot] = None) -> List[Any]:
+        """
+        Ответы на запросы в их порядке; snapshot по умолчанию — текущий снимок хранилища
+        """
+        snapshot = snapshot or self.store.get()
+        if snapshot is None:
+            raise ValueError("Operations store is empty")
+        futures = [self.submit(query, snapshot) for query in queries]
+        logger_executor.info("Running %s queries on version %s", len(futures), snapshot.version)
+        return [future.result() for future in futures]
+
+    def stream(
+        self,
+        queries: Iterable[Query],
+        snapshot: Optional[Snapshot] = None,
+        window: Optional[int] = None,
+        recent: Optional[int] = None,
+    ) -> Iterator[Future]:
+        """
+        Future ответов в порядке запросов, не читая поток запросов целиком:
+        в работе одновременно не больше window запросов (по умолчанию — четыре на поток пула).
+        Запрос, совпадающий с одним из recent последних разных запросов (по умолчанию config.QUERY_STREAM_RECENT),
+        не выполняется повторно и получает его Future; память на это ограничена и не растёт с длиной потока.
+        Ошибка в запросе не прерывает поток: она возвращается из Future.result() этого запроса
+        """
+        snapshot = snapshot or self.store.get()
+        if snapshot is None:
+            raise ValueError("Operations store is empty")
+        window = window or self.max_workers * 4
+        recent = config.QUERY_STREAM_RECENT if recent is None else recent
+        logger_executor.info("Streaming queries on version %s", snapshot.version)
+        seen: OrderedDict[str, Future] = OrderedDict()
+        pending: deque = deque()
+        submitted = 0
+        for query in queries:
+            key = json.dumps(query, sort_keys=True, ensure_ascii=False, default=str)
+            future = seen.get(key)
+            if future is None:
+                try:
+                    future = self.submit(query, snapshot)
+                except (ValueError, TypeError) as e:
+                    future = Future()
+                    future.set_exception(e)
+                submitted += 1
+                seen[key] = future
+                while len(seen) > recent:
+                    seen.popitem(last=False)
+            else:
+                seen.move_to_end(key)
+            pending.append(future)
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+        logger_executor.info("Streamed queries: %s executed", submitted)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "QueryExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
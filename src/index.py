@@ -0,0 +1,70 @@
+import logging
+from typing import Any
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.schema import DATE_COLUMN
+
+logger_index = logging.getLogger("index")
+
+
+def _date_values(operations: DataFrame) -> Optional[np.ndarray]:
+    values = operations[DATE_COLUMN].to_numpy()
+    if not isinstance(values, np.ndarray) or values.dtype.kind != "M" or values.ndim != 1:
+        return None
+    return values
+
+
+def sort_by_date(operations: DataFrame) -> DataFrame:
+    """
+    Сортирует операции по дате (устойчиво)
+    """
+    if DATE_COLUMN not in operations:
+        return operations
+    return operations.sort_values(DATE_COLUMN, kind="stable").reset_index(drop=True)
+
+
+def is_sorted_by_date(operations: DataFrame) -> bool:
+    """
+    Отсортирована ли таблица по дате: даты не убывают, пропуски (NaT) — только в конце, как после sort_values.
+    Проверка за O(n); результат не запоминается — признак отсортированности хранит снимок (Snapshot)
+    """
+    if DATE_COLUMN not in operations:
+        return False
+    values = _date_values(operations)
+    if values is None:
+        return False
+    missing = np.isnat(values)
+    n_dates = len(values) - int(missing.sum())
+    if missing[:n_dates].any():
+        return False
+    dates = values[:n_dates]
+    return bool((dates[1:] >= dates[:-1]).all())
+
+
+def slice_by_date(
+    operations: DataFrame, start: Any, end: Any, inclusive: str = "both", sorted_by_date: bool = False
+) -> DataFrame:
+    """
+    Возвращает операции с датой в интервале от start до end.
+    inclusive: "both" — [start, end], "left" — [start, end).
+    sorted_by_date=True (таблица снимка из sort_by_date или колоночного файла): границы ищутся
+    бинарным поиском за O(log n), иначе строки отбираются булевой маской за O(n)
+    """
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    dates = operations[DATE_COLUMN]
+
+    if sorted_by_date:
+        values = dates.to_numpy()
+        lo = np.searchsorted(values, start.to_datetime64(), side="left")
+        hi = np.searchsorted(values, end.to_datetime64(), side="right" if inclusive == "both" else "left")
+        return operations.iloc[lo:hi]
+
+    logger_index.debug("Operations are not sorted by date, using a full scan")
+    if inclusive == "both":
+        return operations[dates.between(start, end)]
+    return operations[(dates >= start) & (dates < end)]
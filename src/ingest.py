@@ -0,0 +1,137 @@
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+import config
+from src.cache import file_hash
+from src.cache import save_frame
+from src.dataset import as_frame
+from src.logging_config import setup_logging
+from src.schema import normalize_operations
+from src.store import OperationsStore
+from src.store import load_parts
+from src.store import operations_store
+from src.store import read_journal
+
+logger_ingest = logging.getLogger("ingest")
+
+KEY_COLUMNS = ["Дата операции", "Номер карты", "Сумма операции", "MCC", "Описание"]
+
+
+def read_statement(path_statement: str) -> DataFrame | None:
+    """
+    Чтение выписки в формате xlsx или csv с приведением к схеме операций
+    """
+    logger_ingest.info("Reading statement %s", path_statement)
+
+    if not os.path.exists(path_statement) or os.path.getsize(path_statement) == 0:
+        logger_ingest.error("Statement %s does not exist or is empty", path_statement)
+        return None
+
+    if Path(path_statement).suffix.lower() == ".csv":
+        df = pd.read_csv(path_statement, sep=None, engine="python", encoding="utf-8")
+    else:
+        df = pd.read_excel(path_statement)
+    return normalize_operations(df)
+
+
+def row_keys(operations: DataFrame) -> np.ndarray:
+    """
+    Устойчивый 64-битный ключ строки по дате, карте, сумме, MCC и описанию
+    """
+    key_frame = operations[[col for col in KEY_COLUMNS if col in operations]]
+    if "MCC" in key_frame:
+        key_frame = key_frame.assign(MCC=key_frame["MCC"].astype("float64"))
+    keys: np.ndarray = pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+    return keys
+
+
+def load_ingested(path_ingested: str) -> Tuple[DataFrame | None, Dict[str, Any]]:
+    """
+    Возвращает ранее добавленные строки и журнал загруженных файлов (sha256 -> имя)
+    """
+    journal = read_journal(path_ingested)
+    return load_parts(path_ingested, journal["parts"]), journal["files"]
+
+
+def part_name(path_ingested: str, number: int) -> str:
+    """
+    Имя файла части журнала: ingested.00001.npz рядом с ingested.npz
+    """
+    path = Path(path_ingested)
+    return f"{path.stem}.{number:05d}{path.suffix}"
+
+
+def ingest_files(
+    paths: List[str],
+    store: OperationsStore = operations_store,
+    path_ingested: Optional[str] = None,
+) -> int:
+    """
+    Добавляет в хранилище строки из новых выписок.
+    Уже загруженные файлы (по sha256) пропускаются, строки, совпадающие по ключу
+    с сохранёнными или друг с другом, отбрасываются. Новые строки записываются новой частью журнала,
+    прежние части не переписываются. Возвращает число добавленных строк
+    """
+    path_ingested = path_ingested or store.path_ingested or str(config.PATH_TO_INGESTED)
+    snapshot = store.get()
+    if snapshot is None:
+        logger_ingest.error("Operations store is empty, nothing to deduplicate against")
+        return 0
+
+    journal = read_journal(path_ingested)
+    files = journal["files"]
+    seen_keys = row_keys(as_frame(snapshot))
+    new_parts = []
+
+    for path_statement in paths:
+        digest = file_hash(path_statement) if os.path.exists(path_statement) else None
+        if digest is None or digest in files:
+            logger_ingest.info("Statement %s skipped: missing or already ingested", path_statement)
+            continue
+
+        statement = read_statement(path_statement)
+        if statement is None:
+            continue
+        keys = row_keys(statement)
+        is_new = ~np.isin(keys, seen_keys) & ~pd.Series(keys).duplicated().to_numpy()
+        new_parts.append(statement[is_new])
+        seen_keys = np.concatenate([seen_keys, keys[is_new]])
+        files[digest] = Path(path_statement).name
+        logger_ingest.info("Statement %s: %s new of %s rows", path_statement, is_new.sum(), len(statement))
+
+    if not new_parts:
+        return 0
+
+    new_rows = normalize_operations(pd.concat(new_parts, ignore_index=True))
+    part = part_name(path_ingested, len(journal["parts"]) + 1)
+    save_frame(new_rows, Path(path_ingested).with_name(part), {"files": files})
+    save_frame(DataFrame(), Path(path_ingested), {"files": files, "parts": journal["parts"] + [part]})
+    store.append(new_rows, part)
+    logger_ingest.info("Ingested %s rows into %s", len(new_rows), part)
+    return len(new_rows)
+
+
+def main(argv: List[str]) -> None:  # pragma: no cover
+    """
+    python -m src.ingest statement1.xlsx statement2.csv ...
+    """
+    if not argv:
+        print("Использование: python -m src.ingest <выписка.xlsx|выписка.csv> ...")
+        return
+    setup_logging()
+    print(f"Добавлено операций: {ingest_files(argv)}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main(sys.argv[1:])
@@ -0,0 +1,202 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+
+import config
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s: %(message)s"
+
+logger_logging = logging.getLogger("logging_config")
+
+_listener: Optional[QueueListener] = None
+_writer: Optional["_TextWriter"] = None
+_path: Optional[Path] = None
+_exception_formatter = logging.Formatter()
+
+
+class DebugSampleFilter(logging.Filter):
+    """
+    Пропускает только долю rate записей уровня DEBUG, остальные уровни — все
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+# поля записи, которые LOG_FORMAT не выводит: в очередь они не передаются
+UNUSED_FIELDS = ("pathname", "filename", "module", "funcName", "thread", "threadName", "process", "processName")
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Кладёт в очередь копию записи с уже собранной строкой сообщения (msg % args, как QueueHandler),
+    без аргументов, объекта исключения и неиспользуемых форматом полей.
+    Дата, уровень и итоговая строка форматируются и пишутся в файл фоновым потоком
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        for field in UNUSED_FIELDS:
+            setattr(record, field, None)
+        return record
+
+
+class _TextWriter:
+    """
+    Фоновая перезапись файлов с результатами (декоратор log в reports):
+    для каждого файла записывается только последнее содержимое
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, str] = {}
+        self._ready = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="text-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, filename: str, text: str) -> None:
+        with self._ready:
+            self._pending[filename] = text
+            self._ready.notify()
+
+    def stop(self) -> None:
+        with self._ready:
+            self._stopped = True
+            self._ready.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                while not self._pending and not self._stopped:
+                    self._ready.wait()
+                pending, self._pending = self._pending, {}
+                stopped = self._stopped
+            for filename, text in pending.items():
+                try:
+                    _write(filename, text)
+                except (OSError, TypeError) as e:
+                    logger_logging.error("Cannot write %s: %s", filename, e)
+            if stopped:
+                return
+
+
+def _write(filename: str, text: str) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_text(filename: str, text: str) -> None:
+    """
+    Перезаписывает файл: в фоновом режиме логирования — из отдельного потока, иначе сразу
+    """
+    if _writer is not None:
+        _writer.submit(filename, text)
+    else:
+        _write(filename, text)
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    path: Optional[Path] = None,
+    use_queue: Optional[bool] = None,
+    debug_sample: Optional[float] = None,
+) -> None:
+    """
+    Настраивает логирование процесса; вызывается точками входа (main, server, ingest), а не при импорте.
+    use_queue=True: записи кладутся в очередь, а форматируются и пишутся в файл фоновым потоком.
+    debug_sample > 0: при уровне выше DEBUG в лог дополнительно попадает такая доля DEBUG-записей.
+    Параметры по умолчанию берутся из config.LOG_*
+    """
+    global _listener, _writer, _path
+    level = level or config.LOG_LEVEL
+    path = path or config.PATH_TO_LOG_FILE
+    use_queue = config.LOG_QUEUE if use_queue is None else use_queue
+    debug_sample = config.LOG_DEBUG_SAMPLE if debug_sample is None else debug_sample
+
+    shutdown_logging()
+    os.makedirs(Path(path).parent, exist_ok=True)
+    file_handler = logging.FileHandler(path, mode="w", encoding="utf-8")
+    _path = Path(path)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    handler: logging.Handler = file_handler
+    if use_queue:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler = LazyQueueHandler(records)
+        _listener = QueueListener(records, file_handler)
+        _listener.start()
+        _writer = _TextWriter()
+
+    root_level = logging.getLevelName(level.upper())
+    if debug_sample > 0 and root_level > logging.DEBUG:
+        handler.addFilter(DebugSampleFilter(debug_sample))
+        root_level = logging.DEBUG
+
+    root = logging.getLogger()
+    for old_handler in root.handlers[:]:
+        root.removeHandler(old_handler)
+        old_handler.close()
+    root.setLevel(root_level)
+    root.addHandler(handler)
+
+
+def log_path() -> Optional[Path]:
+    """
+    Файл лога, настроенный setup_logging; None — логирование не настроено
+    """
+    return _path
+
+
+def setup_worker_logging(path: Optional[Path] = None) -> None:
+    """
+    Логирование в дочернем процессе пула (initializer, initargs=(log_path(),)):
+    фоновые потоки родителя в нём не работают, поэтому записи дописываются в файл родителя напрямую
+    """
+    global _listener, _writer
+    _listener = None
+    _writer = None
+    path = path or _path
+    root = logging.getLogger()
+    for old_handler in root.handlers[:]:
+        root.removeHandler(old_handler)
+    if path is not None:
+        file_handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(file_handler)
+
+
+def shutdown_logging() -> None:
+    """
+    Дописывает накопленные записи и останавливает фоновые потоки
+    """
+    global _listener, _writer
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+atexit.register(shutdown_logging)
@@ -1,31 +1,65 @@
+import argparse
 import logging
+import threading
+from typing import List
+from typing import Optional
 
-from src.reports import spending_by_category
-from src.services import get_cash_month
-from src.services import operations
-from src.views import str_main
+from src.logging_config import setup_logging
 
 logger_main = logging.getLogger("main")
 
 
-def main() -> None:  # pragma: no cover
-    """Функция отвечает за основную логику проекта и связывает функциональности между собой"""
+def warm_up() -> None:
+    """
+    Импортирует pandas и модули отчётов и загружает таблицу операций.
+    Запускается в фоновом потоке, пока пользователь вводит первый запрос
+    """
+    try:
+        from src.store import get_snapshot
+        from src.views import str_main  # noqa: F401
+
+        get_snapshot()
+    except Exception as e:  # pragma: no cover
+        logger_main.error("Warm-up failed: %s", e)
+
+
+def main(argv: Optional[List[str]] = None) -> None:  # pragma: no cover
+    """Функция отвечает за основную логику проекта и связывает функциональности между собой.
+    С --batch запросы читаются из файла JSONL, а ответы пишутся строками JSON (src.batch)"""
+    parser = argparse.ArgumentParser(description="Отчёты по операциям")
+    parser.add_argument("--batch", metavar="QUERIES", help='файл запросов JSONL, "-" — stdin')
+    parser.add_argument("--output", help="файл ответов JSONL для --batch, по умолчанию stdout")
+    parser.add_argument("--workers", type=int, help="число потоков для --batch")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.batch:
+        from src.batch import run_batch
+
+        run_batch(args.batch, args.output, args.workers)
+        return
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
     try:
         date = input("Введите дату в формате YYYY-MM-DD HH:MM:SS, чтобы получить данные с начала месяца    ")
+        from src.reports import spending_by_category
+        from src.services import get_cash_month
+        from src.store import get_snapshot
+        from src.views import str_main
+
         print(str_main(date))
 
         print("Чтобы получить список выгодных категорий повышенного кэшбэка за месяц")
         year = int(input("введите год    "))
         month = int(input("Введите месяц    "))
-        print(get_cash_month(operations, year, month))
+        print(get_cash_month(get_snapshot(), year, month))
 
         print("Чтобы получить траты по заданной категории за последние три месяца")
         category = input("Введите категорию    ").capitalize()
         date_r = input("Ведите дату (необязательно)    ")
-        print(spending_by_category(operations, category, date_r))
+        print(spending_by_category(get_snapshot(), category, date_r))
 
     except Exception as e:
-        logger_main.error(f"Error: {e}")
+        logger_main.error("Error: %s", e)
 
 
 # if __name__ == "__main__":
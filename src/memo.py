@@ -0,0 +1,205 @@
+import copy
+import glob
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import pandas as pd
+
+import config
+from src.dataset import Snapshot
+from src.metrics import inc
+
+logger_memo = logging.getLogger("memo")
+
+Key = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+
+class ResultCache:
+    """
+    Кэш результатов отчётов по ключу (версия данных, функция, аргументы)
+    с вытеснением давно не использованных записей (LRU).
+    Если задан path, вытесненные записи сохраняются в каталог и читаются оттуда при промахе.
+    Записи разных версий данных хранятся рядом; когда версий больше max_versions,
+    удаляются записи и файлы давнее всех использованной версии.
+    Значения сохраняются и отдаются копиями: изменение полученного результата не портит кэш
+    """
+
+    def __init__(self, max_size: int = 1024, path: Optional[Path] = None, max_versions: int = 4) -> None:
+        self.max_size = max_size
+        self.path = path
+        self.max_versions = max_versions
+        self._entries: OrderedDict[Key, Any] = OrderedDict()
+        self._versions: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счётчики попаданий (в памяти и на диске), промахов, вытеснений записей и версий данных
+        """
+        with self._lock:
+            requests_count = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] + self._stats["disk_hits"]) / requests_count if requests_count else 0.0
+            return {**self._stats, "size": len(self._entries), "hit_rate": round(hit_rate, 4)}
+
+    def get(self, key: Key) -> Tuple[bool, Any]:
+        """
+        Возвращает (найдено, значение)
+        """
+        with self._lock:
+            if key in self._entries:
+                self._use_version(key[0])
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                inc("cache_hits", cache="result")
+                return True, copy.deepcopy(self._entries[key])
+            found, value = self._load(key)
+            if found:
+                self._stats["disk_hits"] += 1
+                inc("cache_hits", cache="result_disk")
+                self._use_version(key[0])
+                self._store(key, value)
+                return True, copy.deepcopy(value)
+            self._stats["misses"] += 1
+            inc("cache_misses", cache="result")
+            return False, None
+
+    def put(self, key: Key, value: Any) -> None:
+        with self._lock:
+            self._use_version(key[0])
+            self._store(key, copy.deepcopy(value))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._remove_spilled(version=None)
+
+    def _use_version(self, version: str) -> None:
+        if version in self._versions:
+            self._versions.move_to_end(version)
+            return
+        self._versions[version] = None
+        while len(self._versions) > self.max_versions:
+            evicted, _ = self._versions.popitem(last=False)
+            self._stats["invalidations"] += 1
+            logger_memo.info("Dropping cached results of data version %s", evicted)
+            self._entries = OrderedDict((k, v) for k, v in self._entries.items() if k[0] != evicted)
+            self._remove_spilled(version=evicted)
+
+    def _store(self, key: Key, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+            self._spill(evicted_key, evicted)
+
+    def _file(self, key: Key) -> Path:
+        digest = hashlib.sha1(json.dumps(key, default=str).encode("utf-8")).hexdigest()
+        return self.path / f"{key[0]}.{digest}.json"  # type: ignore[operator]
+
+    def _spill(self, key: Key, value: Any) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._file(key).with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._file(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger_memo.error("Result cache spill error: %s", e)
+
+    def _load(self, key: Key) -> Tuple[bool, Any]:
+        if self.path is None:
+            return False, None
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                return True, json.load(f)
+        except FileNotFoundError:
+            return False, None
+        except (OSError, ValueError) as e:
+            logger_memo.error("Result cache read error: %s", e)
+            return False, None
+
+    def _remove_spilled(self, version: Optional[str]) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        for file in self.path.glob("*.json" if version is None else f"{glob.escape(version)}.*.json"):
+            file.unlink(missing_ok=True)
+
+
+def normalize_date(value: Any) -> Optional[str]:
+    """
+    Дата в каноническом виде; None или пустая строка — сегодняшняя дата, как в отчётах
+    """
+    if value is None or not str(value).strip():
+        return str(pd.to_datetime("today").normalize().isoformat())
+    return str(pd.to_datetime(value).isoformat())
+
+
+def normalize_list(value: Any) -> Optional[Tuple[Any, ...]]:
+    return None if value is None else tuple(value)
+
+
+def memoize(**normalizers: Callable[[Any], Any]) -> Callable:
+    """
+    Кэширует результат функции, первый аргумент которой — таблица операций.
+    Кэшируются только вызовы со снимком из хранилища (Snapshot): его версия входит в ключ,
+    поэтому после изменения данных результаты пересчитываются. Аргументы приводятся
+    к каноническому виду функциями normalizers (по имени параметра), None-результаты не кэшируются
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        operations_name = next(iter(signature.parameters))
+
+        @wraps(func)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            cache = result_cache
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            operations = arguments.pop(operations_name)
+            if not cache.enabled or not isinstance(operations, Snapshot):
+                return func(*args, **kwargs)
+            try:
+                normalized = tuple(
+                    (name, normalizers[name](value) if name in normalizers else value)
+                    for name, value in arguments.items()
+                )
+            except (TypeError, ValueError):
+                return func(*args, **kwargs)
+
+            key = (operations.version, func.__qualname__, normalized)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache.put(key, value)
+            return value
+
+        return inner
+
+    return decorator
+
+
+result_cache = ResultCache(config.RESULT_CACHE_SIZE, config.PATH_TO_RESULT_CACHE, config.RESULT_CACHE_VERSIONS)
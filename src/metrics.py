@@ -0,0 +1,238 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+logger_metrics = logging.getLogger("metrics")
+
+PREFIX = "bank_dashboard"
+
+CounterKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Span:
+    """
+    Интервал выполнения этапа с вложенными этапами
+    """
+
+    __slots__ = ("name", "start", "duration", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.children: List["Span"] = []
+
+    def folded(self, prefix: str = "") -> List[str]:
+        """
+        Строки в формате folded stacks ("str_main;local;get_cards 1234", мкс собственного времени),
+        который понимают flamegraph.pl и speedscope
+        """
+        stack = f"{prefix};{self.name}" if prefix else self.name
+        duration = self.duration or 0.0
+        own = duration - sum(child.duration or 0.0 for child in self.children)
+        lines = [f"{stack} {max(0, round(own * 1e6))}"]
+        for child in self.children:
+            lines += child.folded(stack)
+        return lines
+
+    def tree(self, total: Optional[float] = None, depth: int = 0) -> List[str]:
+        """
+        Разбивка по этапам с долей от корня, по строке на этап
+        """
+        duration = self.duration or 0.0
+        total = total or duration or 1.0
+        lines = [f"{'  ' * depth}{self.name}: {duration * 1000:.1f} ms ({duration / total:.0%})"]
+        for child in self.children:
+            lines += child.tree(total, depth + 1)
+        return lines
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# завершение этапа и его присоединение к родителю атомарны: к завершённому родителю этапы не добавляются
+_finish_lock = threading.Lock()
+
+
+class Metrics:
+    """
+    Счётчики и суммарное время этапов процесса с выгрузкой в формат Prometheus и JSON lines
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[CounterKey, float] = {}
+        self._spans: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, span_name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._spans.setdefault(span_name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        {"counters": [{"name", "labels", "value"}], "spans": {этап: {"count", "seconds", "max_seconds"}}}
+        """
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "spans": {
+                    name: {"count": count, "seconds": round(total, 6), "max_seconds": round(longest, 6)}
+                    for name, (count, total, longest) in sorted(self._spans.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Текстовый формат Prometheus (например, для textfile collector node_exporter)
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name in sorted({counter["name"] for counter in snapshot["counters"]}):
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            for counter in snapshot["counters"]:
+                if counter["name"] == name:
+                    lines.append(f"{PREFIX}_{name}_total{_labels(counter['labels'])} {counter['value']:g}")
+        lines.append(f"# TYPE {PREFIX}_span_seconds summary")
+        for name, stats in snapshot["spans"].items():
+            lines.append(f"{PREFIX}_span_seconds_sum{_labels({'span': name})} {stats['seconds']:g}")
+            lines.append(f"{PREFIX}_span_seconds_count{_labels({'span': name})} {stats['count']:g}")
+        lines.append(f"# TYPE {PREFIX}_span_seconds_max gauge")
+        for name, stats in snapshot["spans"].items():
+            lines.append(f"{PREFIX}_span_seconds_max{_labels({'span': name})} {stats['max_seconds']:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._spans.clear()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+metrics = Metrics()
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    """
+    Увеличивает счётчик: rows_scanned, rows_matched, cache_hits{cache=...}, remote_calls{api=...}
+    """
+    metrics.inc(name, value, **labels)
+
+
+@contextmanager
+def span(name: str) -> Iterator[Span]:
+    """
+    Замеряет этап: время добавляется в метрики, а сам этап по завершении — в дерево текущего запроса.
+    Этап, завершившийся позже родителя (например, в потоке, не успевшем к сроку str_main),
+    в дерево не попадает: разбивка запроса уже выгружена
+    """
+    parent = _current.get()
+    current = Span(name)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+        with _finish_lock:
+            current.duration = time.perf_counter() - current.start
+            if parent is not None and parent.duration is None:
+                parent.children.append(current)
+        metrics.observe(name, current.duration)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Декоратор: каждый вызов функции — этап span с её именем
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    Переносит текущий этап в другой поток: этапы, начатые в func, станут его вложенными
+    """
+    parent = _current.get()
+
+    @wraps(func)
+    def inner(*args: Any, **kwargs: Any) -> Any:
+        token = _current.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return inner
+
+
+def dump_trace(root: Span, path: Path) -> None:
+    """
+    Дописывает разбивку запроса в файл folded stacks и в лог
+    """
+    logger_metrics.info("Trace:\n%s", "\n".join(root.tree()))
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(root.folded()) + "\n")
+    except OSError as e:
+        logger_metrics.error("Trace write error: %s", e)
+
+
+def export_metrics(path: Path) -> None:
+    """
+    Выгружает метрики: *.jsonl — дописывается строка JSON со временем выгрузки,
+    иначе файл перезаписывается в текстовом формате Prometheus
+    """
+    path = Path(path)
+    try:
+        if path.suffix == ".jsonl":
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": time.time(), **metrics.snapshot()}, ensure_ascii=False) + "\n")
+        else:
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(metrics.to_prometheus(), encoding="utf-8")
+            tmp_path.replace(path)
+    except OSError as e:
+        logger_metrics.error("Metrics export error: %s", e)
@@ -0,0 +1,106 @@
+import logging
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+import config
+
+logger_numpy_backend = logging.getLogger("numpy_backend")
+
+BACKENDS = ("pandas", "numpy")
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    """
+    Движок расчёта: переданный в вызов или config.COMPUTE_BACKEND
+    """
+    backend = backend or config.COMPUTE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown compute backend {backend!r}, expected one of {BACKENDS}")
+    return backend
+
+
+def group_codes(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Целочисленные коды групп (-1 — пропуск) и метки в порядке сортировки groupby
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, labels = pd.factorize(series, sort=True)
+    return codes, pd.Index(labels)
+
+
+def to_cents(values: pd.Series) -> Optional[np.ndarray]:
+    """
+    Суммы в копейках (int64), пропуски — 0.
+    None, если есть суммы с долями копеек: тогда целочисленный расчёт не совпадёт с pandas
+    """
+    amounts = values.to_numpy(dtype=np.float64, na_value=0.0)
+    scaled = amounts * 100
+    cents = np.rint(scaled)
+    if not np.all(np.abs(scaled - cents) < 1e-6):
+        return None
+    result: np.ndarray = cents.astype(np.int64)
+    return result
+
+
+def sum_cents(codes: np.ndarray, n_groups: int, mask: np.ndarray, *columns: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Число строк и суммы колонок (в копейках) по группам среди строк mask — np.bincount
+    """
+    mask = mask & (codes >= 0)
+    codes = codes[mask]
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = [np.bincount(codes, weights=column[mask], minlength=n_groups).astype(np.int64) for column in columns]
+    return (counts, *sums)
+
+
+def card_totals(df_filter_date: DataFrame) -> Optional[list[dict]]:
+    """
+    Ответ get_cards: расходы и кешбэк по картам среди успешных списаний.
+    None — суммы с долями копеек, нужен расчёт в pandas
+    """
+    spent = to_cents(df_filter_date["Сумма операции с округлением"])
+    cashback = to_cents(df_filter_date["Кэшбэк"])
+    if spent is None or cashback is None:
+        return None
+    codes, labels = group_codes(df_filter_date["Номер карты"])
+    mask = (df_filter_date["Сумма платежа"] < 0).to_numpy() & (df_filter_date["Статус"] == "OK").to_numpy()
+    return card_records_from_cents(labels, *sum_cents(codes, len(labels), mask, spent, cashback))
+
+
+def card_records_from_cents(
+    labels: pd.Index, counts: np.ndarray, spent: np.ndarray, cashback: np.ndarray
+) -> list[dict]:
+    """
+    Ответ get_cards по суммам в копейках; карты без операций (counts == 0) пропускаются
+    """
+    return [
+        {
+            "last_digits": str(labels[code]).replace("*", ""),
+            "total_spent": float(spent[code] / 100),
+            "cashback": float(cashback[code] / 100),
+        }
+        for code in np.flatnonzero(counts)
+    ]
+
+
+def category_cashback(
+    categories: pd.Series, status: pd.Series, cashback: pd.Series, counts: np.ndarray
+) -> Optional[Tuple[Dict[str, float], int]]:
+    """
+    Кешбэк по категориям среди строк (или ячеек куба) с положительным кешбэком и статусом OK
+    и число таких операций; counts — число операций с положительным кешбэком в строке или ячейке.
+    None — суммы с долями копеек, нужен расчёт в pandas
+    """
+    cents = to_cents(cashback)
+    if cents is None:
+        return None
+    codes, labels = group_codes(categories)
+    mask = (counts > 0) & (status == "OK").to_numpy()
+    present, sums = sum_cents(codes, len(labels), mask, cents)
+    return {labels[code]: sums[code] / 100 for code in np.flatnonzero(present)}, int(counts[mask].sum())
@@ -0,0 +1,94 @@
+import logging
+from dataclasses import dataclass
+from typing import Any
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.numpy_backend import card_records_from_cents
+from src.numpy_backend import group_codes
+from src.numpy_backend import to_cents
+from src.schema import DATE_COLUMN
+
+logger_prefix = logging.getLogger("prefix")
+
+PREFIX_COLUMNS = [DATE_COLUMN, "Номер карты", "Статус", "Сумма платежа", "Сумма операции с округлением", "Кэшбэк"]
+
+
+@dataclass(frozen=True)
+class CardPrefix:
+    """
+    Накопленные суммы расходов и кешбэка (в копейках) успешных списаний по каждой карте.
+    Строки карты code занимают позиции offsets[code]:offsets[code + 1], отсортированы по дате;
+    spent[i] и cashback[i] — суммы первых i строк, поэтому сумма за интервал дат —
+    два бинарных поиска и одно вычитание, независимо от числа операций в интервале
+    """
+
+    labels: pd.Index
+    offsets: np.ndarray
+    dates: np.ndarray
+    spent: np.ndarray
+    cashback: np.ndarray
+
+    def totals(self, start: Any, end: Any) -> list[dict]:
+        """
+        Ответ get_cards за интервал дат [start, end]
+        """
+        start = pd.Timestamp(start).to_datetime64()
+        end = pd.Timestamp(end).to_datetime64()
+        n_cards = len(self.labels)
+        counts = np.zeros(n_cards, dtype=np.int64)
+        spent = np.zeros(n_cards, dtype=np.int64)
+        cashback = np.zeros(n_cards, dtype=np.int64)
+        for code in range(n_cards):
+            first, last = self.offsets[code], self.offsets[code + 1]
+            card_dates = self.dates[first:last]
+            lo = first + np.searchsorted(card_dates, start, side="left")
+            hi = first + np.searchsorted(card_dates, end, side="right")
+            counts[code] = hi - lo
+            spent[code] = self.spent[hi] - self.spent[lo]
+            cashback[code] = self.cashback[hi] - self.cashback[lo]
+        return card_records_from_cents(self.labels, counts, spent, cashback)
+
+
+def build_card_prefix(operations: DataFrame) -> Optional[CardPrefix]:
+    """
+    Строит накопленные суммы по картам за O(n log n).
+    None — нет нужных колонок или есть суммы с долями копеек: тогда get_cards считает по строкам
+    """
+    missing = [column for column in PREFIX_COLUMNS if column not in operations]
+    if missing:
+        logger_prefix.info("Card prefix sums are unavailable, missing columns %s", missing)
+        return None
+    spent = to_cents(operations["Сумма операции с округлением"])
+    cashback = to_cents(operations["Кэшбэк"])
+    if spent is None or cashback is None:
+        logger_prefix.info("Card prefix sums are unavailable, amounts have fractional kopecks")
+        return None
+
+    codes, labels = group_codes(operations["Номер карты"])
+    dates = operations[DATE_COLUMN].to_numpy(dtype="datetime64[ns]")
+    mask = (
+        (operations["Сумма платежа"] < 0).to_numpy()
+        & (operations["Статус"] == "OK").to_numpy()
+        & (codes >= 0)
+        & ~np.isnat(dates)
+    )
+    codes, dates, spent, cashback = codes[mask], dates[mask], spent[mask], cashback[mask]
+    order = np.lexsort((dates, codes))
+
+    offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(labels)), out=offsets[1:])
+    prefix = CardPrefix(
+        labels=labels,
+        offsets=offsets,
+        dates=dates[order],
+        spent=np.concatenate(([0], np.cumsum(spent[order]))),
+        cashback=np.concatenate(([0], np.cumsum(cashback[order]))),
+    )
+    for array in (prefix.offsets, prefix.dates, prefix.spent, prefix.cashback):
+        array.flags.writeable = False
+    logger_prefix.info("Card prefix sums built for %s cards, %s rows", len(labels), len(prefix.dates))
+    return prefix
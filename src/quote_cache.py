@@ -0,0 +1,216 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+from src.metrics import inc
+
+logger_quote_cache = logging.getLogger("quote_cache")
+
+Fetch = Callable[[], Optional[Dict[str, Any]]]
+
+
+class QuoteCache:
+    """
+    Кэш котировок валют и акций с временем жизни для каждого символа,
+    вытеснением давно не использованных записей (LRU) и сохранением на диск.
+    При stale_while_revalidate=True устаревшее значение отдаётся сразу,
+    а свежее запрашивается в фоновом потоке.
+    Одновременные промахи по одному ключу ждут один запрос.
+    Файл пишется не при каждой записи, а не чаще раза в save_delay секунд и при выходе из процесса (flush)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = 300,
+        max_size: int = 256,
+        stale_while_revalidate: bool = False,
+        max_stale: float = 24 * 3600,
+        save_delay: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.save_delay = save_delay
+        self._entries: OrderedDict[str, Tuple[Dict[str, Any], float]] = OrderedDict()
+        self._loaded = path is None
+        self._refreshing: set = set()
+        self._fetching: Dict[str, "Future[Optional[Dict[str, Any]]]"] = {}
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        if path is not None:
+            atexit.register(_flush_on_exit, weakref.ref(self))
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "refreshes": 0, "evictions": 0}
+
+    def ttl(self, key: str) -> float:
+        """
+        Время жизни записи: сначала ищется ключ символа ("stock:TSLA"), затем вид ("stock")
+        """
+        return self.ttls.get(key, self.ttls.get(key.split(":")[0], self.default_ttl))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Счётчики попаданий, промахов, выдачи устаревших значений, фоновых обновлений и вытеснений
+        """
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def get(self, key: str, fetch: Fetch) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает значение из кэша или запрашивает его через fetch.
+        Неудачный запрос (None) не кэшируется
+        """
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = time.time() - fetched_at
+                if age < self.ttl(key):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    inc("cache_hits", cache="quote")
+                    return value
+                if self.stale_while_revalidate and age < self.ttl(key) + self.max_stale:
+                    self._entries.move_to_end(key)
+                    self._stats["stale"] += 1
+                    inc("cache_hits", cache="quote_stale")
+                    self._refresh_in_background(key, fetch)
+                    return value
+            self._stats["misses"] += 1
+            inc("cache_misses", cache="quote")
+            pending = self._fetching.get(key)
+            if pending is None:
+                pending = self._fetching[key] = Future()
+                is_leader = True
+            else:
+                is_leader = False
+
+        if not is_leader:
+            return pending.result()
+        try:
+            fetched = fetch()
+            if fetched is not None:
+                self.put(key, fetched)
+            pending.set_result(fetched)
+            return fetched
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._fetching.pop(key, None)
+
+    def put(self, key: str, value: Dict[str, Any], fetched_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._load()
+            self._entries[key] = (value, time.time() if fetched_at is None else fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+                logger_quote_cache.debug("Evicted %s", evicted)
+            self._schedule_save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._schedule_save()
+
+    def flush(self) -> None:
+        """
+        Записывает изменения на диск сразу
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self.path is None or not self._dirty:
+                return
+            self._dirty = False
+            data = [[key, value, fetched_at] for key, (value, fetched_at) in self._entries.items()]
+        with self._save_lock:
+            self._save(data)
+
+    def _refresh_in_background(self, key: str, fetch: Fetch) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                value = fetch()
+                if value is not None:
+                    self.put(key, value)
+                    logger_quote_cache.info("Refreshed %s", key)
+            finally:
+                with self._lock:
+                    self._stats["refreshes"] += 1
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"quote-refresh-{key}", daemon=True).start()
+
+    def _schedule_save(self) -> None:
+        if self.path is None:
+            return
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = [(str(key), dict(value), float(fetched_at)) for key, value, fetched_at in data]
+        except (OSError, ValueError, TypeError) as e:
+            logger_quote_cache.error("Quote cache is broken, starting empty: %s", e)
+            return
+        for key, value, fetched_at in entries:
+            self._entries[key] = (value, fetched_at)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        logger_quote_cache.info("Loaded %s quotes from %s", len(self._entries), self.path)
+
+    def _save(self, data: List[List[Any]]) -> None:
+        if self.path is None:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger_quote_cache.error("Quote cache write error: %s", e)
+
+
+def _flush_on_exit(ref: "weakref.ref[QuoteCache]") -> None:
+    cache = ref()
+    if cache is not None:
+        cache.flush()
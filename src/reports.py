@@ -3,21 +3,31 @@ import logging
 from functools import wraps
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
 
 import pandas as pd
 from pandas import DataFrame
 
-import config
-from src.utils import read_excel
+from src.cube import window_sums
+from src.dataset import Snapshot
+from src.dataset import as_frame
+from src.dataset import get_cells
+from src.logging_config import write_text
+from src.memo import memoize
+from src.memo import normalize_date
+from src.memo import normalize_list
+from src.metrics import traced
+from src.schema import DATE_COLUMN
+from src.schema import as_money
+from src.schema import normalize_operations
 
 pd.options.mode.copy_on_write = True
 
 logger_reports = logging.getLogger("reports")
 
-path_xl = str(config.PATH_TO_OPERATIONS)
-operations = read_excel(path_xl)
-
 
 def log(filename: str) -> Callable:  # pragma: no cover
     def wrapper(func: Callable) -> Callable:
@@ -25,12 +35,10 @@ def log(filename: str) -> Callable:  # pragma: no cover
         def inner(*args: Any, **kwargs: Any) -> Any:
             try:
                 result = func(*args, **kwargs)
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(result)
+                write_text(filename, result)
                 return result
             except Exception as e:
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(f"{func.__name__} error: {e}. Inputs: {args}, {kwargs}\n")
+                write_text(filename, f"{func.__name__} error: {e}. Inputs: {args}, {kwargs}\n")
                 return None
 
         return inner
@@ -39,10 +47,16 @@ def log(filename: str) -> Callable:  # pragma: no cover
 
 
 @log("log.log")
-def spending_by_category(operations: Optional[DataFrame], category: str, date_r: Optional[str] = None) -> str | None:
+@memoize(category=str, date_r=normalize_date)
+@traced()
+def spending_by_category(
+    operations: Optional[DataFrame | Snapshot | Iterator[DataFrame]], category: str, date_r: Optional[str] = None
+) -> str | None:
     """
     Функция возвращает траты по заданной категории за последние
-    три месяца (от переданной даты)
+    три месяца (от переданной даты).
+    Для снимка из хранилища полные месяцы берутся из куба агрегатов,
+    поток частей таблицы (iter_excel) агрегируется по частям
     """
     logger_reports.info("Function run")
     if operations is None:
@@ -53,31 +67,82 @@ def spending_by_category(operations: Optional[DataFrame], category: str, date_r:
         logger_reports.error("Category is None")
         return None
 
-    if date_r is None:
+    if date_r is None or not str(date_r).strip():
         user_date = pd.to_datetime("today").normalize()
     else:
         user_date = pd.to_datetime(date_r)
 
     try:
         start_date = user_date - pd.DateOffset(months=3)
-        operations["Дата операции"] = pd.to_datetime(operations["Дата операции"], dayfirst=True)
-        filter_total = operations[
-            (operations["Дата операции"].between(start_date, user_date)) & (operations["Категория"] == category)
-        ]
-        filter_total = filter_total[filter_total["Статус"] == "OK"]
-
-        if filter_total.empty:
-            logger_reports.info(f"No data found for category '{category}' from {start_date} to {user_date}.")
+        cells = get_cells(operations, start_date, user_date + pd.Timedelta(1, "ns"))
+        cells = cells[(cells["Категория"] == category) & (cells["Статус"] == "OK")]
+
+        if cells.empty:
+            logger_reports.info("No data found for category '%s' from %s to %s.", category, start_date, user_date)
             return json.dumps({})
 
-        result_df = (
-            filter_total[["Категория", "Сумма операции с округлением"]].groupby("Категория").sum().reset_index()
-        )
+        result_df = cells[["Категория", "rounded"]].groupby("Категория", observed=True).sum()
 
-        result_dict = result_df.set_index("Категория")["Сумма операции с округлением"].to_dict()
+        result_dict = as_money(result_df["rounded"]).to_dict()
         result_json = json.dumps(result_dict, ensure_ascii=False, indent=4)
-        logger_reports.info(f"Data received from {start_date} to {user_date}")
+        logger_reports.info("Data received from %s to %s", start_date, user_date)
         return result_json
     except Exception as e:  # pragma: no cover
-        logger_reports.error(f"Error: {e}")
+        logger_reports.error("Error: %s", e)
+        return None
+
+
+def _ok_rows(operations: DataFrame | Snapshot | Iterator[DataFrame], columns: List[str]) -> DataFrame:
+    """
+    Успешные операции (статус OK) с нужными колонками из снимка, таблицы или потока частей
+    """
+    if isinstance(operations, (DataFrame, Snapshot)):
+        chunks: Iterable[DataFrame] = [normalize_operations(as_frame(operations))]
+    else:
+        chunks = (normalize_operations(chunk) for chunk in operations)
+    parts = [chunk.loc[chunk["Статус"] == "OK", columns] for chunk in chunks]
+    return pd.concat(parts, ignore_index=True) if parts else DataFrame(columns=columns)
+
+
+@log("log.log")
+@memoize(categories=normalize_list, dates=normalize_list)
+@traced()
+def spending_by_categories(
+    operations: Optional[DataFrame | Snapshot | Iterator[DataFrame]],
+    categories: Optional[List[str]],
+    dates: List[str],
+) -> str | None:
+    """
+    Траты по нескольким категориям за три месяца до каждой из дат — то же,
+    что spending_by_category для всех пар (категория, дата), но за один проход по таблице.
+    categories=None — все категории. Возвращает {дата: {категория: сумма}};
+    как и в spending_by_category, категории без операций в окне не включаются
+    """
+    logger_reports.info(
+        "Bulk run: %s dates, %s categories", len(dates), "all" if categories is None else len(categories)
+    )
+    if operations is None:
+        logger_reports.error("operations is None")
+        return None
+
+    try:
+        user_dates = pd.DatetimeIndex([pd.to_datetime(date) for date in dates])
+        rows = _ok_rows(operations, [DATE_COLUMN, "Категория", "Сумма операции с округлением"])
+        labels, sums, counts = window_sums(
+            rows, "Категория", "Сумма операции с округлением", user_dates - pd.DateOffset(months=3), user_dates
+        )
+        wanted = set(labels if categories is None else categories)
+
+        result_dict = {
+            str(date): {
+                label: round(float(sums[i, j]), 2)
+                for j, label in enumerate(labels)
+                if label in wanted and counts[i, j] > 0
+            }
+            for i, date in enumerate(dates)
+        }
+        logger_reports.info("Bulk data received for %s operations", len(rows))
+        return json.dumps(result_dict, ensure_ascii=False, indent=4)
+    except Exception as e:  # pragma: no cover
+        logger_reports.error("Error: %s", e)
         return None
@@ -0,0 +1,80 @@
+import logging
+
+import pandas as pd
+from pandas import DataFrame
+
+import config
+
+logger_schema = logging.getLogger("schema")
+
+DATE_COLUMN = "Дата операции"
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+CATEGORY_COLUMNS = ["Категория", "Статус", "Валюта операции", "Номер карты"]
+AMOUNT_COLUMNS = ["Сумма операции", "Сумма платежа", "Кэшбэк", "Сумма операции с округлением"]
+
+
+def _is_date(series: pd.Series) -> bool:
+    return bool(pd.api.types.is_datetime64_any_dtype(series))
+
+
+def _is_category(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def _is_amount(series: pd.Series) -> bool:
+    return bool(series.dtype == config.AMOUNT_DTYPE)
+
+
+def as_money(values: pd.Series) -> pd.Series:
+    """
+    Суммы для ответа: float64, округлённые до копеек.
+    При AMOUNT_DTYPE = "float32" в ответ не попадают np.float32 (их не сериализует json)
+    и «хвосты» вида 27556.470703125
+    """
+    return values.astype("float64").round(2)
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """
+    Переводит даты операций в datetime64 по явному формату.
+    Если формат не подошёл, даты разбираются с dayfirst=True
+    """
+    try:
+        return pd.to_datetime(series, format=DATE_FORMAT)
+    except ValueError:
+        logger_schema.warning("Dates do not match %s, falling back to dayfirst parsing", DATE_FORMAT)
+        return pd.to_datetime(series, dayfirst=True)
+
+
+def is_normalized(operations: DataFrame) -> bool:
+    """
+    Проверяет, что присутствующие в таблице колонки уже приведены к схеме
+    """
+    if DATE_COLUMN in operations and not _is_date(operations[DATE_COLUMN]):
+        return False
+    if any(col in operations and not _is_category(operations[col]) for col in CATEGORY_COLUMNS):
+        return False
+    return not any(col in operations and not _is_amount(operations[col]) for col in AMOUNT_COLUMNS)
+
+
+def normalize_operations(operations: DataFrame) -> DataFrame:
+    """
+    Приводит таблицу операций к типизированной схеме:
+    дата операции — datetime64, категориальные колонки — category,
+    суммы — config.AMOUNT_DTYPE. Уже приведённая таблица возвращается без копирования,
+    исходная таблица не изменяется
+    """
+    if is_normalized(operations):
+        return operations
+
+    operations = operations.copy()
+    if DATE_COLUMN in operations and not _is_date(operations[DATE_COLUMN]):
+        operations[DATE_COLUMN] = parse_dates(operations[DATE_COLUMN])
+    for col in CATEGORY_COLUMNS:
+        if col in operations and not _is_category(operations[col]):
+            operations[col] = operations[col].astype("category")
+    for col in AMOUNT_COLUMNS:
+        if col in operations and not _is_amount(operations[col]):
+            operations[col] = operations[col].astype(config.AMOUNT_DTYPE)
+    logger_schema.info("Operations normalized: %s rows", len(operations))
+    return operations
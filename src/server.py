@@ -0,0 +1,212 @@
+import argparse
+import json
+import logging
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import config
+from src import memo
+from src.logging_config import setup_logging
+from src.metrics import export_metrics
+from src.metrics import inc
+from src.metrics import metrics
+from src.reports import spending_by_category
+from src.services import get_cash_month
+from src.store import OperationsStore
+from src.store import get_snapshot
+from src.store import operations_store
+from src.views import str_main
+
+logger_server = logging.getLogger("server")
+
+Params = Dict[str, str]
+Response = Tuple[int, str]
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _param(params: Params, name: str, required: bool = True) -> Optional[str]:
+    value = params.get(name)
+    if required and not value:
+        raise BadRequest(f"Parameter '{name}' is required")
+    return value or None
+
+
+def _int_param(params: Params, name: str) -> int:
+    value = _param(params, name)
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except ValueError:
+        raise BadRequest(f"Parameter '{name}' must be an integer")
+
+
+def _json_or_404(result: Optional[str]) -> Response:
+    if result is None:
+        return 404, json.dumps({"error": "No data"})
+    return 200, result
+
+
+def dashboard(params: Params) -> Response:
+    """
+    /dashboard?date=YYYY-MM-DD HH:MM:SS[&deadline=секунды]
+    """
+    date = _param(params, "date")
+    try:
+        deadline = float(params["deadline"]) if params.get("deadline") else None
+    except ValueError:
+        raise BadRequest("Parameter 'deadline' must be a number")
+    return _json_or_404(str_main(date, deadline))  # type: ignore[arg-type]
+
+
+def cashback(params: Params) -> Response:
+    """
+    /cashback?year=YYYY&month=MM
+    """
+    return _json_or_404(get_cash_month(get_snapshot(), _int_param(params, "year"), _int_param(params, "month")))
+
+
+def spending(params: Params) -> Response:
+    """
+    /spending?category=Супермаркеты[&date=YYYY-MM-DD]
+    """
+    category = _param(params, "category")
+    return _json_or_404(spending_by_category(get_snapshot(), category, _param(params, "date", required=False)))
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """
+    Многопоточный HTTP-сервис отчётов. Таблица операций, куб агрегатов и кэш котировок
+    живут в памяти процесса; фоновый поток следит за изменением файлов и подменяет снимок
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        store: OperationsStore = operations_store,
+        reload_interval: float = config.SERVER_RELOAD_INTERVAL,
+    ) -> None:
+        super().__init__(address, DashboardHandler)
+        self.store = store
+        self.reload_interval = reload_interval
+        self.started_at = time.time()
+        self.routes: Dict[str, Callable[[Params], Response]] = {
+            "/dashboard": dashboard,
+            "/cashback": cashback,
+            "/spending": spending,
+        }
+        self._stopped = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, name="store-watcher", daemon=True)
+
+    def health(self) -> Dict[str, Any]:
+        snapshot = self.store.get()
+        return {
+            "status": "ok" if snapshot is not None else "no data",
+            "version": None if snapshot is None else snapshot.version,
+            "rows": 0 if snapshot is None else len(snapshot.operations),
+            "uptime": round(time.time() - self.started_at, 1),
+            "result_cache": memo.result_cache.stats(),
+        }
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self.store.get()
+        self._watcher.start()
+        super().serve_forever(poll_interval)
+
+    def server_close(self) -> None:
+        self._stopped.set()
+        super().server_close()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.reload_interval):
+            self.store.refresh()
+            if config.PATH_TO_METRICS:
+                export_metrics(config.PATH_TO_METRICS)
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    server: DashboardServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        started = time.perf_counter()
+        if url.path == "/metrics":
+            self._send(200, metrics.to_prometheus(), PROMETHEUS_CONTENT_TYPE)
+            return
+        try:
+            if url.path == "/health":
+                status, body = 200, json.dumps(self.server.health())
+            elif url.path in self.server.routes:
+                status, body = self.server.routes[url.path](params)
+            else:
+                status, body = 404, json.dumps({"error": f"Unknown path {url.path}"})
+        except BadRequest as e:
+            status, body = 400, json.dumps({"error": str(e)}, ensure_ascii=False)
+        except Exception as e:
+            logger_server.error("%s failed: %s", url.path, e)
+            status, body = 500, json.dumps({"error": "Internal error"})
+        self._send(status, body)
+        route = url.path if url.path == "/health" or url.path in self.server.routes else "other"
+        inc("http_requests", path=route, status=str(status))
+        logger_server.info("GET %s %s %.1f ms", url.path, status, (time.perf_counter() - started) * 1000)
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != "/reload":
+            self._send(404, json.dumps({"error": f"Unknown path {self.path}"}))
+            return
+        self.server.store.refresh()
+        self._send(200, json.dumps(self.server.health()))
+
+    def _send(self, status: int, body: str, content_type: str = "application/json; charset=utf-8") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pragma: no cover
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> None:  # pragma: no cover
+    """
+    python -m src.server [--host 127.0.0.1] [--port 8000]
+    """
+    parser = argparse.ArgumentParser(description="HTTP-сервис отчётов по операциям")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    server = DashboardServer((args.host, args.port))
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"Сервис запущен: http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if config.PATH_TO_METRICS:
+            export_metrics(config.PATH_TO_METRICS)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,44 +1,104 @@
 import json
 import logging
+from typing import Dict
+from typing import Iterator
 from typing import Optional
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
-import config
-from src.utils import read_excel
+from src.dataset import Snapshot
+from src.dataset import get_cells
+from src.index import slice_by_date
+from src.memo import memoize
+from src.metrics import inc
+from src.metrics import traced
+from src.numpy_backend import category_cashback
+from src.numpy_backend import resolve_backend
+from src.schema import as_money
+from src.schema import normalize_operations
 
 pd.options.mode.copy_on_write = True
 
 logger_cash = logging.getLogger("cash")
 
-path_xl = str(config.PATH_TO_OPERATIONS)
-operations = read_excel(path_xl)
 
+def _numpy_cash_month(
+    operations: DataFrame | Snapshot, start: pd.Timestamp, end: pd.Timestamp
+) -> Optional[Tuple[int, Dict[str, float], int]]:
+    """
+    (операций за месяц, кешбэк по категориям, операций с кешбэком) движком numpy:
+    для снимка — по ячейкам куба, для таблицы — прямо по строкам месяца.
+    None — нужен расчёт в pandas
+    """
+    if isinstance(operations, Snapshot):
+        cells = get_cells(operations, start, end)
+        rows = int(cells["count"].sum()) if not cells.empty else 0
+        cashback = category_cashback(
+            cells["Категория"], cells["Статус"], cells["cashback_positive"], cells["cashback_count"].to_numpy()
+        )
+    else:
+        cells = slice_by_date(normalize_operations(operations), start, end, inclusive="left")
+        rows = len(cells)
+        positive = (cells["Кэшбэк"] > 0).to_numpy().astype(np.int64)
+        cashback = category_cashback(cells["Категория"], cells["Статус"], cells["Кэшбэк"], positive)
+    if cashback is None:
+        logger_cash.debug("Amounts with fractions of a kopeck, falling back to pandas")
+        return None
+    return rows, *cashback
 
-def get_cash_month(operations: Optional[DataFrame], year: int, month: int) -> str | None:
+
+@memoize(year=int, month=int)
+@traced()
+def get_cash_month(
+    operations: Optional[DataFrame | Snapshot | Iterator[DataFrame]],
+    year: int,
+    month: int,
+    backend: Optional[str] = None,
+) -> str | None:
     """
-    Функция принимает файл, год, месяц и возвращает список выгодных категорий повышенного кэшбэка
+    Функция принимает файл, год, месяц и возвращает список выгодных категорий повышенного кэшбэка.
+    Для снимка из хранилища суммы берутся из готового куба агрегатов,
+    поток частей таблицы (iter_excel) агрегируется по частям.
+    backend — "pandas" или "numpy" (по умолчанию config.COMPUTE_BACKEND), ответ совпадает до байта
     """
-    logger_cash.info(f"Function run for {month}.{year}")
+    backend = resolve_backend(backend)
+    logger_cash.info("Function run for %s.%s", month, year)
 
     if operations is None:
         logger_cash.error("operations is None")
         return None
 
-    operations["Дата операции"] = pd.to_datetime(operations["Дата операции"], format="%d.%m.%Y %H:%M:%S")
-    filter_df = operations[
-        (operations["Дата операции"].dt.year == year) & (operations["Дата операции"].dt.month == month)
-    ]
-    if filter_df.empty:
-        logger_cash.error(f"No data for this date: {month}.{year}")
+    try:
+        month_start = pd.Timestamp(year=year, month=month, day=1)
+    except ValueError:
+        logger_cash.error("No data for this date: %s.%s", month, year)
         return None
+    month_end = month_start + pd.DateOffset(months=1)
+    numpy_result = None
+    if backend == "numpy" and isinstance(operations, (DataFrame, Snapshot)):
+        numpy_result = _numpy_cash_month(operations, month_start, month_end)
+
+    if numpy_result is not None:
+        rows, result_dict, records = numpy_result
+        if rows == 0:
+            logger_cash.error("No data for this date: %s.%s", month, year)
+            return None
+        inc("rows_matched", rows, stage="cash_month")
+    else:
+        cells = get_cells(operations, month_start, month_end)
+        if cells.empty:
+            logger_cash.error("No data for this date: %s.%s", month, year)
+            return None
 
-    filter_df = filter_df[filter_df["Кэшбэк"] > 0]
-    filter_df = filter_df[filter_df["Статус"] == "OK"]
-    filter_df_col = filter_df[["Категория", "Кэшбэк"]].groupby("Категория").sum().reset_index()
-    result_dict = filter_df_col.set_index("Категория")["Кэшбэк"].to_dict()
+        inc("rows_matched", int(cells["count"].sum()), stage="cash_month")
+        cells = cells[(cells["cashback_count"] > 0) & (cells["Статус"] == "OK")]
+        cells_col = cells[["Категория", "cashback_positive"]].groupby("Категория", observed=True).sum()
+        result_dict = as_money(cells_col["cashback_positive"]).to_dict()
+        records = cells["cashback_count"].sum()
 
     result_json = json.dumps(result_dict, ensure_ascii=False, indent=4)
-    logger_cash.info(f"Data received by month: {len(filter_df)} records found")
+    logger_cash.info("Data received by month: %s records found", records)
     return result_json
@@ -0,0 +1,252 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+import config
+from src.cache import load_frame
+from src.cache import load_meta
+from src.columnar import export_columns
+from src.columnar import load_columns_meta
+from src.columnar import open_columns
+from src.dataset import Snapshot
+from src.index import sort_by_date
+from src.metrics import traced
+from src.schema import normalize_operations
+from src.utils import read_excel
+
+logger_store = logging.getLogger("store")
+
+SourceKey = Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]
+
+
+def read_journal(path_ingested: str) -> Dict[str, Any]:
+    """
+    Журнал добавленных строк: {"files": {sha256: имя файла}, "parts": [имя части, ...]}.
+    Каждая загрузка дописывает строки отдельной частью рядом с журналом, прежние части не переписываются
+    """
+    meta = load_meta(Path(path_ingested))
+    if meta is None:
+        return {"files": {}, "parts": []}
+    return {"files": dict(meta["key"]["files"]), "parts": list(meta["key"].get("parts", []))}
+
+
+def load_parts(path_ingested: str, parts: List[str]) -> DataFrame | None:
+    """
+    Строки перечисленных частей журнала в порядке добавления
+    """
+    frames = [load_frame(Path(path_ingested).with_name(part)) for part in parts]
+    if not frames:
+        return None
+    return normalize_operations(pd.concat(frames, ignore_index=True))
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class OperationsStore:
+    """
+    Общий для процесса источник таблицы операций: выписка operations.xlsx
+    и строки, добавленные инкрементальной загрузкой.
+    Файлы читаются при первом обращении и перечитываются в фоне только после их изменения на диске.
+    Если изменился только журнал добавленных строк, загруженный снимок дополняется новыми частями журнала
+    (куб агрегатов при этом дополняется, а не строится заново).
+    Если задан path_columns, таблица выгружается в колоночный файл и отображается из него в память:
+    процессы с общим path_columns делят одну копию таблицы
+    """
+
+    def __init__(
+        self, path_xlsx: str, path_ingested: Optional[str] = None, path_columns: Optional[str] = None
+    ) -> None:
+        self.path_xlsx = path_xlsx
+        self.path_ingested = path_ingested
+        self.path_columns = path_columns
+        self._snapshot: Optional[Snapshot] = None
+        self._key: Optional[SourceKey] = None
+        self._parts: List[str] = []
+        self._failed_key: Optional[SourceKey] = None
+        self._lock = threading.Lock()
+        self._reloading = threading.Lock()
+
+    def _source_key(self) -> SourceKey:
+        return _stat_key(self.path_xlsx), _stat_key(self.path_ingested) if self.path_ingested else None
+
+    def _version(self, key: SourceKey) -> str:
+        """
+        Версия данных: отпечаток путей к файлам и размер.mtime каждого файла
+        """
+        paths = f"{os.path.abspath(self.path_xlsx)}|{os.path.abspath(self.path_ingested or '')}"
+        source = hashlib.sha1(paths.encode("utf-8")).hexdigest()[:12]
+        return "-".join([source] + ["none" if part is None else f"{part[0]}.{part[1]}" for part in key])
+
+    def _journal_parts(self, key: SourceKey) -> List[str]:
+        if key[1] is None or not self.path_ingested:
+            return []
+        parts: List[str] = read_journal(self.path_ingested)["parts"]
+        return parts
+
+    def _read(self, key: SourceKey, parts: List[str]) -> DataFrame | None:
+        logger_store.info("Loading operations from %s", self.path_xlsx)
+        operations = read_excel(self.path_xlsx, use_cache=True)
+        if operations is None:
+            return None
+        ingested = load_parts(self.path_ingested, parts) if self.path_ingested else None
+        if ingested is not None:
+            logger_store.info("Loaded %s ingested rows from %s", len(ingested), self.path_ingested)
+            operations = pd.concat([normalize_operations(operations), ingested], ignore_index=True)
+        return sort_by_date(normalize_operations(operations))
+
+    def _map(self, key: SourceKey, parts: List[str]) -> DataFrame | None:
+        """
+        Таблица из колоночного файла; файл выгружается заново, если он построен по другой версии файлов
+        """
+        path_columns = Path(self.path_columns)  # type: ignore[arg-type]
+        meta = load_columns_meta(path_columns)
+        if meta is None or meta["key"] != self._version(key):
+            operations = self._read(key, parts)
+            if operations is None:
+                return None
+            try:
+                export_columns(operations, path_columns, self._version(key))
+            except (OSError, TypeError, ValueError) as e:
+                logger_store.error("Cannot export columns to %s, keeping the table in memory: %s", path_columns, e)
+                return operations
+        return open_columns(path_columns)
+
+    def _extend(self, key: SourceKey, parts: List[str]) -> Snapshot | None:
+        """
+        Текущий снимок, дополненный новыми частями журнала; None — если так обновить нельзя:
+        изменилась сама выписка, журнал переписан или таблица отображается из колоночного файла
+        """
+        snapshot, loaded = self._snapshot, self._parts
+        if snapshot is None or self.path_columns or not self.path_ingested:
+            return None
+        if self._key is None or key[0] != self._key[0]:
+            return None
+        n_loaded = len(loaded)
+        if parts[:n_loaded] != loaded or len(parts) == n_loaded:
+            return None
+        rows = load_parts(self.path_ingested, parts[n_loaded:])
+        if rows is None:
+            return None
+        logger_store.info("Appending %s ingested rows from %s new parts", len(rows), len(parts) - n_loaded)
+        return snapshot.append(rows, version=self._version(key))
+
+    @traced("load_operations")
+    def _load(self, key: SourceKey) -> Tuple[Snapshot | None, List[str]]:
+        parts = self._journal_parts(key)
+        snapshot = self._extend(key, parts)
+        if snapshot is not None:
+            return snapshot, parts
+        operations = self._map(key, parts) if self.path_columns else self._read(key, parts)
+        if operations is None:
+            return None, parts
+        # _read сортирует по дате, колоночный файл пишется уже отсортированным
+        return Snapshot(operations, version=self._version(key), date_sorted=True), parts
+
+    def get(self) -> Snapshot | None:
+        """
+        Возвращает текущий снимок таблицы операций.
+        Если файлы изменились, сразу отдаётся прежний снимок, а новый строится в фоне (refresh).
+        Ждут загрузки только первые обращения, пока снимка ещё нет
+        """
+        key = self._source_key()
+        with self._lock:
+            snapshot, is_stale = self._snapshot, key != self._key
+        if snapshot is None:
+            with self._reloading:
+                if self._snapshot is None:
+                    self._reload(self._source_key())
+                return self._snapshot
+        if is_stale and key != self._failed_key and not self._reloading.locked():
+            self._refresh_in_background()
+        return snapshot
+
+    def refresh(self) -> bool:
+        """
+        Перечитывает изменившиеся файлы, не блокируя читателей: новый снимок строится
+        вне блокировки и подменяет прежний только после успешной загрузки.
+        Возвращает True, если снимок был заменён
+        """
+        key = self._source_key()
+        with self._lock:
+            if self._snapshot is not None and key == self._key:
+                return False
+        if not self._reloading.acquire(blocking=False):
+            return False
+        try:
+            return self._reload(key)
+        finally:
+            self._reloading.release()
+
+    def _reload(self, key: SourceKey) -> bool:
+        snapshot, parts = None, []
+        try:
+            snapshot, parts = self._load(key)
+        except Exception as e:
+            logger_store.error("Reload failed, keeping version %s: %s", self._key, e)
+        with self._lock:
+            if snapshot is None:
+                self._failed_key = key
+                return False
+            self._snapshot = snapshot
+            self._key = key
+            self._parts = parts
+            self._failed_key = None
+        logger_store.info("Operations reloaded, version %s", snapshot.version)
+        return True
+
+    def _refresh_in_background(self) -> None:
+        threading.Thread(target=self.refresh, name="store-refresh", daemon=True).start()
+
+    def append(self, rows: DataFrame, part: str) -> Snapshot | None:
+        """
+        Добавляет в загруженный снимок новые строки, уже сохранённые на диск частью журнала part.
+        Куб агрегатов дополняется, а не строится заново
+        """
+        key = self._source_key()
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            self._snapshot = self._snapshot.append(rows, version=self._version(key))
+            self._key = key
+            self._parts = self._parts + [part]
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает загруженный снимок, следующий вызов get перечитает файлы
+        """
+        with self._lock:
+            self._snapshot = None
+            self._key = None
+            self._parts = []
+            self._failed_key = None
+
+
+operations_store = OperationsStore(
+    str(config.PATH_TO_OPERATIONS),
+    str(config.PATH_TO_INGESTED),
+    str(config.PATH_TO_COLUMNS) if config.PATH_TO_COLUMNS else None,
+)
+
+
+def get_snapshot() -> Snapshot | None:
+    """
+    Возвращает снимок таблицы операций из общего хранилища процесса
+    """
+    return operations_store.get()
@@ -0,0 +1,49 @@
+from typing import Dict
+
+import numpy as np
+
+
+def top_positions(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Позиции k наибольших значений по убыванию без полной сортировки массива:
+    порог находится частичной сортировкой (np.partition) за O(n),
+    сортируются только отобранные k элементов.
+    Равные значения идут в порядке следования, NaN — в конце, как у sort_values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if k <= 0 or len(values) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    is_nan = np.isnan(values)
+    valid = np.flatnonzero(~is_nan)
+    if len(valid) > k:
+        candidates = values[valid]
+        kth = np.partition(candidates, len(candidates) - k)[len(candidates) - k]
+        above = valid[candidates > kth]
+        equal = valid[candidates == kth][: k - len(above)]
+        valid = np.sort(np.concatenate([above, equal]))
+
+    order = valid[np.argsort(-values[valid], kind="stable")]
+    if len(order) < k:
+        order = np.concatenate([order, np.flatnonzero(is_nan)[: k - len(order)]])
+    return order
+
+
+def grouped_top_positions(codes: np.ndarray, values: np.ndarray, k: int) -> Dict[int, np.ndarray]:
+    """
+    top_positions внутри каждой группы: {код группы: позиции}.
+    Строки раскладываются по группам устойчивой сортировкой целочисленных кодов,
+    строки без группы (код -1) пропускаются
+    """
+    values = np.asarray(values, dtype=np.float64)
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    groups = np.unique(sorted_codes[sorted_codes >= 0])
+    bounds = np.searchsorted(sorted_codes, np.append(groups, groups[-1] + 1 if len(groups) else 0))
+
+    result = {}
+    for i, code in enumerate(groups):
+        lo, hi = bounds[i], bounds[i + 1]
+        positions = order[lo:hi]
+        result[int(code)] = positions[top_positions(values[positions], k)]
+    return result
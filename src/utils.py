@@ -1,30 +1,42 @@
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import requests
 from dotenv import load_dotenv
 from pandas import DataFrame
 
 import config
+from src.cache import cached_read
+from src.dataset import Snapshot
+from src.dataset import as_frame
+from src.index import slice_by_date
+from src.metrics import inc
+from src.metrics import propagate
+from src.metrics import traced
+from src.numpy_backend import card_totals
+from src.numpy_backend import resolve_backend
+from src.quote_cache import QuoteCache
+from src.schema import as_money
+from src.schema import normalize_operations
+from src.topk import grouped_top_positions
+from src.topk import top_positions
 
 pd.options.mode.copy_on_write = True
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    filename=config.PATH_TO_LOGGER / "utils.log",
-    filemode="w",
-    encoding="utf-8",
-    format="%(asctime)s - %(name)s - %(levelname)s: %(message)s",
-)
-
 logger_greeting = logging.getLogger("greeting")
 logger_excel = logging.getLogger("excel")
 logger_filter_date = logging.getLogger("filter_date")
@@ -35,11 +47,24 @@ logger_currency = logging.getLogger("currency")
 logger_stock = logging.getLogger("stock")
 
 url_c = os.getenv("url_c")
+url_c_batch = os.getenv("url_c_batch")
 api_key_c = os.getenv("my_apikey_c")
 
 url_s = os.getenv("url_s")
 api_key_s = os.getenv("my_apikey_s")
 
+FX_BASE = "RUB"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+quote_cache = QuoteCache(
+    path=config.PATH_TO_QUOTE_CACHE,
+    ttls=config.QUOTE_TTL,
+    max_size=config.QUOTE_CACHE_SIZE,
+    stale_while_revalidate=config.QUOTE_STALE_WHILE_REVALIDATE,
+)
+
 
 def get_time_greeting() -> str:
     """
@@ -59,27 +84,74 @@ def get_time_greeting() -> str:
         else:
             return "Доброй ночи"
     except Exception as e:  # pragma: no cover
-        logger_greeting.error(f"Error: {e}")
+        logger_greeting.error("Error: %s", e)
         return ""
 
 
-def read_excel(path_xlsx: str) -> DataFrame | None:
+@traced()
+def read_excel(path_xlsx: str, use_cache: bool = False) -> DataFrame | None:
     """
-    Чтение Exel файла
+    Чтение Exel файла.
+    При use_cache=True таблица берётся из колоночного кэша рядом с файлом,
+    кэш пересобирается при изменении исходного файла
     """
     logger_excel.info("Function run")
 
     if not os.path.exists(path_xlsx) or os.path.getsize(path_xlsx) == 0:
         logger_excel.error("Path_xlsx does not exist or is empty")
         return None
+    elif use_cache:
+        df = cached_read(path_xlsx, pd.read_excel)
+        logger_excel.info("Data received")
     else:
         df = pd.read_excel(path_xlsx)
         logger_excel.info("Data received")
 
+    inc("rows_read", len(df))
     return df
 
 
-def get_filter_date_df(operations: Optional[DataFrame], date: str) -> DataFrame | None:
+def iter_excel(path_xlsx: str, chunk_size: int = 10_000) -> Iterator[DataFrame]:
+    """
+    Потоковое чтение Exel файла: лист читается построчно в режиме read_only
+    и отдаётся частями по chunk_size строк, приведёнными к схеме операций
+    """
+    logger_excel.info("Streaming run, chunk_size=%s", chunk_size)
+
+    if not os.path.exists(path_xlsx) or os.path.getsize(path_xlsx) == 0:
+        logger_excel.error("Path_xlsx does not exist or is empty")
+        return
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path_xlsx, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield normalize_operations(DataFrame(chunk, columns=header))
+                chunk = []
+        if chunk:
+            yield normalize_operations(DataFrame(chunk, columns=header))
+    finally:
+        workbook.close()
+    logger_excel.info("Data streamed")
+
+
+def month_to_date(date: str) -> tuple[str, str]:
+    """
+    Границы окна get_filter_date_df: начало месяца даты date и сама дата (включительно)
+    """
+    return datetime.strptime(date, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-1 00:00:00"), date
+
+
+@traced()
+def get_filter_date_df(operations: Optional[DataFrame | Snapshot], date: str) -> DataFrame | None:
     """
     Функция принимает файл, входящую дату и возвращает данные с начала месяца,
     на который выпадает входящая дата, по входящую дату
@@ -90,67 +162,157 @@ def get_filter_date_df(operations: Optional[DataFrame], date: str) -> DataFrame
         logger_filter_date.error("operations is None")
         return None
 
-    date_start = datetime.strptime(date, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-1 00:00:00")
-    operations["Дата операции"] = pd.to_datetime(operations["Дата операции"], dayfirst=True)
-    filter_df = operations[operations["Дата операции"].between(date_start, date)]
-    logger_filter_date.info(f"Data received from {date_start} to {date} {len(filter_df)} records found")
+    frame = normalize_operations(as_frame(operations))
+    date_start, date = month_to_date(date)
+    sorted_by_date = isinstance(operations, Snapshot) and operations.sorted_by_date
+    filter_df = slice_by_date(frame, date_start, date, sorted_by_date=sorted_by_date)
+    inc("rows_scanned", len(frame), stage="filter_date")
+    inc("rows_matched", len(filter_df), stage="filter_date")
+    logger_filter_date.info("Data received from %s to %s %s records found", date_start, date, len(filter_df))
     return filter_df
 
 
-def get_cards(df_filter_date: Optional[DataFrame]) -> list[dict] | None:
+def iter_filter_date(chunks: Iterable[DataFrame], date: str) -> Iterator[DataFrame]:
+    """
+    Потоковый вариант get_filter_date_df: фильтрует каждую часть таблицы
+    """
+    for chunk in chunks:
+        filter_df = get_filter_date_df(chunk, date)
+        if filter_df is not None and not filter_df.empty:
+            yield filter_df
+
+
+def sum_by_card(df_filter_date: DataFrame) -> DataFrame:
+    """
+    Суммы расходов и кешбэка по картам (успешные списания); суммы частей таблицы можно складывать
+    """
+    df_filter_date = df_filter_date[df_filter_date["Сумма платежа"] < 0]
+    df_filter_date = df_filter_date[df_filter_date["Статус"] == "OK"]
+    return (
+        df_filter_date[["Номер карты", "Сумма операции с округлением", "Кэшбэк"]]
+        .groupby("Номер карты", observed=True)
+        .sum()
+    )
+
+
+def card_records(df_filter_col: DataFrame) -> list[dict]:
+    """
+    Ответ get_cards по суммам sum_by_card: последние 4 цифры карты, расходы и кешбэк
+    """
+    df_filter_col = df_filter_col.sort_index().reset_index()
+
+    df_filter_col.rename(
+        columns={
+            "Номер карты": "last_digits",
+            "Сумма операции с округлением": "total_spent",
+            "Кэшбэк": "cashback",
+        },
+        inplace=True,
+    )
+
+    dict_cards = df_filter_col.to_dict("records")
+
+    result = []
+    for i in dict_cards:
+        new_i = {
+            "last_digits": i["last_digits"].replace("*", ""),
+            "total_spent": round(float(i["total_spent"]), 2),
+            "cashback": round(float(i["cashback"]), 2),
+        }
+
+        result.append(new_i)
+    return result
+
+
+@traced()
+def get_cards(
+    df_filter_date: Optional[DataFrame | Snapshot | Iterable[DataFrame]],
+    backend: Optional[str] = None,
+    date: Optional[str] = None,
+) -> list[dict] | None:
     """
     Функция принимает отфильтрованную по дате таблицу и возвращает
     информацию по каждой карте: последние 4 цифры карты; общая сумма расходов; кешбэк.
+    Вместо таблицы можно передать поток её частей (iter_filter_date):
+    суммы по картам накапливаются по частям.
+    С датой date функция принимает всю таблицу или снимок и сама берёт окно get_filter_date_df
+    (поток частей с датой — TypeError: его фильтрует iter_filter_date);
+    для снимка ответ берётся из его накопленных сумм по картам, не просматривая строки месяца.
+    backend — "pandas" или "numpy" (по умолчанию config.COMPUTE_BACKEND), ответ совпадает до байта
     """
+    backend = resolve_backend(backend)
     logger_cards.info("Function run")
 
     if df_filter_date is None:
         logger_cards.error("Input DataFrame is None")
         return None
 
+    if date is not None:
+        if not isinstance(df_filter_date, (DataFrame, Snapshot)):
+            raise TypeError("get_cards(date=...) needs a DataFrame or Snapshot, filter chunks with iter_filter_date")
+        prefix = df_filter_date.card_prefix if isinstance(df_filter_date, Snapshot) else None
+        if prefix is not None:
+            result = prefix.totals(*month_to_date(date))
+            logger_cards.info("Result received from card prefix sums")
+            return result
+        df_filter_date = get_filter_date_df(df_filter_date, date)
+    operations = as_frame(df_filter_date) if isinstance(df_filter_date, Snapshot) else df_filter_date
+
     try:
-        df_filter_date = df_filter_date[df_filter_date["Сумма платежа"] < 0]
-        df_filter_date = df_filter_date[df_filter_date["Статус"] == "OK"]
-        df_filter_col = (
-            df_filter_date[["Номер карты", "Сумма операции с округлением", "Кэшбэк"]]
-            .groupby("Номер карты")
-            .sum()
-            .reset_index()
-        )
+        if isinstance(operations, DataFrame):
+            inc("rows_scanned", len(operations), stage="cards")
+            if backend == "numpy":
+                totals = card_totals(operations)
+                if totals is not None:
+                    logger_cards.info("Result received")
+                    return totals
+            df_filter_col = sum_by_card(operations)
+        else:
+            df_filter_col = None
+            for chunk in operations:
+                part = sum_by_card(chunk)
+                df_filter_col = part if df_filter_col is None else df_filter_col.add(part, fill_value=0)
+            if df_filter_col is None:
+                logger_cards.info("Result received")
+                return []
+        result = card_records(df_filter_col)
+        logger_cards.info("Result received")
+        return result
 
-        df_filter_col.rename(
-            columns={
-                "Номер карты": "last_digits",
-                "Сумма операции с округлением": "total_spent",
-                "Кэшбэк": "cashback",
-            },
-            inplace=True,
-        )
+    except Exception as e:  # pragma: no cover
+        logger_cards.error("Error: %s", e)
+        return None
 
-        dict_cards = df_filter_col.to_dict("records")
 
-        result = []
-        for i in dict_cards:
-            new_i = {
-                "last_digits": i["last_digits"].replace("*", ""),
-                "total_spent": round(i["total_spent"], 2),
-                "cashback": i["cashback"],
-            }
+TOP_COLUMNS = {
+    "Дата операции": "date",
+    "Сумма платежа": "amount",
+    "Категория": "category",
+    "Описание": "description",
+}
+TOP_GROUPS = ["Номер карты", "Категория", "month"]
 
-            result.append(new_i)
 
-        logger_cards.info("Result received")
-        return result
+def _top_records(rows: DataFrame) -> list[dict]:
+    df_top = rows[list(TOP_COLUMNS)]
+    df_top["Дата операции"] = df_top["Дата операции"].dt.strftime("%d.%m.%Y")
+    df_top["Сумма платежа"] = as_money(df_top["Сумма платежа"])
+    records: list[dict] = df_top.rename(columns=TOP_COLUMNS).to_dict("records")
+    return records
 
-    except Exception as e:  # pragma: no cover
-        logger_cards.error(f"Error: {e}")
-        return None
 
+def _top_rows(df: DataFrame, top: int) -> DataFrame:
+    rows = df[df["Статус"] == "OK"]
+    return rows.iloc[top_positions(rows["Сумма операции с округлением"].to_numpy(), top)]
 
-def get_top(df_filter_date: Optional[DataFrame], top: int = 5) -> list[dict] | None:
+
+@traced()
+def get_top(df_filter_date: Optional[DataFrame | Iterable[DataFrame]], top: int = 5) -> list[dict] | None:
     """
     Функция принимает отфильтрованную по дате таблицу
-    и возвращает топ-5 транзакций по сумме платежа
+    и возвращает топ-5 транзакций по сумме платежа.
+    Строки отбираются частичной сортировкой без сортировки всей таблицы;
+    поток частей таблицы (iter_filter_date) обрабатывается по частям, в памяти хранится только текущий топ
     """
     logger_top.info("Function run")
 
@@ -159,29 +321,65 @@ def get_top(df_filter_date: Optional[DataFrame], top: int = 5) -> list[dict] | N
         return None
 
     try:
-        df_filter_date = df_filter_date[df_filter_date["Статус"] == "OK"]
-        df_sorted = df_filter_date.sort_values(by="Сумма операции с округлением", ascending=False)
-        df_top_total = df_sorted[:top]
-        df_top = df_top_total[["Дата операции", "Сумма платежа", "Категория", "Описание"]]
-        df_top["Дата операции"] = df_top["Дата операции"].apply(lambda x: x.strftime("%d.%m.%Y"))
-
-        df_top.rename(
-            columns={
-                "Дата операции": "date",
-                "Сумма платежа": "amount",
-                "Категория": "category",
-                "Описание": "description",
-            },
-            inplace=True,
-        )
+        if isinstance(df_filter_date, DataFrame):
+            df_top = _top_rows(df_filter_date, top)
+        else:
+            df_top = None
+            for chunk in df_filter_date:
+                chunk_top = _top_rows(chunk, top)
+                df_top = chunk_top if df_top is None else _top_rows(pd.concat([df_top, chunk_top]), top)
+            if df_top is None:
+                return []
 
-        dict_top = df_top.to_dict("records")
+        dict_top = _top_records(df_top)
 
         logger_top.info("Result received")
         return dict_top
 
     except Exception as e:  # pragma: no cover
-        logger_cards.error(f"Error: {e}")
+        logger_top.error("Error: %s", e)
+        return None
+
+
+@traced()
+def get_top_grouped(
+    df_filter_date: Optional[DataFrame], top: int = 3, by: Iterable[str] = TOP_GROUPS
+) -> dict[str, dict[str, list[dict]]] | None:
+    """
+    Топ транзакций по сумме платежа внутри групп за один вызов:
+    {"Номер карты": {"*7197": [...]}, "Категория": {...}, "month": {"2021-12": [...]}}.
+    Каждая группировка — одна устойчивая сортировка целочисленных кодов групп
+    и частичная сортировка внутри групп
+    """
+    logger_top.info("Grouped run by %s", list(by))
+
+    if df_filter_date is None:
+        logger_top.error("Input DataFrame is None. Cannot process.")
+        return None
+
+    try:
+        is_ok = (df_filter_date["Статус"] == "OK").to_numpy()
+        values = df_filter_date["Сумма операции с округлением"].to_numpy()
+        result: dict[str, dict[str, list[dict]]] = {}
+        for key in by:
+            if key == "month":
+                months = df_filter_date["Дата операции"].to_numpy().astype("datetime64[M]").astype("datetime64[ns]")
+                codes, labels = pd.factorize(months, sort=True)
+                labels = pd.DatetimeIndex(labels).strftime("%Y-%m")
+            else:
+                codes, labels = pd.factorize(df_filter_date[key], sort=True)
+            codes[~is_ok] = -1
+
+            tops = grouped_top_positions(codes, values, top)
+            records = _top_records(df_filter_date.iloc[np.concatenate([[], *tops.values()]).astype(np.intp)])
+            bounds = np.cumsum([0, *(len(positions) for positions in tops.values())])
+            result[key] = {str(labels[code]): records[lo:hi] for code, lo, hi in zip(tops, bounds[:-1], bounds[1:])}
+
+        logger_top.info("Result received")
+        return result
+
+    except Exception as e:  # pragma: no cover
+        logger_top.error("Error: %s", e)
         return None
 
 
@@ -201,9 +399,125 @@ def load_json(path_json: str) -> Optional[Any]:
         return file
 
 
+def _apikey_c() -> Dict[str, str]:
+    return {"apikey": api_key_c or ""}
+
+
+def get_session() -> requests.Session:
+    """
+    Общая для процесса HTTP-сессия с пулом keep-alive соединений
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=config.HTTP_MAX_WORKERS)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def fetch_all(fetch: Callable[[str], Optional[Dict[str, Any]]], symbols: List[str]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Выполняет запросы по всем символам параллельно, не более config.HTTP_MAX_WORKERS одновременно.
+    Результаты возвращаются в порядке символов; если хотя бы один запрос не удался, возвращается None
+    """
+    if not symbols:
+        return []
+    with ThreadPoolExecutor(max_workers=min(config.HTTP_MAX_WORKERS, len(symbols))) as executor:
+        results = list(executor.map(propagate(fetch), symbols))
+    if any(result is None for result in results):
+        return None
+    return results
+
+
+@traced()
+def _fetch_currency(symbol: str) -> Optional[Dict[str, Any]]:
+    currency_from, _, currency_to = symbol.partition("/")
+    payload: Dict[str, Any] = {"amount": 1, "from": currency_from, "to": currency_to or FX_BASE}
+    inc("remote_calls", api="currency")
+    try:
+        response = get_session().get(url_c or "", headers=_apikey_c(), params=payload, timeout=config.HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        logger_currency.error("Request for %s failed: %s", symbol, e)
+        inc("remote_errors", api="currency")
+        return None
+
+    status_code = response.status_code
+    if status_code != 200:
+        logger_currency.error("Status_code: %s", status_code)
+        inc("remote_errors", api="currency")
+        return None
+
+    resp = response.json()
+    logger_currency.info("Request received")
+    cur_resp = symbol if currency_to else resp.get("query", {}).get("from")
+    cur_rate = round(float(resp.get("result")), 2)
+    return {"currency": cur_resp, "rate": cur_rate}
+
+
+@traced()
+def _fetch_rates_table() -> Optional[Dict[str, Any]]:
+    inc("remote_calls", api="currency_batch")
+    try:
+        response = get_session().get(
+            url_c_batch or "", headers=_apikey_c(), params={"base": FX_BASE}, timeout=config.HTTP_TIMEOUT
+        )
+    except requests.RequestException as e:
+        logger_currency.error("Rates table request failed: %s", e)
+        inc("remote_errors", api="currency_batch")
+        return None
+
+    status_code = response.status_code
+    if status_code != 200:
+        logger_currency.error("Rates table status_code: %s", status_code)
+        inc("remote_errors", api="currency_batch")
+        return None
+
+    resp = response.json()
+    rates = resp.get("rates")
+    if not rates:
+        logger_currency.error("Rates table response has no rates. Full response keys: %s", resp.keys())
+        return None
+    logger_currency.info("Rates table received: %s currencies", len(rates))
+    return {"base": resp.get("base", FX_BASE), "rates": rates}
+
+
+def cross_rate(table: Dict[str, Any], currency_from: str, currency_to: str) -> Optional[float]:
+    """
+    Курс currency_from -> currency_to по таблице курсов относительно базовой валюты:
+    1 base = rates[X] X, значит 1 from = rates[to] / rates[from] to
+    """
+    rates = {**table["rates"], table["base"]: 1.0}
+    if currency_from not in rates or currency_to not in rates:
+        return None
+    return float(rates[currency_to]) / float(rates[currency_from])
+
+
+def _rates_from_table(symbols: List[str]) -> Optional[List[Dict[str, Any]]]:
+    table = quote_cache.get(f"currency:table:{FX_BASE}", _fetch_rates_table)
+    if table is None:
+        return None
+
+    currency_rate = []
+    for symbol in symbols:
+        currency_from, _, currency_to = symbol.partition("/")
+        rate = cross_rate(table, currency_from, currency_to or FX_BASE)
+        if rate is None:
+            logger_currency.error("Currency %s is missing in the rates table", symbol)
+            return None
+        currency_rate.append({"currency": symbol, "rate": round(rate, 2)})
+    return currency_rate
+
+
+@traced()
 def get_currency(user_settings: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
     """
-    Функция принимает файл настроек и возвращает курс валют
+    Функция принимает файл настроек и возвращает курс валют к рублю,
+    а также курсы пар из user_currency_pairs (например, "USD/EUR").
+    Если задан url_c_batch, все курсы считаются локально по одной таблице курсов,
+    иначе (или при ошибке) каждый курс запрашивается отдельно через url_c.
+    Ответы берутся из quote_cache, недостающие запрашиваются параллельно через общую HTTP-сессию
     """
     logger_currency.info("Function run")
 
@@ -211,77 +525,78 @@ def get_currency(user_settings: Optional[Dict[str, Any]]) -> Optional[List[Dict[
         logger_currency.error("user_settings is None")
         return None
 
-    currency_rate = []
+    symbols = user_settings["user_currencies"] + user_settings.get("user_currency_pairs", [])
 
-    currencies = user_settings["user_currencies"]
-    for currency in currencies:
-        payload = {"amount": 1, "from": currency, "to": "RUB"}
-        headers = {"apikey": api_key_c}
-
-        if url_c is not None:
-            response = requests.get(url_c, headers=headers, params=payload)
-
-            status_code = response.status_code
-            if status_code == 200:
-                resp = response.json()
-                logger_currency.info("Request received")
-                cur_resp = resp.get("query", {}).get("from")
-                cur_rate = round(float(resp.get("result")), 2)
-                currency_rate.append({"currency": cur_resp, "rate": cur_rate})
-                logger_currency.info("Currencies received")
-            else:
-                logger_currency.error(f"Status_code: {status_code}")
-                return None
-        else:
-            logger_currency.error("URL not found, request skipped")
-            return None
+    if symbols and url_c_batch is not None:
+        currency_rate = _rates_from_table(symbols)
+        if currency_rate is not None:
+            logger_currency.info("Currencies received from rates table")
+            return currency_rate
+        logger_currency.error("Rates table unavailable, falling back to per-pair requests")
+
+    if symbols and url_c is None:
+        logger_currency.error("URL not found, request skipped")
+        return None
+
+    currency_rate = fetch_all(lambda c: quote_cache.get(f"currency:{c}", lambda: _fetch_currency(c)), symbols)
+    if currency_rate is not None:
+        logger_currency.info("Currencies received")
     return currency_rate
 
 
+@traced()
+def _fetch_stock(stock: str) -> Optional[Dict[str, Any]]:
+    params = {"function": "GLOBAL_QUOTE", "symbol": stock, "apikey": api_key_s or ""}
+    inc("remote_calls", api="stock")
+    try:
+        r = get_session().get(url_s or "", params=params, timeout=config.HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        logger_stock.error("Request for %s failed: %s", stock, e)
+        inc("remote_errors", api="stock")
+        return None
+
+    status_code = r.status_code
+    if status_code != 200:
+        logger_stock.error("Status_code: %s", status_code)
+        inc("remote_errors", api="stock")
+        return None
+
+    data = r.json()
+    logger_stock.info("Request received")
+
+    global_quote = data.get("Global Quote", {})
+    stock_symbol = global_quote.get("01. symbol")
+    price_str = global_quote.get("05. price")
+
+    if not (stock_symbol and price_str):
+        logger_stock.error("Missing data in Global Quote response for %s. Full response keys: %s", stock, data.keys())
+        logger_stock.error("API Error Message: %s", data.get("Note", "N/A"))
+        return None
+
+    try:
+        stock_price = round(float(price_str), 2)
+    except ValueError as e:  # pragma: no cover
+        logger_stock.error("Error converting price to float for %s: %s", stock_symbol, e)
+        return None
+    logger_stock.info("Stock %s received", stock_symbol)
+    return {"stock": stock_symbol, "price": stock_price}
+
+
+@traced()
 def get_stock(user_settings: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Функция принимает файл настроек и возвращает стоимость акций.
+    Котировки берутся из quote_cache, недостающие запрашиваются параллельно через общую HTTP-сессию
+    """
     logger_stock.info("Function run")
 
     if user_settings is None:
         logger_currency.error("user_settings is None.")
         return None
 
-    stocks_price = []
     stocks = user_settings["user_stocks"]
+    if stocks and url_s is None:
+        logger_stock.error("URL not found, request skipped")
+        return None
 
-    for stock in stocks:
-        params = {"function": "GLOBAL_QUOTE", "symbol": stock, "apikey": api_key_s}
-        if url_s is not None:
-            r = requests.get(url_s, params=params)
-            status_code = r.status_code
-
-            if status_code == 200:
-                data = r.json()
-                logger_stock.info("Request received")
-
-                global_quote = data.get("Global Quote", {})
-                stock_symbol = global_quote.get("01. symbol")
-                price_str = global_quote.get("05. price")
-
-                if stock_symbol and price_str:
-                    try:
-                        stock_price = round(float(price_str), 2)
-                        stocks_price.append({"stock": stock_symbol, "price": stock_price})
-                        logger_stock.info(f"Stock {stock_symbol} received")
-                    except ValueError as e:  # pragma: no cover
-                        logger_stock.error(f"Error converting price to float for {stock_symbol}: {e}")
-                        return None
-                else:
-                    logger_stock.error(
-                        f"Missing data in Global Quote response for {stock}. Full response keys: {data.keys()}"
-                    )
-                    logger_stock.error(f"API Error Message: {data.get('Note', 'N/A')}")
-                    return None
-
-            else:
-                logger_stock.error(f"Status_code: {status_code}")
-                return None
-        else:
-            logger_stock.error("URL not found, request skipped")
-            return None
-
-    return stocks_price
+    return fetch_all(lambda s: quote_cache.get(f"stock:{s}", lambda: _fetch_stock(s)), stocks)
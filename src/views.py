@@ -1,7 +1,21 @@
 import json
 import logging
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
 
 import config
+from src.memo import memoize
+from src.memo import normalize_date
+from src.metrics import dump_trace
+from src.metrics import propagate
+from src.metrics import span
+from src.store import get_snapshot
 from src.utils import get_cards
 from src.utils import get_currency
 from src.utils import get_filter_date_df
@@ -9,12 +23,48 @@ from src.utils import get_stock
 from src.utils import get_time_greeting
 from src.utils import get_top
 from src.utils import load_json
-from src.utils import read_excel
 
 logger_views = logging.getLogger("views")
 
+SECTIONS = ["greeting", "cards", "top_transactions", "currency_rates", "stock_prices"]
 
-def str_main(date: str) -> str | None:
+# Пулы этапов str_main, общие для всех запросов. Этап, не успевший к сроку, не прерывается и дорабатывает в пуле,
+# поэтому число таких «опоздавших» потоков ограничено размером пулов, а не числом запросов.
+# У каждого внешнего API свой пул: зависшие запросы к одному API не занимают потоки расчёта по операциям
+# и запросов к другому API
+_stages = {
+    "local": ThreadPoolExecutor(max_workers=config.DASHBOARD_MAX_WORKERS, thread_name_prefix="str_main_local"),
+    "currency_rates": ThreadPoolExecutor(
+        max_workers=config.DASHBOARD_API_WORKERS, thread_name_prefix="str_main_currency"
+    ),
+    "stock_prices": ThreadPoolExecutor(max_workers=config.DASHBOARD_API_WORKERS, thread_name_prefix="str_main_stock"),
+}
+
+
+def _timed(timings: Dict[str, float], stage: str, func: Callable, *args: Any) -> Any:
+    with span(stage) as stage_span:
+        try:
+            return func(*args)
+        finally:
+            timings[stage] = round((time.perf_counter() - stage_span.start) * 1000, 1)
+
+
+@memoize(date=normalize_date)
+def get_operations_sections(operations: Any, date: str) -> Dict[str, Any]:
+    """
+    Разделы ответа, зависящие только от таблицы операций: карты и топ транзакций
+    """
+    df_filter_date = get_filter_date_df(operations, date)
+    return {"cards": get_cards(operations, date=date), "top_transactions": get_top(df_filter_date)}
+
+
+def _local_sections(date: str, timings: Dict[str, float]) -> Dict[str, Any]:
+    operations = _timed(timings, "operations", get_snapshot)
+    sections: Dict[str, Any] = _timed(timings, "cards_top", get_operations_sections, operations, date)
+    return sections
+
+
+def str_main(date: str, deadline: Optional[float] = None) -> str | None:
     """
     Функция принимает на вход строку с датой и временем в формате
     YYYY-MM-DD HH:MM:SS и возвращает JSON-ответ со следующими данными:
@@ -24,32 +74,70 @@ def str_main(date: str) -> str | None:
     - Топ-5 транзакций по сумме платежа
     - Курс валют
     - Стоимость акций из S&P500
+
+    Расчёт по операциям, курсы валют и акции считаются параллельно.
+    Если за deadline секунд (по умолчанию config.DASHBOARD_DEADLINE) раздел не готов,
+    он возвращается как null и перечисляется в "missing"; "timings" содержит время этапов в мс.
+    Опоздавший этап дорабатывает в пуле своего раздела, его результат отбрасывается: расчёт по операциям —
+    в пуле из config.DASHBOARD_MAX_WORKERS потоков, запросы к каждому API — в своём из config.DASHBOARD_API_WORKERS.
+    Если задан config.PATH_TO_TRACES, разбивка запроса по этапам дописывается туда (folded stacks) и в лог
     """
-    logger_views.info(f"Function run for {date}")
+    logger_views.info("Function run for %s", date)
+    with span("str_main") as root:
+        result_json = _str_main(date, deadline)
+    if config.PATH_TO_TRACES:
+        dump_trace(root, config.PATH_TO_TRACES)
+    return result_json
+
+
+def _str_main(date: str, deadline: Optional[float]) -> str | None:
     try:
-        path_xl = str(config.PATH_TO_OPERATIONS)
+        started = time.perf_counter()
+        deadline = config.DASHBOARD_DEADLINE if deadline is None else deadline
         path_j = str(config.PATH_TO_USER_SETTINGS)
+        timings: Dict[str, float] = {}
+
+        greeting = _timed(timings, "greeting", get_time_greeting)
+        user_settings = _timed(timings, "user_settings", load_json, path_j)
 
-        greeting = get_time_greeting()
-        operations = read_excel(path_xl)
-        df_filter_date = get_filter_date_df(operations, date)
-        cards = get_cards(df_filter_date)
-        top_transactions = get_top(df_filter_date)
-        user_settings = load_json(path_j)
-        currency_rates = get_currency(user_settings)
-        stock_prices = get_stock(user_settings)
-
-        result = {
-            "greeting": greeting,
-            "cards": cards,
-            "top_transactions": top_transactions,
-            "currency_rates": currency_rates,
-            "stock_prices": stock_prices,
+        futures: Dict[str, Future] = {
+            "local": _stages["local"].submit(propagate(_local_sections), date, timings),
+            "currency_rates": _stages["currency_rates"].submit(
+                propagate(_timed), timings, "currency_rates", get_currency, user_settings
+            ),
+            "stock_prices": _stages["stock_prices"].submit(
+                propagate(_timed), timings, "stock_prices", get_stock, user_settings
+            ),
         }
+        done, not_done = wait(futures.values(), timeout=max(0.0, deadline - (time.perf_counter() - started)))
+        for future in not_done:
+            future.cancel()
+
+        result: Dict[str, Any] = {section: None for section in SECTIONS}
+        result["greeting"] = greeting
+        missing = []
+        for name, future in futures.items():
+            if future not in done:
+                missing.append(name)
+            elif future.exception() is not None:
+                logger_views.error("Section %s failed: %s", name, future.exception())
+                missing.append(name)
+            elif name == "local":
+                result.update(future.result())
+            else:
+                result[name] = future.result()
+
+        result["missing"] = [
+            section for name in missing for section in (["cards", "top_transactions"] if name == "local" else [name])
+        ]
+        if result["missing"]:
+            logger_views.warning("Sections not ready in %s s: %s", deadline, result["missing"])
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        result["timings"] = dict(timings)
 
         result_json = json.dumps(result, ensure_ascii=False, indent=4)
 
         return result_json
     except Exception as e:  # pragma: no cover
-        logger_views.error(f"Error: {e}")
+        logger_views.error("Error: %s", e)
         return None
@@ -0,0 +1,14 @@
+import pytest
+
+from src.memo import ResultCache
+from src.quote_cache import QuoteCache
+
+
+@pytest.fixture(autouse=True)
+def empty_quote_cache(monkeypatch):
+    monkeypatch.setattr("src.utils.quote_cache", QuoteCache())
+
+
+@pytest.fixture(autouse=True)
+def empty_result_cache(monkeypatch):
+    monkeypatch.setattr("src.memo.result_cache", ResultCache())
@@ -0,0 +1,89 @@
+import json
+import multiprocessing
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_operations
+from src.accounts import AccountPartials
+from src.accounts import account_report
+from src.accounts import aggregate_accounts
+from src.accounts import list_statements
+from src.ingest import read_statement
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import sum_by_card
+
+DATE = "2021-12-20 23:59:59"
+
+
+@pytest.fixture
+def statements(tmp_path):
+    frames = {}
+    for seed, name in enumerate(["alice", "bob", "carol"]):
+        frame = make_operations(2_000, seed=seed, raw=True)
+        frame.to_csv(tmp_path / f"{name}.csv", index=False)
+        frames[name] = read_statement(str(tmp_path / f"{name}.csv"))
+    (tmp_path / "notes.txt").write_text("not a statement")
+    return tmp_path, frames
+
+
+def test_list_statements(statements):
+    directory, _ = statements
+
+    assert [path.name for path in list_statements(directory)] == ["alice.csv", "bob.csv", "carol.csv"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_aggregate_accounts_matches_single_account_reports(statements, max_workers):
+    directory, frames = statements
+
+    result = aggregate_accounts(list_statements(directory), DATE, max_workers=max_workers, use_cache=False)
+
+    assert result["failed"] == []
+    for name, frame in frames.items():
+        report = result["accounts"][name]
+        assert report["rows"] == len(frame)
+        assert report["cards"] == get_cards(get_filter_date_df(frame, DATE))
+        assert report["cashback"]["2021-06"] == json.loads(get_cash_month(frame, 2021, 6))
+
+    everything = pd.concat(frames.values(), ignore_index=True)
+    assert result["total"]["rows"] == len(everything)
+    total_cards = {card["last_digits"]: card for card in result["total"]["cards"]}
+    for card in get_cards(get_filter_date_df(everything, DATE)):
+        assert total_cards[card["last_digits"]] == pytest.approx(card)
+    total_june = json.loads(get_cash_month(everything, 2021, 6))
+    assert result["total"]["cashback"]["2021-06"] == pytest.approx(total_june)
+
+
+def test_aggregate_accounts_reports_failed_files(statements):
+    directory, _ = statements
+    (directory / "empty.csv").write_text("")
+
+    result = aggregate_accounts(list_statements(directory), DATE, max_workers=1, use_cache=False)
+
+    assert result["failed"] == [str(directory / "empty.csv")]
+    assert sorted(result["accounts"]) == ["alice", "bob", "carol"]
+
+
+def test_account_report_float32_cashback_serializes(statements):
+    directory, frames = statements
+    cashback = pd.Series([np.float32(0.1)], index=pd.MultiIndex.from_tuples([("2021-06", "Еда")]))
+    partials = AccountPartials("alice", 1, sum_by_card(get_filter_date_df(frames["alice"], DATE)), cashback)
+
+    report = json.loads(json.dumps(account_report(partials)))
+
+    assert report["cashback"] == {"2021-06": {"Еда": 0.1}}
+
+
+def test_aggregate_accounts_uses_spawned_workers(statements):
+    directory, _ = statements
+
+    with patch("src.accounts.multiprocessing.get_context", wraps=multiprocessing.get_context) as mock_get_context:
+        result = aggregate_accounts(list_statements(directory), DATE, max_workers=2, use_cache=False)
+
+    mock_get_context.assert_called_once_with("spawn")
+    assert result["failed"] == []
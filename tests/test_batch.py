@@ -0,0 +1,72 @@
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.synthetic import make_operations
+from src.batch import run_batch
+from src.batch import write_results
+from src.dataset import Snapshot
+from src.executor import QueryExecutor
+from src.memo import ResultCache
+from src.reports import spending_by_category
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.views import get_operations_sections
+
+DATE = "2021-12-20 23:59:59"
+
+
+@pytest.fixture
+def snapshot():
+    return Snapshot(make_operations(5_000), version="v1")
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    monkeypatch.setattr("src.memo.result_cache", ResultCache(max_size=0))
+
+
+def test_write_results(snapshot):
+    lines = [
+        json.dumps({"query": "dashboard", "date": DATE}),
+        json.dumps({"query": "cashback", "year": 2021, "month": 6}),
+        "not json",
+        "",
+        json.dumps({"query": "spending", "category": "Супермаркеты", "date": "2021-12-20"}),
+        json.dumps({"query": "unknown"}),
+        json.dumps({"query": "cards", "date": DATE}),
+    ]
+    out = io.StringIO()
+
+    with QueryExecutor(max_workers=2) as executor:
+        stats = write_results(lines, out, executor, snapshot)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats == {"queries": 6, "errors": 2}
+    assert [record["line"] for record in records] == [1, 2, 3, 5, 6, 7]
+    assert records[0]["result"] == get_operations_sections(snapshot, DATE)
+    assert records[1]["result"] == json.loads(get_cash_month(snapshot, 2021, 6))
+    assert records[2]["error"].startswith("JSONDecodeError")
+    assert records[3]["result"] == json.loads(spending_by_category(snapshot, "Супермаркеты", "2021-12-20"))
+    assert records[4]["error"].startswith("ValueError")
+    assert records[5]["result"] == get_cards(snapshot, date=DATE)
+
+
+def test_run_batch_loads_once(snapshot, tmp_path):
+    source = tmp_path / "queries.jsonl"
+    output = tmp_path / "results.jsonl"
+    source.write_text(
+        "\n".join(json.dumps({"query": "cashback", "year": 2021, "month": month % 12 + 1}) for month in range(100)),
+        encoding="utf-8",
+    )
+    store = MagicMock()
+    store.get.return_value = snapshot
+
+    stats = run_batch(str(source), str(output), max_workers=2, store=store)
+
+    store.get.assert_called_once()
+    assert stats == {"queries": 100, "errors": 0}
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["query"]["month"] for record in records] == [month % 12 + 1 for month in range(100)]
@@ -0,0 +1,26 @@
+from benchmarks.suite import compare
+from benchmarks.suite import measure
+
+
+def test_compare_reports_time_and_memory_regressions():
+    baselines = {
+        "get_top": {"10000": {"ms": 10.0, "peak_mib": 10.0}},
+        "get_cards": {"10000": {"ms": 0.2, "peak_mib": 1.0}},
+    }
+    results = {
+        "get_top": {"10000": {"ms": 14.0, "peak_mib": 20.0}, "100000": {"ms": 99.0, "peak_mib": 1.0}},
+        "get_cards": {"10000": {"ms": 0.9, "peak_mib": 1.2}},
+    }
+
+    assert compare(results, baselines, threshold=0.3) == [
+        "get_top [10000]: 10.00 -> 14.00 ms",
+        "get_top [10000]: 10.0 -> 20.0 MiB",
+    ]
+    assert compare(results, baselines, threshold=1.5) == []
+
+
+def test_measure():
+    stats = measure(lambda: bytearray(4 * 2**20), repeat=2)
+
+    assert stats["ms"] >= 0
+    assert stats["peak_mib"] >= 4
@@ -0,0 +1,85 @@
+import os
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import cached_read
+from src.cache import file_hash
+from src.cache import get_cache_path
+from src.cache import load_frame
+from src.cache import save_frame
+
+
+@pytest.fixture
+def operations_df():
+    return pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2025 10:00:00", "15.01.2025 12:00:00", "31.01.2025 14:00:00"],
+            "Номер карты": ["*1111", np.nan, "*2222"],
+            "Сумма платежа": [-50.0, -100.0, 20.0],
+            "Бонусы (включая кэшбэк)": [1, 2, 0],
+            "Категория": pd.Categorical(["Еда", "Транспорт", "Еда"]),
+        }
+    )
+
+
+def test_get_cache_path():
+    assert get_cache_path("data/operations.xlsx").name == "operations.cache.npz"
+
+
+def test_save_load_frame(tmp_path, operations_df):
+    path_cache = tmp_path / "operations.cache.npz"
+    save_frame(operations_df, path_cache, {"size": 1, "mtime_ns": 1, "sha256": ""})
+
+    result = load_frame(path_cache)
+
+    pd.testing.assert_frame_equal(result, operations_df)
+
+
+def test_cached_read_hit_and_rebuild(tmp_path, operations_df):
+    path_source = tmp_path / "operations.xlsx"
+    path_source.write_bytes(b"version 1")
+    reader = Mock(return_value=operations_df)
+
+    first = cached_read(str(path_source), reader)
+    second = cached_read(str(path_source), reader)
+
+    assert reader.call_count == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    path_source.write_bytes(b"version 2 is longer")
+    cached_read(str(path_source), reader)
+
+    assert reader.call_count == 2
+
+
+def test_cached_read_touched_file_same_content(tmp_path, operations_df):
+    path_source = tmp_path / "operations.xlsx"
+    path_source.write_bytes(b"version 1")
+    reader = Mock(return_value=operations_df)
+
+    cached_read(str(path_source), reader)
+    stat = os.stat(path_source)
+    os.utime(path_source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cached_read(str(path_source), reader)
+
+    assert reader.call_count == 1
+
+
+def test_cached_read_touched_file_hashed_once(tmp_path, operations_df):
+    path_source = tmp_path / "operations.xlsx"
+    path_source.write_bytes(b"version 1")
+    reader = Mock(return_value=operations_df)
+    cached_read(str(path_source), reader)
+    stat = os.stat(path_source)
+    os.utime(path_source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with patch("src.cache.file_hash", wraps=file_hash) as mock_file_hash:
+        cached_read(str(path_source), reader)
+        cached_read(str(path_source), reader)
+
+    assert mock_file_hash.call_count == 1
+    assert reader.call_count == 1
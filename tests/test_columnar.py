@@ -0,0 +1,89 @@
+import mmap
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_operations
+from src.columnar import export_columns
+from src.columnar import load_columns_meta
+from src.columnar import open_columns
+from src.index import is_sorted_by_date
+from src.services import get_cash_month
+from src.store import OperationsStore
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import get_top
+
+DATE = "2021-12-20 23:59:59"
+
+
+def mapped_buffer(array):
+    while isinstance(array, np.ndarray):
+        array = array.base
+    return array.obj if isinstance(array, memoryview) else array
+
+
+@pytest.fixture
+def operations():
+    return make_operations(3_000)
+
+
+def test_open_columns_round_trip(operations, tmp_path):
+    path = tmp_path / "operations.columns"
+    export_columns(operations, path, "v1")
+
+    mapped = open_columns(path)
+
+    assert load_columns_meta(path)["key"] == "v1"
+    assert is_sorted_by_date(mapped)
+    assert list(mapped.columns) == list(operations.columns)
+    pd.testing.assert_frame_equal(mapped, operations, check_dtype=False, check_categorical=False)
+    assert isinstance(mapped_buffer(mapped["Сумма платежа"].to_numpy()), mmap.mmap)
+    assert isinstance(mapped_buffer(mapped["Категория"].array.codes), mmap.mmap)
+
+
+def test_open_columns_encodes_strings(tmp_path):
+    path = tmp_path / "operations.columns"
+    export_columns(pd.DataFrame({"Описание": ["Магнит", None, "Магнит"], "Сумма": [1.0, 2.0, 3.0]}), path, "v1")
+
+    mapped = open_columns(path)
+
+    assert mapped["Описание"].tolist()[0] == "Магнит"
+    assert pd.isna(mapped["Описание"].tolist()[1])
+    assert mapped["Сумма"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_reports_over_mapped_columns(operations, tmp_path):
+    path = tmp_path / "operations.columns"
+    export_columns(operations, path, "v1")
+    mapped = open_columns(path)
+
+    assert get_cards(get_filter_date_df(mapped, DATE)) == get_cards(get_filter_date_df(operations, DATE))
+    assert get_top(get_filter_date_df(mapped, DATE)) == get_top(get_filter_date_df(operations, DATE))
+    assert get_cash_month(mapped, 2021, 6) == get_cash_month(operations, 2021, 6)
+
+
+def test_load_columns_meta_rejects_other_files(tmp_path):
+    path = tmp_path / "operations.columns"
+    path.write_bytes(b"not columns")
+
+    assert load_columns_meta(path) is None
+    assert load_columns_meta(tmp_path / "missing.columns") is None
+
+
+@patch("src.store.read_excel")
+def test_store_shares_columns_file(mock_read_excel, operations, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    path_columns = tmp_path / "operations.columns"
+    mock_read_excel.return_value = operations
+
+    first = OperationsStore(str(path_xl), path_columns=str(path_columns)).get()
+    second = OperationsStore(str(path_xl), path_columns=str(path_columns)).get()
+
+    mock_read_excel.assert_called_once()
+    assert first.version == second.version
+    assert len(second.operations) == len(operations)
+    assert isinstance(mapped_buffer(second.operations["Кэшбэк"].to_numpy()), mmap.mmap)
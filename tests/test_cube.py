@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from src.cube import build_cube
+from src.cube import month_ceil
+from src.cube import month_floor
+from src.cube import window_cells
+from src.cube import window_sums
+from src.index import sort_by_date
+from src.schema import normalize_operations
+
+
+@pytest.fixture
+def operations_df():
+    data = {
+        "Дата операции": [
+            "14.01.2025 10:00:00",
+            "16.01.2025 10:00:00",
+            "01.02.2025 00:00:00",
+            "16.02.2025 10:00:00",
+            "01.03.2025 10:00:00",
+            "20.03.2025 10:00:00",
+        ],
+        "Номер карты": ["*1111", "*1111", "*2222", "*1111", "*2222", "*1111"],
+        "Статус": ["OK", "OK", "OK", "FAILED", "OK", "OK"],
+        "Категория": ["Еда", "Еда", "Еда", "Еда", "Транспорт", "Еда"],
+        "Сумма платежа": [-10.0, -20.0, -5.0, -50.0, -100.0, -15.0],
+        "Сумма операции с округлением": [10.0, 20.0, 5.0, 50.0, 100.0, 15.0],
+        "Кэшбэк": [1.0, None, -2.0, 3.0, 4.0, 0.0],
+    }
+    return sort_by_date(normalize_operations(pd.DataFrame(data)))
+
+
+def test_month_floor_ceil():
+    assert month_floor("2025-02-16 10:00:00") == pd.Timestamp("2025-02-01")
+    assert month_ceil("2025-02-16 10:00:00") == pd.Timestamp("2025-03-01")
+    assert month_ceil("2025-02-01") == pd.Timestamp("2025-02-01")
+
+
+def test_build_cube(operations_df):
+    cube = build_cube(operations_df)
+
+    january = cube[cube["month"] == pd.Timestamp("2025-01-01")].iloc[0]
+    assert len(cube) == 5
+    assert january["count"] == 2
+    assert january["rounded"] == 30.0
+    assert january["cashback"] == 1.0
+    assert january["cashback_count"] == 1
+
+    february = cube[(cube["month"] == pd.Timestamp("2025-02-01")) & (cube["Статус"] == "OK")].iloc[0]
+    assert february["cashback_positive"] == 0.0
+    assert february["cashback_count"] == 0
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        ("2025-01-15", "2025-03-20 10:00:00.000000001"),
+        ("2025-01-01", "2025-03-01"),
+        ("2025-02-01", "2025-02-10"),
+        ("2024-01-01", "2024-02-01"),
+    ],
+)
+def test_window_cells_with_cube_matches_rows(operations_df, start, end):
+    cube = build_cube(operations_df)
+    columns = ["count", "rounded", "cashback_positive"]
+
+    with_cube = window_cells(operations_df, start, end, cube=cube)
+    from_rows = window_cells(operations_df, start, end)
+
+    assert with_cube[columns].sum().to_dict() == from_rows[columns].sum().to_dict()
+
+
+def test_window_sums(operations_df):
+    starts = pd.to_datetime(["2025-01-01 00:00:00", "2025-02-01 00:00:00", "2025-03-20 10:00:00"])
+    ends = pd.to_datetime(["2025-12-31 00:00:00", "2025-02-01 00:00:00", "2025-03-20 10:00:00"])
+
+    labels, sums, counts = window_sums(operations_df, "Категория", "Сумма операции с округлением", starts, ends)
+
+    assert list(labels) == ["Еда", "Транспорт"]
+    assert sums.tolist() == [[100.0, 100.0], [5.0, 0.0], [15.0, 0.0]]
+    assert counts.tolist() == [[5, 1], [1, 0], [1, 0]]
+
+    _, sums, counts = window_sums(
+        operations_df, "Категория", "Сумма операции с округлением", starts, ends, inclusive="left"
+    )
+    assert counts.tolist() == [[5, 1], [0, 0], [0, 0]]
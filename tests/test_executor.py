@@ -0,0 +1,155 @@
+import threading
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import CATEGORIES
+from benchmarks.synthetic import make_operations
+from src.cube import build_cube
+from src.dataset import Snapshot
+from src.executor import QUERIES
+from src.executor import QueryExecutor
+from src.memo import ResultCache
+
+
+@pytest.fixture
+def snapshot():
+    return Snapshot(make_operations(20_000), version="v1")
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    monkeypatch.setattr("src.memo.result_cache", ResultCache(max_size=0))
+
+
+def make_queries():
+    queries = []
+    for date in pd.date_range("2019-01-10", "2021-12-20", freq="70D"):
+        day = str(date + pd.Timedelta(hours=20))
+        queries.append({"query": "cards", "date": day})
+        queries.append({"query": "top", "date": day})
+        queries.append({"query": "cashback", "year": date.year, "month": date.month})
+        for category in list(CATEGORIES)[:3]:
+            queries.append({"query": "spending", "category": category, "date": str(date.date())})
+    return queries
+
+
+def test_snapshot_unchanged_by_derived_frames(snapshot):
+    payments = snapshot.operations["Сумма платежа"].copy()
+    cube = snapshot.cube.copy()
+
+    month = snapshot.operations.iloc[:10]
+    month["Сумма платежа"] = 0.0
+    cells = snapshot.cube.head()
+    cells["count"] = 0
+
+    pd.testing.assert_series_equal(snapshot.operations["Сумма платежа"], payments)
+    pd.testing.assert_frame_equal(snapshot.cube, cube)
+    with pytest.raises(ValueError):
+        snapshot.operations["Кэшбэк"].to_numpy()[0] = 0.0
+    with pytest.raises(ValueError):
+        snapshot.card_prefix.spent[0] = 1
+
+
+def test_cube_is_built_once_under_concurrency(snapshot):
+    barrier = threading.Barrier(8)
+    cubes = []
+
+    def read_cube():
+        barrier.wait()
+        cubes.append(snapshot.cube)
+
+    with patch("src.dataset.build_cube", wraps=build_cube) as mock_build_cube:
+        threads = [threading.Thread(target=read_cube) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    mock_build_cube.assert_called_once()
+    assert all(cube is cubes[0] for cube in cubes)
+
+
+def test_executor_stress_matches_serial(snapshot):
+    queries = make_queries()
+    expected = [
+        QUERIES[query["query"]](snapshot, **{k: v for k, v in query.items() if k != "query"}) for query in queries
+    ]
+    operations_before = snapshot.operations.copy(deep=True)
+
+    with QueryExecutor(max_workers=8) as executor:
+        for _ in range(2):
+            assert executor.run(queries, snapshot) == expected
+
+    pd.testing.assert_frame_equal(snapshot.operations, operations_before)
+
+
+def test_executor_uses_one_store_snapshot(snapshot):
+    store = MagicMock()
+    store.get.return_value = snapshot
+
+    with QueryExecutor(max_workers=2, store=store) as executor:
+        results = executor.run([{"query": "cashback", "year": 2021, "month": 6}] * 3)
+
+    store.get.assert_called_once()
+    assert results[0] is not None and results.count(results[0]) == 3
+
+
+def test_executor_rejects_bad_queries(snapshot):
+    with QueryExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError):
+            executor.run([{"query": "unknown"}], snapshot)
+        with pytest.raises(TypeError):
+            executor.run([{"query": "cashback", "year": 2021}], snapshot)
+
+
+def test_stream_deduplicates_and_keeps_order(snapshot):
+    queries = make_queries()[:12]
+    expected = QueryExecutor(max_workers=1).run(queries, snapshot)
+
+    with QueryExecutor(max_workers=4) as executor, patch.object(
+        executor, "submit", wraps=executor.submit
+    ) as mock_submit:
+        results = [future.result() for future in executor.stream(queries + queries[::-1], snapshot)]
+
+    assert mock_submit.call_count == len(queries)
+    assert results == expected + expected[::-1]
+
+
+def test_stream_dedup_remembers_only_recent_queries(snapshot):
+    queries = [{"query": "cashback", "year": 2021, "month": month} for month in (1, 2, 3, 1, 3, 2)]
+
+    with QueryExecutor(max_workers=2) as executor, patch.object(
+        executor, "submit", wraps=executor.submit
+    ) as mock_submit:
+        results = [future.result() for future in executor.stream(queries, snapshot, recent=2)]
+
+    assert [call.args[0]["month"] for call in mock_submit.call_args_list] == [1, 2, 3, 1, 2]
+    assert results == [QUERIES["cashback"](snapshot, 2021, query["month"]) for query in queries]
+
+
+def test_stream_bounds_queries_in_flight(snapshot):
+    consumed = []
+
+    def queries():
+        for month in range(1, 13):
+            consumed.append(month)
+            yield {"query": "cashback", "year": 2021, "month": month}
+
+    with QueryExecutor(max_workers=2) as executor:
+        stream = executor.stream(queries(), snapshot, window=3)
+        next(stream).result()
+        assert len(consumed) == 3
+        assert len([future.result() for future in stream]) == 11
+
+
+def test_stream_returns_bad_queries_as_errors(snapshot):
+    with QueryExecutor(max_workers=1) as executor:
+        futures = list(
+            executor.stream([{"query": "unknown"}, {"query": "cashback", "year": 2021, "month": 6}], snapshot)
+        )
+
+    assert isinstance(futures[0].exception(), ValueError)
+    assert futures[1].result() == QUERIES["cashback"](snapshot, year=2021, month=6)
@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dataset import Snapshot
+from src.index import is_sorted_by_date
+from src.index import slice_by_date
+from src.index import sort_by_date
+from src.utils import get_filter_date_df
+
+
+@pytest.fixture
+def operations_df():
+    return pd.DataFrame(
+        {
+            "Дата операции": pd.to_datetime(
+                ["2025-02-01 09:00:00", "2025-01-01 10:00:00", "2025-01-31 23:59:59", "2025-01-15 12:00:00"]
+            ),
+            "Сумма": [400, 100, 300, 200],
+        }
+    )
+
+
+def test_sort_by_date(operations_df):
+    result = sort_by_date(operations_df)
+
+    assert is_sorted_by_date(result)
+    assert not is_sorted_by_date(operations_df)
+    assert list(result["Сумма"]) == [100, 200, 300, 400]
+    assert list(result.index) == [0, 1, 2, 3]
+
+
+def test_filtered_sorted_frame_stays_sorted(operations_df):
+    result = sort_by_date(operations_df)
+
+    assert is_sorted_by_date(result[result["Сумма"] > 100])
+
+
+@pytest.mark.parametrize(
+    "start, end, inclusive, expected",
+    [
+        ("2025-01-01 10:00:00", "2025-01-31 23:59:59", "both", [100, 200, 300]),
+        ("2025-01-01", "2025-02-01 09:00:00", "left", [100, 200, 300]),
+        ("2025-01-02", "2025-01-20", "both", [200]),
+        ("2024-01-01", "2024-12-31", "both", []),
+    ],
+)
+def test_slice_by_date_sorted_matches_scan(operations_df, start, end, inclusive, expected):
+    indexed = slice_by_date(sort_by_date(operations_df), start, end, inclusive, sorted_by_date=True)
+    scanned = slice_by_date(operations_df, start, end, inclusive)
+
+    assert list(indexed["Сумма"]) == expected
+    assert sorted(scanned["Сумма"]) == expected
+
+
+def test_concat_of_sorted_frames_is_not_trusted(operations_df):
+    first = sort_by_date(operations_df.iloc[:2])
+    second = sort_by_date(operations_df.iloc[2:])
+    both = pd.concat([first, second], ignore_index=True)
+
+    assert not is_sorted_by_date(both)
+    assert sorted(slice_by_date(both, "2025-01-01", "2025-01-31 23:59:59")["Сумма"]) == [100, 200, 300]
+
+
+def test_descending_sort_is_not_trusted(operations_df):
+    descending = sort_by_date(operations_df).sort_values("Дата операции", ascending=False)
+
+    assert not is_sorted_by_date(descending)
+    assert list(slice_by_date(descending, "2025-01-02", "2025-01-20")["Сумма"]) == [200]
+
+
+def test_iloc_slices_of_sorted_frame_stay_sorted(operations_df):
+    result = sort_by_date(operations_df)
+
+    assert is_sorted_by_date(result.iloc[1:3])
+    assert not is_sorted_by_date(result.iloc[::-1])
+
+
+def test_snapshot_sorted_flag(operations_df):
+    assert Snapshot(sort_by_date(operations_df), version="v1", date_sorted=True).sorted_by_date
+    assert Snapshot(sort_by_date(operations_df), version="v1").sorted_by_date
+    assert not Snapshot(operations_df, version="v1").sorted_by_date
+
+
+def test_snapshot_append_stays_sorted(operations_df):
+    snapshot = Snapshot(sort_by_date(operations_df.iloc[1:]), version="v1", date_sorted=True)
+    appended = snapshot.append(operations_df.iloc[:1], version="v2")
+
+    assert appended.sorted_by_date
+    assert is_sorted_by_date(appended.operations)
+
+
+def test_plain_frame_written_in_place_uses_scan(operations_df):
+    frame = sort_by_date(operations_df)
+    frame.loc[0, "Дата операции"] = pd.Timestamp("2025-03-01")
+
+    with patch("src.index.np.searchsorted", wraps=np.searchsorted) as search:
+        result = get_filter_date_df(frame, "2025-01-31 23:59:59")
+
+    assert sorted(result["Сумма"]) == [200, 300]
+    assert search.call_count == 0
+
+
+def test_snapshot_slice_uses_searchsorted(operations_df):
+    snapshot = Snapshot(sort_by_date(operations_df), version="v1", date_sorted=True)
+
+    with patch("src.index.np.searchsorted", wraps=np.searchsorted) as search:
+        result = get_filter_date_df(snapshot, "2025-01-31 23:59:59")
+
+    assert list(result["Сумма"]) == [100, 200, 300]
+    assert search.call_count == 2
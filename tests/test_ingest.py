@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cube import build_cube
+from src.ingest import ingest_files
+from src.ingest import load_ingested
+from src.ingest import row_keys
+from src.store import OperationsStore
+
+
+def make_statement(dates, amounts):
+    return pd.DataFrame(
+        {
+            "Дата операции": dates,
+            "Номер карты": "*1111",
+            "Статус": "OK",
+            "Сумма операции": amounts,
+            "Сумма платежа": amounts,
+            "Кэшбэк": 1.0,
+            "Категория": "Еда",
+            "MCC": 5411,
+            "Описание": "Магнит",
+            "Сумма операции с округлением": [abs(amount) for amount in amounts],
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    make_statement(["01.01.2025 10:00:00", "02.01.2025 10:00:00"], [-10.0, -20.0]).to_excel(path_xl, index=False)
+    return OperationsStore(str(path_xl), str(tmp_path / "ingested.npz"))
+
+
+def test_row_keys_ignore_dtype_differences():
+    first = make_statement(["01.01.2025 10:00:00"], [-10.0])
+    second = first.assign(MCC=5411.0, Категория=pd.Categorical(["Еда"]))
+
+    assert (row_keys(first) == row_keys(second)).all()
+
+
+def test_ingest_files_deduplicates_and_appends(store, tmp_path):
+    statement = tmp_path / "day.csv"
+    make_statement(["02.01.2025 10:00:00", "03.01.2025 10:00:00"], [-20.0, -30.0]).to_csv(statement, index=False)
+    store.get().cube
+
+    added = ingest_files([str(statement)], store=store)
+
+    snapshot = store.get()
+    assert added == 1
+    assert len(snapshot.operations) == 3
+    assert snapshot.cube["count"].sum() == 3
+    assert snapshot.cube["rounded"].sum() == 60.0
+
+    ingested, files = load_ingested(store.path_ingested)
+    assert len(ingested) == 1
+    assert list(files.values()) == ["day.csv"]
+
+
+def test_ingest_files_skips_known_files(store, tmp_path):
+    statement = tmp_path / "day.csv"
+    make_statement(["03.01.2025 10:00:00"], [-30.0]).to_csv(statement, index=False)
+
+    assert ingest_files([str(statement)], store=store) == 1
+    assert ingest_files([str(statement)], store=store) == 0
+
+
+def test_ingested_rows_survive_reload(store, tmp_path):
+    statement = tmp_path / "day.csv"
+    make_statement(["03.01.2025 10:00:00"], [-30.0]).to_csv(statement, index=False)
+    ingest_files([str(statement)], store=store)
+
+    reloaded = OperationsStore(store.path_xlsx, store.path_ingested).get()
+
+    assert len(reloaded.operations) == 3
+    assert reloaded.operations["Дата операции"].is_monotonic_increasing
+
+
+def test_ingest_files_drops_duplicates_within_a_file(store, tmp_path):
+    statement = tmp_path / "day.csv"
+    make_statement(["03.01.2025 10:00:00"] * 2 + ["04.01.2025 10:00:00"], [-30.0, -30.0, -40.0]).to_csv(
+        statement, index=False
+    )
+
+    assert ingest_files([str(statement)], store=store) == 2
+
+
+def test_ingest_files_appends_parts(store, tmp_path):
+    first = tmp_path / "day1.csv"
+    second = tmp_path / "day2.csv"
+    make_statement(["03.01.2025 10:00:00"], [-30.0]).to_csv(first, index=False)
+    make_statement(["04.01.2025 10:00:00"], [-40.0]).to_csv(second, index=False)
+
+    ingest_files([str(first)], store=store)
+    first_part = tmp_path / "ingested.00001.npz"
+    written = first_part.read_bytes(), first_part.stat().st_mtime_ns
+    ingest_files([str(second)], store=store)
+
+    assert (first_part.read_bytes(), first_part.stat().st_mtime_ns) == written
+    ingested, files = load_ingested(store.path_ingested)
+    assert list(ingested["Сумма операции"]) == [-30.0, -40.0]
+    assert sorted(files.values()) == ["day1.csv", "day2.csv"]
+
+
+def test_other_process_extends_snapshot_incrementally(store, tmp_path):
+    statement = tmp_path / "day.csv"
+    make_statement(["03.01.2025 10:00:00"], [-30.0]).to_csv(statement, index=False)
+    server = OperationsStore(store.path_xlsx, store.path_ingested)
+    server.get().cube
+
+    ingest_files([str(statement)], store=store)
+    with patch("src.dataset.build_cube", wraps=build_cube) as mock_build_cube, patch(
+        "src.store.read_excel"
+    ) as mock_read_excel:
+        assert server.refresh() is True
+        snapshot = server.get()
+
+    mock_read_excel.assert_not_called()
+    assert [len(call.args[0]) for call in mock_build_cube.call_args_list] == [1]
+    assert snapshot.cube["count"].sum() == 3
+    assert snapshot.cube["rounded"].sum() == 60.0
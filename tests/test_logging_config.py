@@ -0,0 +1,96 @@
+import logging
+
+import pytest
+
+from src import logging_config
+from src.logging_config import DebugSampleFilter
+from src.logging_config import setup_logging
+from src.logging_config import shutdown_logging
+from src.logging_config import write_text
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    shutdown_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+@pytest.mark.parametrize("use_queue", [False, True])
+def test_setup_logging_writes_file(root_logger, tmp_path, use_queue):
+    path = tmp_path / "logs" / "app.log"
+    setup_logging("INFO", path, use_queue=use_queue, debug_sample=0.0)
+
+    logging.getLogger("test").info("Function run for %s", "2021-12-20")
+    logging.getLogger("test").debug("hidden %s", 1)
+    shutdown_logging()
+
+    text = path.read_text(encoding="utf-8")
+    assert "test - INFO: Function run for 2021-12-20" in text
+    assert "hidden" not in text
+
+
+def test_setup_logging_keeps_logging_globals(root_logger, tmp_path):
+    flags = logging._srcfile, logging.logThreads, logging.logProcesses, logging.logMultiprocessing
+
+    setup_logging("INFO", tmp_path / "app.log", use_queue=True, debug_sample=0.0)
+
+    assert (logging._srcfile, logging.logThreads, logging.logProcesses, logging.logMultiprocessing) == flags
+
+
+def test_queue_handler_formats_message_when_logged(root_logger, tmp_path):
+    path = tmp_path / "app.log"
+    setup_logging("INFO", path, use_queue=True, debug_sample=0.0)
+    settings = {"currency": "USD"}
+
+    logging.getLogger("test").info("Settings %s", settings)
+    settings["currency"] = "EUR"
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("test").exception("Failed")
+    shutdown_logging()
+
+    text = path.read_text(encoding="utf-8")
+    assert "Settings {'currency': 'USD'}" in text
+    assert "ValueError: boom" in text
+
+
+def test_setup_logging_samples_debug(root_logger, tmp_path):
+    path = tmp_path / "app.log"
+    setup_logging("INFO", path, use_queue=False, debug_sample=1.0)
+
+    logging.getLogger("test").debug("sampled %s", 1)
+
+    assert root_logger.level == logging.DEBUG
+    assert "sampled 1" in path.read_text(encoding="utf-8")
+
+
+def test_debug_sample_filter():
+    record = logging.LogRecord("test", logging.DEBUG, "", 0, "msg", None, None)
+    info = logging.LogRecord("test", logging.INFO, "", 0, "msg", None, None)
+
+    assert DebugSampleFilter(0.0).filter(record) is False
+    assert DebugSampleFilter(0.0).filter(info) is True
+    assert DebugSampleFilter(1.0).filter(record) is True
+
+
+def test_write_text_in_background(root_logger, tmp_path):
+    target = tmp_path / "log.log"
+    write_text(str(target), "sync")
+    assert target.read_text(encoding="utf-8") == "sync"
+
+    setup_logging("INFO", tmp_path / "app.log", use_queue=True)
+    assert logging_config._writer is not None
+    for i in range(100):
+        write_text(str(target), f"result {i}")
+    write_text(str(tmp_path / "bad.log"), None)
+    shutdown_logging()
+
+    assert target.read_text(encoding="utf-8") == "result 99"
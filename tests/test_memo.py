@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src import memo
+from src.dataset import Snapshot
+from src.memo import ResultCache
+from src.memo import memoize
+from src.memo import normalize_date
+
+
+@pytest.fixture
+def counted():
+    calls = MagicMock(side_effect=lambda operations, year, month=1: f"{year}.{month}")
+
+    @memoize(year=int, month=int)
+    def report(operations, year, month=1):
+        return calls(operations, year, month)
+
+    return report, calls
+
+
+def test_memoize_keyed_by_version_and_normalized_args(counted):
+    report, calls = counted
+    snapshot = Snapshot(pd.DataFrame(), version="v1")
+
+    assert report(snapshot, 2021, 6) == "2021.6"
+    assert report(snapshot, "2021", month="6") == "2021.6"
+    assert report(snapshot, 2021) == "2021.1"
+    assert calls.call_count == 2
+
+    assert report(Snapshot(pd.DataFrame(), version="v2"), 2021, 6) == "2021.6"
+    assert report(snapshot, 2021, 6) == "2021.6"
+    assert calls.call_count == 3
+    assert memo.result_cache.stats()["hits"] == 2
+    assert memo.result_cache.stats()["invalidations"] == 0
+    assert memo.result_cache.stats()["size"] == 3
+
+
+def test_memoize_skips_frames_and_bad_args(counted):
+    report, calls = counted
+    frame = pd.DataFrame()
+
+    report(frame, 2021, 6)
+    report(frame, 2021, 6)
+    report(Snapshot(frame, version="v1"), "год", 6)
+
+    assert calls.call_count == 3
+    assert memo.result_cache.stats()["misses"] == 0
+
+
+def test_memoize_does_not_cache_none():
+    calls = MagicMock(return_value=None)
+    report = memoize()(lambda operations: calls())
+    snapshot = Snapshot(pd.DataFrame(), version="v1")
+
+    report(snapshot)
+    report(snapshot)
+
+    assert calls.call_count == 2
+
+
+def test_result_cache_lru_and_spill(tmp_path):
+    cache = ResultCache(max_size=2, path=tmp_path)
+    for i in range(3):
+        cache.put(("v1", "report", (("i", i),)), {"value": i})
+
+    assert cache.stats()["evictions"] == 1
+    assert len(list(tmp_path.glob("v1.*.json"))) == 1
+    assert cache.get(("v1", "report", (("i", 0),))) == (True, {"value": 0})
+    assert cache.stats()["disk_hits"] == 1
+
+    cache.put(("v2", "report", ()), "new")
+    assert cache.get(("v1", "report", (("i", 1),))) == (True, {"value": 1})
+
+
+def test_result_cache_evicts_least_recent_version(tmp_path):
+    cache = ResultCache(max_size=1, path=tmp_path, max_versions=2)
+    cache.put(("v1", "report", (("i", 0),)), {"value": 0})
+    cache.put(("v1", "report", (("i", 1),)), {"value": 1})
+    cache.put(("v2", "report", ()), "v2")
+    cache.get(("v1", "report", (("i", 1),)))
+    cache.put(("v3", "report", ()), "v3")
+
+    assert cache.stats()["invalidations"] == 1
+    assert list(tmp_path.glob("v2.*.json")) == []
+    assert cache.get(("v2", "report", ())) == (False, None)
+    assert cache.get(("v1", "report", (("i", 0),))) == (True, {"value": 0})
+
+
+def test_result_cache_returns_copies():
+    cache = ResultCache()
+    value = [{"category": "Еда", "amount": 10.0}]
+    cache.put(("v1", "report", ()), value)
+    value[0]["amount"] = 0.0
+
+    found, cached = cache.get(("v1", "report", ()))
+    cached[0]["amount"] = -1.0
+
+    assert cache.get(("v1", "report", ())) == (True, [{"category": "Еда", "amount": 10.0}])
+
+
+def test_normalize_date():
+    assert normalize_date("2021-12-20") == normalize_date(pd.Timestamp("2021-12-20 00:00:00"))
+    assert normalize_date(None) == pd.Timestamp("today").normalize().isoformat()
+    assert normalize_date(" ") == normalize_date(None)
+    with pytest.raises(ValueError):
+        normalize_date("вчера")
@@ -0,0 +1,129 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.metrics import Metrics
+from src.metrics import dump_trace
+from src.metrics import export_metrics
+from src.metrics import inc
+from src.metrics import propagate
+from src.metrics import span
+from src.metrics import traced
+from src.utils import get_filter_date_df
+from src.views import str_main
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    fresh = Metrics()
+    monkeypatch.setattr("src.metrics.metrics", fresh)
+    return fresh
+
+
+def test_span_tree_and_folded(fresh_metrics):
+    @traced()
+    def child():
+        return 1
+
+    with span("root") as root:
+        child()
+        with span("other"):
+            child()
+
+    assert [c.name for c in root.children] == ["child", "other"]
+    assert root.children[1].children[0].name == "child"
+    folded = root.folded()
+    assert [line.rsplit(" ", 1)[0] for line in folded] == ["root", "root;child", "root;other", "root;other;child"]
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in folded)
+    assert root.tree()[0].startswith("root: ")
+    assert root.tree()[1].startswith("  child: ")
+    assert fresh_metrics.snapshot()["spans"]["child"]["count"] == 2
+
+
+def test_propagate_attaches_worker_spans(fresh_metrics):
+    with span("root") as root:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(propagate(traced("worker")(lambda x: x)), range(3)))
+
+    assert [c.name for c in root.children] == ["worker"] * 3
+
+
+def test_counters_and_prometheus(fresh_metrics):
+    inc("rows_scanned", 10)
+    inc("rows_scanned", 5)
+    inc("cache_hits", cache="quote")
+    with span("stage"):
+        pass
+
+    assert fresh_metrics.counter("rows_scanned") == 15
+    text = fresh_metrics.to_prometheus()
+    assert "bank_dashboard_rows_scanned_total 15" in text
+    assert 'bank_dashboard_cache_hits_total{cache="quote"} 1' in text
+    assert 'bank_dashboard_span_seconds_count{span="stage"} 1' in text
+    assert text.count("# TYPE bank_dashboard_span_seconds summary") == 1
+    assert "# TYPE bank_dashboard_span_seconds_sum" not in text
+
+
+def test_late_span_not_attached_to_finished_parent(fresh_metrics):
+    with span("root") as root:
+        late = propagate(traced("late")(lambda: None))
+        with span("stage"):
+            pass
+
+    late()
+
+    assert [child.name for child in root.children] == ["stage"]
+    assert fresh_metrics.snapshot()["spans"]["late"]["count"] == 1
+
+
+def test_instrumented_functions_count_rows(fresh_metrics):
+    operations = pd.DataFrame(
+        {"Дата операции": pd.to_datetime(["2021-12-01 10:00:00", "2021-11-01 10:00:00", "2021-12-10 10:00:00"])}
+    )
+    get_filter_date_df(operations, "2021-12-20 23:59:59")
+
+    assert fresh_metrics.counter("rows_scanned", stage="filter_date") == 3
+    assert fresh_metrics.counter("rows_matched", stage="filter_date") == 2
+    assert fresh_metrics.snapshot()["spans"]["get_filter_date_df"]["count"] == 1
+
+
+def test_export_metrics(fresh_metrics, tmp_path):
+    inc("remote_calls", api="stock")
+
+    export_metrics(tmp_path / "metrics.prom")
+    export_metrics(tmp_path / "metrics.jsonl")
+    export_metrics(tmp_path / "metrics.jsonl")
+
+    assert 'bank_dashboard_remote_calls_total{api="stock"} 1' in (tmp_path / "metrics.prom").read_text()
+    lines = (tmp_path / "metrics.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["counters"] == [{"name": "remote_calls", "labels": {"api": "stock"}, "value": 1}]
+
+
+def test_dump_trace(tmp_path):
+    with span("root") as root:
+        with span("child"):
+            pass
+
+    dump_trace(root, tmp_path / "traces.folded")
+
+    lines = (tmp_path / "traces.folded").read_text().splitlines()
+    assert [line.split(" ")[0] for line in lines] == ["root", "root;child"]
+
+
+@patch("src.views.load_json", return_value={})
+@patch("src.views.get_currency", return_value=[])
+@patch("src.views.get_stock", return_value=[])
+@patch("src.views.get_operations_sections", return_value={"cards": [], "top_transactions": []})
+@patch("src.views.get_snapshot")
+def test_str_main_writes_trace(_snapshot, _sections, _stock, _currency, _load_json, fresh_metrics, tmp_path):
+    path = tmp_path / "traces.folded"
+    with patch("src.views.config.PATH_TO_TRACES", path):
+        str_main("2021-12-20 12:00:00")
+
+    stacks = {line.split(" ")[0] for line in path.read_text().splitlines()}
+    assert {"str_main", "str_main;operations", "str_main;cards_top", "str_main;stock_prices"} <= stacks
+    assert fresh_metrics.snapshot()["spans"]["str_main"]["count"] == 1
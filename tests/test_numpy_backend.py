@@ -0,0 +1,68 @@
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_operations
+from src.dataset import Snapshot
+from src.numpy_backend import card_totals
+from src.numpy_backend import resolve_backend
+from src.numpy_backend import to_cents
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+
+
+@pytest.fixture(scope="module")
+def operations():
+    return make_operations(20_000)
+
+
+@pytest.mark.parametrize("date", ["2021-12-20 23:59:59", "2020-02-29 12:00:00", "2019-01-01 00:00:00"])
+def test_get_cards_backends_match(operations, date):
+    df_filter_date = get_filter_date_df(operations, date)
+
+    pandas_json = json.dumps(get_cards(df_filter_date, backend="pandas"), ensure_ascii=False)
+    numpy_json = json.dumps(get_cards(df_filter_date, backend="numpy"), ensure_ascii=False)
+
+    assert numpy_json == pandas_json
+
+
+@pytest.mark.parametrize("year, month", [(2021, 6), (2019, 1), (2020, 2), (2015, 1)])
+def test_get_cash_month_backends_match(operations, year, month):
+    snapshot = Snapshot(operations, version="v1")
+
+    expected = get_cash_month(operations, year, month, backend="pandas")
+
+    assert get_cash_month(operations, year, month, backend="numpy") == expected
+    assert get_cash_month(snapshot, year, month, backend="numpy") == expected
+
+
+def test_backend_from_config(operations):
+    df_filter_date = get_filter_date_df(operations, "2021-12-20 23:59:59")
+
+    with patch("src.numpy_backend.config.COMPUTE_BACKEND", "numpy"), patch(
+        "src.utils.card_totals", wraps=card_totals
+    ) as mock_card_totals:
+        get_cards(df_filter_date)
+
+    mock_card_totals.assert_called_once()
+    with pytest.raises(ValueError):
+        resolve_backend("polars")
+
+
+def test_fractional_kopecks_fall_back_to_pandas():
+    df = pd.DataFrame(
+        {
+            "Номер карты": ["*1111", "*1111"],
+            "Статус": ["OK", "OK"],
+            "Сумма платежа": [-1.005, -2.0],
+            "Сумма операции с округлением": [1.005, 2.0],
+            "Кэшбэк": [0.0, 0.0],
+        }
+    )
+
+    assert to_cents(df["Сумма операции с округлением"]) is None
+    assert card_totals(df) is None
+    assert get_cards(df, backend="numpy") == get_cards(df, backend="pandas")
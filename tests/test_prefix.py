@@ -0,0 +1,92 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_operations
+from src.dataset import Snapshot
+from src.prefix import build_card_prefix
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    return Snapshot(make_operations(20_000), version="v1")
+
+
+@pytest.mark.parametrize(
+    "date", ["2021-12-20 23:59:59", "2020-02-29 12:00:00", "2019-01-01 00:00:00", "2015-06-15 10:00:00"]
+)
+def test_prefix_matches_row_scan(snapshot, date):
+    expected = json.dumps(get_cards(get_filter_date_df(snapshot, date), backend="pandas"), ensure_ascii=False)
+
+    assert json.dumps(get_cards(snapshot, date=date), ensure_ascii=False) == expected
+    assert get_cards(snapshot.operations, date=date) == json.loads(expected)
+
+
+def test_get_cards_snapshot_without_date(snapshot):
+    month = Snapshot(get_filter_date_df(snapshot, "2021-12-20 23:59:59"), version="v1")
+
+    cards = get_cards(month)
+
+    assert cards == get_cards(month.operations, backend="pandas")
+    assert cards and all(type(card["total_spent"]) is float for card in cards)
+
+
+def test_prefix_returns_python_floats(snapshot):
+    cards = get_cards(snapshot, date="2021-12-20 23:59:59")
+
+    assert cards and all(type(card[key]) is float for card in cards for key in ("total_spent", "cashback"))
+
+
+def test_prefix_skips_row_scan(snapshot):
+    snapshot.card_prefix
+
+    with patch("src.utils.get_filter_date_df") as mock_get_filter_date_df:
+        get_cards(snapshot, date="2021-12-20 23:59:59")
+
+    mock_get_filter_date_df.assert_not_called()
+
+
+def test_prefix_is_built_once_under_concurrency():
+    snapshot = Snapshot(make_operations(5_000), version="v1")
+    barrier = threading.Barrier(8)
+    prefixes = []
+
+    def read_prefix():
+        barrier.wait()
+        prefixes.append(snapshot.card_prefix)
+
+    with patch("src.dataset.build_card_prefix", wraps=build_card_prefix) as mock_build:
+        threads = [threading.Thread(target=read_prefix) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    mock_build.assert_called_once()
+    assert all(prefix is prefixes[0] for prefix in prefixes)
+    with pytest.raises(ValueError):
+        prefixes[0].spent[0] = 1
+
+
+def test_fractional_kopecks_fall_back_to_rows():
+    operations = pd.DataFrame(
+        {
+            "Дата операции": pd.to_datetime(["2021-12-01 10:00:00", "2021-12-02 10:00:00"]),
+            "Номер карты": ["*1111", "*1111"],
+            "Статус": ["OK", "OK"],
+            "Сумма платежа": [-1.005, -2.0],
+            "Сумма операции с округлением": [1.005, 2.0],
+            "Кэшбэк": [0.0, 0.0],
+        }
+    )
+    snapshot = Snapshot(operations, version="v1")
+
+    assert snapshot.card_prefix is None
+    assert get_cards(snapshot, date="2021-12-20 23:59:59") == get_cards(
+        get_filter_date_df(operations, "2021-12-20 23:59:59")
+    )
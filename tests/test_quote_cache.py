@@ -0,0 +1,132 @@
+import threading
+import time
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.quote_cache import QuoteCache
+
+
+def test_quote_cache_hit_and_miss():
+    cache = QuoteCache()
+    fetch = Mock(return_value={"stock": "AAPL", "price": 175.56})
+
+    assert cache.get("stock:AAPL", fetch) == {"stock": "AAPL", "price": 175.56}
+    assert cache.get("stock:AAPL", fetch) == {"stock": "AAPL", "price": 175.56}
+
+    assert fetch.call_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_quote_cache_failed_fetch_not_cached():
+    cache = QuoteCache()
+    fetch = Mock(return_value=None)
+
+    assert cache.get("stock:AAPL", fetch) is None
+    assert cache.get("stock:AAPL", fetch) is None
+    assert fetch.call_count == 2
+
+
+def test_quote_cache_ttl_per_symbol():
+    cache = QuoteCache(ttls={"stock": 300, "stock:TSLA": 10})
+
+    assert cache.ttl("stock:TSLA") == 10
+    assert cache.ttl("stock:AAPL") == 300
+    assert cache.ttl("currency:USD") == cache.default_ttl
+
+
+def test_quote_cache_expired_refetch():
+    cache = QuoteCache(ttls={"stock": 10})
+    cache.put("stock:AAPL", {"stock": "AAPL", "price": 1.0}, fetched_at=time.time() - 60)
+    fetch = Mock(return_value={"stock": "AAPL", "price": 2.0})
+
+    assert cache.get("stock:AAPL", fetch) == {"stock": "AAPL", "price": 2.0}
+    assert fetch.call_count == 1
+
+
+def test_quote_cache_stale_while_revalidate():
+    cache = QuoteCache(ttls={"stock": 10}, stale_while_revalidate=True)
+    cache.put("stock:AAPL", {"stock": "AAPL", "price": 1.0}, fetched_at=time.time() - 60)
+    fetch = Mock(return_value={"stock": "AAPL", "price": 2.0})
+
+    with patch("src.quote_cache.threading.Thread") as mock_thread:
+        assert cache.get("stock:AAPL", fetch) == {"stock": "AAPL", "price": 1.0}
+        mock_thread.call_args.kwargs["target"]()
+
+    assert cache.get("stock:AAPL", fetch) == {"stock": "AAPL", "price": 2.0}
+    assert cache.stats()["stale"] == 1
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_quote_cache_lru_eviction():
+    cache = QuoteCache(max_size=2)
+    cache.put("stock:A", {"price": 1})
+    cache.put("stock:B", {"price": 2})
+    cache.get("stock:A", Mock())
+    cache.put("stock:C", {"price": 3})
+
+    fetch = Mock(return_value={"price": 20})
+    assert cache.get("stock:B", fetch) == {"price": 20}
+    assert cache.stats()["evictions"] == 2
+
+
+def test_quote_cache_persistence(tmp_path):
+    path = tmp_path / "quotes.json"
+    cache = QuoteCache(path=path)
+    cache.put("currency:USD", {"currency": "USD", "rate": 90.12})
+    cache.flush()
+
+    fetch = Mock()
+    restored = QuoteCache(path=path)
+
+    assert restored.get("currency:USD", fetch) == {"currency": "USD", "rate": 90.12}
+    fetch.assert_not_called()
+
+
+def test_quote_cache_batches_writes(tmp_path):
+    path = tmp_path / "quotes.json"
+    cache = QuoteCache(path=path, save_delay=60)
+
+    with patch.object(cache, "_save", wraps=cache._save) as save:
+        for n in range(10):
+            cache.put(f"stock:{n}", {"price": n})
+        assert not path.exists()
+        cache.flush()
+        cache.flush()
+
+    assert save.call_count == 1
+    assert QuoteCache(path=path).get("stock:9", Mock()) == {"price": 9}
+
+
+def test_quote_cache_broken_entries_ignored(tmp_path):
+    path = tmp_path / "quotes.json"
+    path.write_text('[["stock:A", {"price": 1}, 0], ["stock:B"]]', encoding="utf-8")
+    fetch = Mock(return_value={"price": 2})
+
+    assert QuoteCache(path=path).get("stock:A", fetch) == {"price": 2}
+    fetch.assert_called_once()
+
+
+def test_quote_cache_concurrent_misses_fetch_once():
+    cache = QuoteCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return {"price": 1}
+
+    results = []
+    fetch_mock = Mock(side_effect=fetch)
+    threads = [threading.Thread(target=lambda: results.append(cache.get("stock:A", fetch_mock))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [{"price": 1}] * 4
+    assert fetch_mock.call_count == 1
@@ -5,6 +5,9 @@ from unittest.mock import patch
 import pandas as pd
 import pytest
 
+from src.dataset import Snapshot
+from src.dataset import get_cells
+from src.reports import spending_by_categories
 from src.reports import spending_by_category
 
 
@@ -54,3 +57,44 @@ def test_spending_by_category_parametrized(date_r, category, expected_json, oper
     result = spending_by_category(operations=operations_df, category=category, date_r=date_r)
 
     assert result == expected_json
+
+
+@pytest.mark.parametrize("date_r", ["", "   "])
+def test_spending_by_category_empty_date_means_today(date_r, operations_df):
+    assert spending_by_category(operations_df, "Еда", date_r) == spending_by_category(operations_df, "Еда")
+
+
+def test_spending_by_categories_matches_single_calls(operations_df):
+    dates = ["2025-04-15", "2025-03-20", "2025-01-15 12:00:00", "2024-01-01"]
+    categories = ["Еда", "Транспорт", "Канцтовары"]
+
+    result = json.loads(spending_by_categories(operations_df, categories, dates))
+
+    assert result["2025-04-15"] == {"Еда": 45.0}
+    assert result["2024-01-01"] == {}
+    for date in dates:
+        for category in categories:
+            single = json.loads(spending_by_category(operations=operations_df, category=category, date_r=date))
+            assert single == {name: value for name, value in result[date].items() if name == category}
+
+
+def test_spending_by_categories_all_categories_and_chunks(operations_df):
+    chunks = iter([operations_df.iloc[:3], operations_df.iloc[3:]])
+
+    result = json.loads(spending_by_categories(chunks, None, ["2025-04-16"]))
+
+    assert result == {"2025-04-16": {"Еда": 95.0}}
+
+
+def test_spending_by_category_memoized_and_logged(operations_df):
+    snapshot = Snapshot(operations_df, version="v1")
+
+    with patch("src.reports.get_cells", wraps=get_cells) as mock_get_cells, patch(
+        "builtins.open", mock_open()
+    ) as mock_file:
+        first = spending_by_category(snapshot, "Еда", "2025-04-15")
+        second = spending_by_category(snapshot, "Еда", "2025-04-15 00:00:00")
+
+    assert first == second == json.dumps({"Еда": 45.0}, ensure_ascii=False, indent=4)
+    assert mock_get_cells.call_count == 1
+    assert mock_file().write.call_count == 2
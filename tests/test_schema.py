@@ -0,0 +1,76 @@
+import json
+
+import pandas as pd
+
+from benchmarks.synthetic import make_operations
+from src.reports import spending_by_category
+from src.schema import is_normalized
+from src.schema import normalize_operations
+from src.services import get_cash_month
+from src.utils import get_cards
+from src.utils import get_filter_date_df
+from src.utils import get_top
+
+
+def make_raw_operations():
+    return pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2025 10:00:00", "15.01.2025 12:00:00"],
+            "Номер карты": ["*1111", "*2222"],
+            "Статус": ["OK", "FAILED"],
+            "Категория": ["Еда", "Транспорт"],
+            "Кэшбэк": [1, 2],
+            "MCC": [5411.0, 4111.0],
+        }
+    )
+
+
+def test_normalize_operations_types():
+    raw = make_raw_operations()
+
+    result = normalize_operations(raw)
+
+    assert result["Дата операции"].dtype == "datetime64[ns]"
+    assert result["Дата операции"][1] == pd.Timestamp("2025-01-15 12:00:00")
+    assert isinstance(result["Категория"].dtype, pd.CategoricalDtype)
+    assert isinstance(result["Номер карты"].dtype, pd.CategoricalDtype)
+    assert result["Кэшбэк"].dtype == "float64"
+    assert result["MCC"].dtype == "float64"
+    assert is_normalized(result)
+
+
+def test_normalize_operations_does_not_mutate_input():
+    raw = make_raw_operations()
+
+    normalize_operations(raw)
+
+    assert raw["Дата операции"].dtype == object
+    assert raw["Категория"].dtype == object
+
+
+def test_normalize_operations_idempotent():
+    normalized = normalize_operations(make_raw_operations())
+
+    assert normalize_operations(normalized) is normalized
+
+
+def test_normalize_operations_dayfirst_fallback():
+    raw = pd.DataFrame({"Дата операции": ["14.01.2025", "16.01.2025"]})
+
+    result = normalize_operations(raw)
+
+    assert list(result["Дата операции"]) == [pd.Timestamp("2025-01-14"), pd.Timestamp("2025-01-16")]
+
+
+def test_float32_amounts_serialize_to_json(monkeypatch):
+    monkeypatch.setattr("src.schema.config.AMOUNT_DTYPE", "float32")
+    operations = make_operations(2_000)
+    assert operations["Кэшбэк"].dtype == "float32"
+    df_filter_date = get_filter_date_df(operations, "2021-12-20 23:59:59")
+
+    top = get_top(df_filter_date)
+    assert all(type(row["amount"]) is float and row["amount"] == round(row["amount"], 2) for row in top)
+    json.dumps(get_cards(df_filter_date))
+    json.loads(get_cash_month(operations, 2021, 6))
+    spending = json.loads(spending_by_category(operations, "Супермаркеты", "2021-12-20"))
+    assert all(value == round(value, 2) for value in spending.values())
@@ -0,0 +1,83 @@
+import json
+import threading
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from src.server import DashboardServer
+
+
+@pytest.fixture
+def server_url():
+    store = MagicMock()
+    store.get.return_value = MagicMock(version="1.1-none", operations=[1, 2, 3])
+    server = DashboardServer(("127.0.0.1", 0), store=store, reload_interval=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", store
+    server.shutdown()
+    server.server_close()
+
+
+def test_server_health(server_url):
+    url, _ = server_url
+    response = requests.get(url + "/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert response.json()["version"] == "1.1-none"
+    assert response.json()["rows"] == 3
+
+
+@patch("src.server.str_main", return_value=json.dumps({"greeting": "Добрый день"}))
+def test_server_dashboard(mock_str_main, server_url):
+    url, _ = server_url
+    response = requests.get(url + "/dashboard", params={"date": "2021-12-20 12:00:00", "deadline": "1.5"})
+
+    assert response.status_code == 200
+    assert response.json() == {"greeting": "Добрый день"}
+    mock_str_main.assert_called_once_with("2021-12-20 12:00:00", 1.5)
+
+
+@patch("src.server.get_snapshot")
+@patch("src.server.get_cash_month", return_value=None)
+def test_server_cashback(mock_get_cash_month, mock_get_snapshot, server_url):
+    url, _ = server_url
+
+    assert requests.get(url + "/cashback", params={"year": "2021", "month": "x"}).status_code == 400
+    response = requests.get(url + "/cashback", params={"year": "2021", "month": "6"})
+
+    assert response.status_code == 404
+    mock_get_cash_month.assert_called_once_with(mock_get_snapshot.return_value, 2021, 6)
+
+
+@patch("src.server.get_snapshot")
+@patch("src.server.spending_by_category", return_value=json.dumps({"Супермаркеты": 10.0}))
+def test_server_spending(mock_spending, mock_get_snapshot, server_url):
+    url, _ = server_url
+
+    assert requests.get(url + "/spending").status_code == 400
+    response = requests.get(url + "/spending", params={"category": "Супермаркеты"})
+
+    assert response.json() == {"Супермаркеты": 10.0}
+    mock_spending.assert_called_once_with(mock_get_snapshot.return_value, "Супермаркеты", None)
+
+
+def test_server_unknown_path_and_reload(server_url):
+    url, store = server_url
+
+    assert requests.get(url + "/missing").status_code == 404
+    assert requests.post(url + "/reload").status_code == 200
+    store.refresh.assert_called()
+
+
+def test_server_metrics(server_url):
+    url, _ = server_url
+    requests.get(url + "/health")
+    response = requests.get(url + "/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert 'bank_dashboard_http_requests_total{path="/health",status="200"}' in response.text
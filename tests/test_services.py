@@ -1,7 +1,11 @@
 import json
 
 import pandas as pd
+import pytest
 
+from src.dataset import Snapshot
+from src.index import sort_by_date
+from src.schema import normalize_operations
 from src.services import get_cash_month
 
 
@@ -38,6 +42,18 @@ def test_get_cash_month_none_input():
     assert result is None
 
 
+@pytest.mark.parametrize("year, month", [(2025, 13), (2025, 0), (2025, -1)])
+def test_get_cash_month_month_out_of_range(year, month):
+    data = {
+        "Дата операции": ["01.02.2025 10:00:00"],
+        "Категория": ["Еда"],
+        "Кэшбэк": [10.0],
+        "Статус": ["OK"],
+    }
+
+    assert get_cash_month(pd.DataFrame(data), year, month) is None
+
+
 def test_get_cash_month_empty_filter():
     data = {
         "Дата операции": ["01.02.2025 10:00:00", "15.02.2025 12:00:00"],
@@ -52,3 +68,22 @@ def test_get_cash_month_empty_filter():
     result = get_cash_month(input_df.copy(), target_year, target_month)
 
     assert result is None
+
+
+def test_get_cash_month_snapshot_uses_cube():
+    data = {
+        "Дата операции": ["01.01.2025 10:00:00", "15.01.2025 12:00:00", "01.02.2025 09:00:00"],
+        "Категория": ["Еда", "Транспорт", "Еда"],
+        "Номер карты": ["*1111", "*1111", "*2222"],
+        "Сумма платежа": [-100.0, -200.0, -300.0],
+        "Сумма операции с округлением": [100.0, 200.0, 300.0],
+        "Кэшбэк": [10.0, 5.0, 20.0],
+        "Статус": ["OK", "OK", "OK"],
+    }
+    operations = sort_by_date(normalize_operations(pd.DataFrame(data)))
+    snapshot = Snapshot(operations, version="test")
+
+    result = get_cash_month(snapshot, 2025, 1)
+
+    assert result == json.dumps({"Еда": 10.0, "Транспорт": 5.0}, ensure_ascii=False, indent=4)
+    assert "cube" in snapshot.__dict__
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import config
+
+# С запасом на медленные машины CI: сейчас src.main импортируется за ~25 мс, а один pandas — за ~350 мс
+IMPORT_BUDGET_US = 250_000
+HEAVY_MODULES = ["pandas", "numpy", "requests", "dotenv", "openpyxl"]
+
+
+def imported_modules(module: str) -> set:
+    """
+    Модули, загруженные в чистом интерпретаторе после import module
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        cwd=config.PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def import_times(module: str) -> dict:
+    """
+    Накопленное время импорта каждого модуля (мкс) по выводу python -X importtime
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=config.PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_main_does_not_import_heavy_modules():
+    modules = imported_modules("src.main")
+
+    assert "src.main" in modules
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+def test_main_imports_within_budget():
+    times = import_times("src.main")
+
+    assert times["src.main"] < IMPORT_BUDGET_US
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.store import OperationsStore
+
+
+@patch("src.store.read_excel")
+def test_store_loads_lazily_once(mock_read_excel, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    mock_read_excel.return_value = pd.DataFrame({"col1": [1, 2]})
+
+    store = OperationsStore(str(path_xl))
+    mock_read_excel.assert_not_called()
+
+    first = store.get()
+    second = store.get()
+
+    assert first is second
+    mock_read_excel.assert_called_once_with(str(path_xl), use_cache=True)
+
+
+@patch("src.store.read_excel")
+def test_store_reloads_on_file_change(mock_read_excel, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    mock_read_excel.side_effect = [pd.DataFrame({"col1": [1]}), pd.DataFrame({"col1": [2]})]
+
+    store = OperationsStore(str(path_xl))
+    first = store.get()
+    stat = os.stat(path_xl)
+    os.utime(path_xl, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with patch("src.store.threading.Thread") as mock_thread:
+        assert store.get() is first
+        mock_thread.call_args.kwargs["target"]()
+    second = store.get()
+
+    assert first is not second
+    assert mock_read_excel.call_count == 2
+
+
+@patch("src.store.read_excel")
+def test_store_get_does_not_wait_for_reload(mock_read_excel, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_read(*_, **__):
+        loading.set()
+        release.wait(5)
+        return pd.DataFrame({"col1": [2]})
+
+    mock_read_excel.return_value = pd.DataFrame({"col1": [1]})
+    store = OperationsStore(str(path_xl))
+    first = store.get()
+    stat = os.stat(path_xl)
+    os.utime(path_xl, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    mock_read_excel.side_effect = slow_read
+
+    try:
+        assert store.get() is first
+        assert loading.wait(5)
+        assert store.get() is first
+    finally:
+        release.set()
+    for _ in range(100):
+        if store.get() is not first:
+            break
+        time.sleep(0.01)
+
+    assert store.get() is not first
+    assert mock_read_excel.call_count == 2
+
+
+@patch("src.store.read_excel")
+def test_store_first_load_once_for_concurrent_readers(mock_read_excel, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    mock_read_excel.side_effect = lambda *_, **__: time.sleep(0.05) or pd.DataFrame({"col1": [1]})
+    store = OperationsStore(str(path_xl))
+
+    snapshots = []
+    threads = [threading.Thread(target=lambda: snapshots.append(store.get())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(snapshots) == 4 and all(snapshot is snapshots[0] for snapshot in snapshots)
+    mock_read_excel.assert_called_once()
+
+
+@patch("src.store.read_excel")
+def test_store_invalidate(mock_read_excel, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    mock_read_excel.return_value = pd.DataFrame({"col1": [1]})
+
+    store = OperationsStore(str(path_xl))
+    store.get()
+    store.invalidate()
+    store.get()
+
+    assert mock_read_excel.call_count == 2
+
+
+@patch("src.store.read_excel")
+def test_store_refresh_keeps_old_snapshot_on_failure(mock_read_excel, tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    path_xl.write_bytes(b"data")
+    mock_read_excel.side_effect = [pd.DataFrame({"col1": [1]}), ValueError("half-written file")]
+
+    store = OperationsStore(str(path_xl))
+    first = store.get()
+    assert store.refresh() is False
+
+    stat = os.stat(path_xl)
+    os.utime(path_xl, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.refresh() is False
+    assert store._snapshot is first
+
+    mock_read_excel.side_effect = [pd.DataFrame({"col1": [2]})]
+    assert store.refresh() is True
+    assert store.get() is not first
+    assert mock_read_excel.call_count == 3
+
+
+@patch("src.store.read_excel")
+def test_store_version_depends_on_path(mock_read_excel, tmp_path):
+    mock_read_excel.return_value = pd.DataFrame({"col1": [1]})
+    versions = []
+    for name in ("first.xlsx", "second.xlsx"):
+        path_xl = tmp_path / name
+        path_xl.write_bytes(b"data")
+        os.utime(path_xl, ns=(0, 10**9))
+        versions.append(OperationsStore(str(path_xl)).get().version)
+
+    assert versions[0] != versions[1]
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from src.topk import grouped_top_positions
+from src.topk import top_positions
+
+
+@pytest.mark.parametrize(
+    "values, k, expected",
+    [
+        ([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0], 3, [5, 7, 4]),
+        ([2.0, 5.0, 2.0, 2.0, 1.0], 3, [1, 0, 2]),
+        ([1.0, np.nan, 3.0, np.nan], 3, [2, 0, 1]),
+        ([1.0, 2.0], 5, [1, 0]),
+        ([1.0, 2.0], 0, []),
+        ([], 3, []),
+    ],
+)
+def test_top_positions(values, k, expected):
+    assert top_positions(np.array(values), k).tolist() == expected
+
+
+def test_top_positions_matches_stable_sort():
+    values = np.random.default_rng(0).integers(0, 50, 10_000).astype(float)
+
+    expected = np.argsort(-values, kind="stable")[:100]
+
+    assert top_positions(values, 100).tolist() == expected.tolist()
+
+
+def test_grouped_top_positions():
+    codes = np.array([0, 1, 0, -1, 1, 0, 2])
+    values = np.array([5.0, 1.0, 7.0, 100.0, 3.0, 7.0, 2.0])
+
+    result = grouped_top_positions(codes, values, 2)
+
+    assert {code: positions.tolist() for code, positions in result.items()} == {0: [2, 5], 1: [4, 1], 2: [6]}
@@ -1,16 +1,24 @@
 import json
+import time
 from unittest.mock import Mock
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
+import requests
 from freezegun import freeze_time
 
+import config
+from src.utils import cross_rate
 from src.utils import get_cards
 from src.utils import get_currency
 from src.utils import get_filter_date_df
+from src.utils import get_session
 from src.utils import get_stock
 from src.utils import get_time_greeting
 from src.utils import get_top
+from src.utils import get_top_grouped
+from src.utils import iter_excel
 from src.utils import load_json
 from src.utils import read_excel
 
@@ -177,6 +185,46 @@ def test_get_top_none_input():
     assert result is None
 
 
+@pytest.fixture
+def top_df():
+    return pd.DataFrame(
+        {
+            "Дата операции": pd.to_datetime(
+                ["2025-01-05", "2025-01-01", "2025-02-03", "2025-02-06", "2025-02-02", "2025-01-04"]
+            ),
+            "Номер карты": ["*1111", "*2222", "*1111", "*1111", "*2222", "*1111"],
+            "Сумма платежа": [-10.0, -50.0, -20.0, -60.0, -30.0, -999.0],
+            "Сумма операции с округлением": [10.0, 50.0, 20.0, 60.0, 30.0, 999.0],
+            "Категория": ["Еда", "Транспорт", "Еда", "Покупки", "Еда", "Зарплата"],
+            "Описание": ["Обед", "Метро", "Кафе", "Кроссовки", "Ужин", "Аванс"],
+            "Статус": ["OK", "OK", "OK", "OK", "OK", "FAIL"],
+        }
+    )
+
+
+def test_get_top_chunks_match_frame(top_df):
+    chunks = iter([top_df.iloc[:2], top_df.iloc[2:4], top_df.iloc[4:]])
+
+    assert get_top(chunks, top=3) == get_top(top_df, top=3)
+    assert get_top(iter([]), top=3) == []
+
+
+def test_get_top_grouped(top_df):
+    result = get_top_grouped(top_df, top=1)
+
+    assert result["Номер карты"] == {
+        "*1111": [{"date": "06.02.2025", "amount": -60.0, "category": "Покупки", "description": "Кроссовки"}],
+        "*2222": [{"date": "01.01.2025", "amount": -50.0, "category": "Транспорт", "description": "Метро"}],
+    }
+    assert [record["description"] for record in result["Категория"]["Еда"]] == ["Ужин"]
+    assert set(result["Категория"]) == {"Еда", "Транспорт", "Покупки"}
+    assert {month: records[0]["description"] for month, records in result["month"].items()} == {
+        "2025-01": "Метро",
+        "2025-02": "Кроссовки",
+    }
+    assert get_top_grouped(None) is None
+
+
 def test_load_json_with_tmp(tmp_path):
     test_file = tmp_path / "test_file_json"
 
@@ -204,28 +252,32 @@ def test_file_not_empty(mock_exists, mock_getsize):
     mock_getsize.assert_called_with("empty_file_json")
 
 
-def test_get_currency_success():
-    input_settings = {"user_currencies": ["USD", "EUR"]}
+def make_response(status_code, payload=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
 
-    mock_resp_usd = Mock()
-    mock_resp_usd.status_code = 200
-    mock_resp_usd.json.return_value = {"query": {"from": "USD"}, "result": 90.12345}
 
-    mock_resp_eur = Mock()
-    mock_resp_eur.status_code = 200
-    mock_resp_eur.json.return_value = {"query": {"from": "EUR"}, "result": 100.45678}
+@patch("src.utils.url_c", "https://fx.example")
+@patch("src.utils.get_session")
+def test_get_currency_success(mock_get_session):
+    input_settings = {"user_currencies": ["USD", "EUR"]}
+
+    responses = {
+        "USD": make_response(200, {"query": {"from": "USD"}, "result": 90.12345}),
+        "EUR": make_response(200, {"query": {"from": "EUR"}, "result": 100.45678}),
+    }
+    mock_get_session.return_value.get.side_effect = lambda url, headers, params, timeout: responses[params["from"]]
 
     expected_result = [
         {"currency": "USD", "rate": 90.12},  # Округлено до 2 знаков
         {"currency": "EUR", "rate": 100.46},
     ]
 
-    with patch("requests.get") as mock_get:
-        mock_get.side_effect = [mock_resp_usd, mock_resp_eur]
-
-        result = get_currency(input_settings)
-        assert result == expected_result
-        assert mock_get.call_count == 2
+    result = get_currency(input_settings)
+    assert result == expected_result
+    assert mock_get_session.return_value.get.call_count == 2
 
 
 def test_get_currency_none_input():
@@ -243,39 +295,94 @@ def test_get_currency_url_none():
         assert result is None
 
 
-def test_get_currency_api_error_status():
+@patch("src.utils.url_c", "https://fx.example")
+@patch("src.utils.get_session")
+def test_get_currency_api_error_status(mock_get_session):
+    input_settings = {"user_currencies": ["USD", "EUR"]}
+
+    mock_get_session.return_value.get.side_effect = lambda url, headers, params, timeout: (
+        make_response(403) if params["from"] == "EUR" else make_response(200, {"query": {"from": "USD"}, "result": 1})
+    )
+
+    result = get_currency(input_settings)
+
+    assert result is None
+
+
+@patch("src.utils.url_c", "https://fx.example")
+@patch("src.utils.get_session")
+def test_get_currency_timeout(mock_get_session):
     input_settings = {"user_currencies": ["USD"]}
+    mock_get_session.return_value.get.side_effect = requests.Timeout("timed out")
 
-    mock_resp_error = Mock()
-    mock_resp_error.status_code = 403
+    result = get_currency(input_settings)
 
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = mock_resp_error
+    assert result is None
+    assert mock_get_session.return_value.get.call_args.kwargs["timeout"] == config.HTTP_TIMEOUT
 
-        result = get_currency(input_settings)
 
-        assert result is None
+@patch("src.utils.url_c_batch", "https://fx.example/latest")
+@patch("src.utils.get_session")
+def test_get_currency_batch_with_cross_rates(mock_get_session):
+    input_settings = {"user_currencies": ["USD", "EUR"], "user_currency_pairs": ["USD/EUR"]}
+    mock_get_session.return_value.get.return_value = make_response(
+        200, {"base": "RUB", "rates": {"USD": 0.0125, "EUR": 0.01, "CNY": 0.08}}
+    )
 
+    result = get_currency(input_settings)
 
-def test_get_stock_success():
-    input_settings = {"user_stocks": ["AAPL", "GOOG"]}
+    assert result == [
+        {"currency": "USD", "rate": 80.0},
+        {"currency": "EUR", "rate": 100.0},
+        {"currency": "USD/EUR", "rate": 0.8},
+    ]
+    assert mock_get_session.return_value.get.call_count == 1
 
-    mock_resp_aapl = Mock()
-    mock_resp_aapl.status_code = 200
-    mock_resp_aapl.json.return_value = {"Global Quote": {"01. symbol": "AAPL", "05. price": "175.5567"}}
 
-    mock_resp_goog = Mock()
-    mock_resp_goog.status_code = 200
-    mock_resp_goog.json.return_value = {"Global Quote": {"01. symbol": "GOOG", "05. price": "140.1234"}}
+@patch("src.utils.url_c", "https://fx.example")
+@patch("src.utils.url_c_batch", "https://fx.example/latest")
+@patch("src.utils.get_session")
+def test_get_currency_batch_falls_back_to_pairs(mock_get_session):
+    input_settings = {"user_currencies": ["USD"]}
 
-    expected_result = [{"stock": "AAPL", "price": 175.56}, {"stock": "GOOG", "price": 140.12}]
+    def get(url, headers, params, timeout):
+        if url.endswith("latest"):
+            return make_response(404)
+        return make_response(200, {"query": {"from": "USD"}, "result": 90.12345})
 
-    with patch("requests.get") as mock_get:
-        mock_get.side_effect = [mock_resp_aapl, mock_resp_goog]
+    mock_get_session.return_value.get.side_effect = get
+
+    result = get_currency(input_settings)
+
+    assert result == [{"currency": "USD", "rate": 90.12}]
+    assert mock_get_session.return_value.get.call_count == 2
 
-        result = get_stock(input_settings)
-        assert result == expected_result
-        assert mock_get.call_count == 2
+
+def test_cross_rate():
+    table = {"base": "RUB", "rates": {"USD": 0.0125, "EUR": 0.01}}
+
+    assert cross_rate(table, "USD", "RUB") == 80.0
+    assert cross_rate(table, "RUB", "EUR") == 0.01
+    assert cross_rate(table, "EUR", "USD") == 1.25
+    assert cross_rate(table, "TRY", "USD") is None
+
+
+@patch("src.utils.url_s", "https://stocks.example")
+@patch("src.utils.get_session")
+def test_get_stock_success(mock_get_session):
+    input_settings = {"user_stocks": ["AAPL", "GOOG"]}
+
+    responses = {
+        "AAPL": make_response(200, {"Global Quote": {"01. symbol": "AAPL", "05. price": "175.5567"}}),
+        "GOOG": make_response(200, {"Global Quote": {"01. symbol": "GOOG", "05. price": "140.1234"}}),
+    }
+    mock_get_session.return_value.get.side_effect = lambda url, params, timeout: responses[params["symbol"]]
+
+    expected_result = [{"stock": "AAPL", "price": 175.56}, {"stock": "GOOG", "price": 140.12}]
+
+    result = get_stock(input_settings)
+    assert result == expected_result
+    assert mock_get_session.return_value.get.call_count == 2
 
 
 def test_get_stock_none_input():
@@ -293,13 +400,76 @@ def test_get_stock_url_none():
         assert result is None
 
 
-def test_get_stock_api_error_status():
+@patch("src.utils.url_s", "https://stocks.example")
+@patch("src.utils.get_session")
+def test_get_stock_api_error_status(mock_get_session):
     input_settings = {"user_stocks": ["AAPL"]}
 
-    mock_resp_error = Mock()
-    mock_resp_error.status_code = 500
+    mock_get_session.return_value.get.return_value = make_response(500)
 
-    with patch("requests.get") as _:
-        result = get_stock(input_settings)
+    result = get_stock(input_settings)
 
-        assert result is None
+    assert result is None
+
+
+@patch("src.utils.url_s", "https://stocks.example")
+@patch("src.utils.get_session")
+def test_get_stock_runs_concurrently(mock_get_session):
+    input_settings = {"user_stocks": ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]}
+
+    def slow_get(url, params, timeout):
+        time.sleep(0.2)
+        return make_response(200, {"Global Quote": {"01. symbol": params["symbol"], "05. price": "1"}})
+
+    mock_get_session.return_value.get.side_effect = slow_get
+
+    start = time.perf_counter()
+    result = get_stock(input_settings)
+
+    assert time.perf_counter() - start < 0.6
+    assert [item["stock"] for item in result] == input_settings["user_stocks"]
+
+
+def test_get_session_is_shared():
+    assert get_session() is get_session()
+
+
+def test_iter_excel_chunks(tmp_path):
+    path_xl = tmp_path / "operations.xlsx"
+    pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2025 10:00:00", "15.01.2025 12:00:00", "31.01.2025 14:00:00"],
+            "Номер карты": ["*1111", "*1111", "*2222"],
+            "Сумма платежа": [-50.0, -100.0, -20.0],
+        }
+    ).to_excel(path_xl, index=False)
+
+    chunks = list(iter_excel(str(path_xl), chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[1]["Дата операции"][0] == pd.Timestamp("2025-01-31 14:00:00")
+    assert isinstance(chunks[0]["Номер карты"].dtype, pd.CategoricalDtype)
+
+
+def test_iter_excel_file_not_exists():
+    assert list(iter_excel("invalid_path.xlsx")) == []
+
+
+def test_get_cards_chunks_match_frame():
+    data = {
+        "Номер карты": ["*1111", "*1111", "*2222", "*2222", "*3333"],
+        "Сумма платежа": [-50.0, -100.0, -20.0, 50.0, -30.0],
+        "Сумма операции с округлением": [50.0, 100.0, 20.0, 50.0, 30.0],
+        "Кэшбэк": [1.5, 3.0, 0.5, 0.0, 1.0],
+        "Статус": ["OK", "OK", "OK", "OK", "FAIL"],
+    }
+    input_df = pd.DataFrame(data)
+
+    result = get_cards(iter([input_df[:2], input_df[2:]]))
+
+    assert result == get_cards(input_df)
+
+
+def test_get_cards_rejects_chunks_with_date():
+    with pytest.raises(TypeError):
+        get_cards(iter([pd.DataFrame()]), date="2021-12-20 23:59:59")
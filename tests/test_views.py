@@ -1,26 +1,28 @@
 import json
-import sys
+import threading
+import time
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pandas as pd
 
-mock_config_object = MagicMock()
-mock_config_object.PATH_TO_OPERATIONS = "fake_ops_path.xlsx"
-mock_config_object.PATH_TO_USER_SETTINGS = "fake_settings_path.json"
+import config
+from src.views import logger_views
+from src.views import str_main
 
 
-@patch("src.utils.get_stock")
-@patch("src.utils.get_currency")
-@patch("src.utils.load_json")
-@patch("src.utils.get_top")
-@patch("src.utils.get_cards")
-@patch("src.utils.get_filter_date_df")
-@patch("src.utils.read_excel")
-@patch("src.utils.get_time_greeting")
+@patch("src.views.config.PATH_TO_USER_SETTINGS", "fake_settings_path.json")
+@patch("src.views.get_stock")
+@patch("src.views.get_currency")
+@patch("src.views.load_json")
+@patch("src.views.get_top")
+@patch("src.views.get_cards")
+@patch("src.views.get_filter_date_df")
+@patch("src.views.get_snapshot")
+@patch("src.views.get_time_greeting")
 def test_main_function_success(
     mock_get_time_greeting,
-    mock_read_excel,
+    mock_get_snapshot,
     mock_get_filter_date_df,
     mock_get_cards,
     mock_get_top,
@@ -28,47 +30,103 @@ def test_main_function_success(
     mock_get_currency,
     mock_get_stock,
 ):
-    with patch.dict(sys.modules, {"config": mock_config_object}):
-        from src.views import logger_views
-        from src.views import str_main
-
-        with patch.object(logger_views, "info") as mock_logger_info, patch.object(
-            logger_views, "error"
-        ) as mock_logger_error:
-            mock_get_time_greeting.return_value = "Добрый день"
-            mock_excel_df = MagicMock(spec=pd.DataFrame)
-            mock_filtered_df = MagicMock(spec=pd.DataFrame)
-            mock_read_excel.return_value = mock_excel_df
-            mock_get_filter_date_df.return_value = mock_filtered_df
-            mock_get_cards.return_value = [{"last_digits": "1234", "total_spent": -1500.0, "cashback": 45.0}]
-            mock_get_top.return_value = [
-                {"date": "20.05.2020", "amount": 200.0, "category": "Еда", "description": "Обед"}
-            ]
-            mock_user_settings = MagicMock(spec=dict)
-            mock_load_json.return_value = mock_user_settings
-            mock_get_currency.return_value = [{"currency": "USD", "rate": 90.0}]
-            mock_get_stock.return_value = [{"stock": "AAPL", "price": 150.0}]
-
-            test_date = "2020-05-20 15:30:00"
-            result_json = str_main(date=test_date)
-
-            mock_logger_info.assert_called_once_with(f"Function run for {test_date}")
-            mock_get_time_greeting.assert_called_once()
-            mock_read_excel.assert_called_once_with("fake_ops_path.xlsx")
-            mock_get_filter_date_df.assert_called_once_with(mock_excel_df, test_date)
-            mock_get_cards.assert_called_once_with(mock_filtered_df)
-            mock_get_top.assert_called_once_with(mock_filtered_df)
-            mock_load_json.assert_called_once_with("fake_settings_path.json")
-            mock_get_currency.assert_called_once_with(mock_user_settings)
-            mock_get_stock.assert_called_once_with(mock_user_settings)
-
-            expected_result_dict = {
-                "greeting": "Добрый день",
-                "cards": [{"last_digits": "1234", "total_spent": -1500.0, "cashback": 45.0}],
-                "top_transactions": [
-                    {"date": "20.05.2020", "amount": 200.0, "category": "Еда", "description": "Обед"}
-                ],
-                "currency_rates": [{"currency": "USD", "rate": 90.0}],
-                "stock_prices": [{"stock": "AAPL", "price": 150.0}],
-            }
-            assert json.loads(result_json) == expected_result_dict
+    with patch.object(logger_views, "info") as mock_logger_info, patch.object(
+        logger_views, "error"
+    ) as mock_logger_error:
+        mock_get_time_greeting.return_value = "Добрый день"
+        mock_excel_df = MagicMock(spec=pd.DataFrame)
+        mock_filtered_df = MagicMock(spec=pd.DataFrame)
+        mock_get_snapshot.return_value = mock_excel_df
+        mock_get_filter_date_df.return_value = mock_filtered_df
+        mock_get_cards.return_value = [{"last_digits": "1234", "total_spent": -1500.0, "cashback": 45.0}]
+        mock_get_top.return_value = [{"date": "20.05.2020", "amount": 200.0, "category": "Еда", "description": "Обед"}]
+        mock_user_settings = MagicMock(spec=dict)
+        mock_load_json.return_value = mock_user_settings
+        mock_get_currency.return_value = [{"currency": "USD", "rate": 90.0}]
+        mock_get_stock.return_value = [{"stock": "AAPL", "price": 150.0}]
+
+        test_date = "2020-05-20 15:30:00"
+        result_json = str_main(date=test_date)
+
+        mock_logger_info.assert_called_once_with("Function run for %s", test_date)
+        mock_get_time_greeting.assert_called_once()
+        mock_get_snapshot.assert_called_once_with()
+        mock_get_filter_date_df.assert_called_once_with(mock_excel_df, test_date)
+        mock_get_cards.assert_called_once_with(mock_excel_df, date=test_date)
+        mock_get_top.assert_called_once_with(mock_filtered_df)
+        mock_load_json.assert_called_once_with("fake_settings_path.json")
+        mock_get_currency.assert_called_once_with(mock_user_settings)
+        mock_get_stock.assert_called_once_with(mock_user_settings)
+
+        expected_result_dict = {
+            "greeting": "Добрый день",
+            "cards": [{"last_digits": "1234", "total_spent": -1500.0, "cashback": 45.0}],
+            "top_transactions": [{"date": "20.05.2020", "amount": 200.0, "category": "Еда", "description": "Обед"}],
+            "currency_rates": [{"currency": "USD", "rate": 90.0}],
+            "stock_prices": [{"stock": "AAPL", "price": 150.0}],
+            "missing": [],
+        }
+        result = json.loads(result_json)
+        timings = result.pop("timings")
+        assert result == expected_result_dict
+        assert set(timings) >= {"greeting", "operations", "cards_top", "currency_rates", "stock_prices", "total"}
+        mock_logger_error.assert_not_called()
+
+
+@patch("src.views.load_json", return_value={})
+@patch("src.views.get_top", return_value=[])
+@patch("src.views.get_cards", return_value=[])
+@patch("src.views.get_filter_date_df")
+@patch("src.views.get_snapshot")
+@patch("src.views.get_time_greeting", return_value="Добрый день")
+def test_main_function_deadline(*_):
+    def slow_stock(_):
+        time.sleep(2)
+        return [{"stock": "AAPL", "price": 150.0}]
+
+    def failing_currency(_):
+        raise ValueError("API недоступен")
+
+    with patch("src.views.get_stock", side_effect=slow_stock), patch(
+        "src.views.get_currency", side_effect=failing_currency
+    ):
+        started = time.perf_counter()
+        result = json.loads(str_main("2020-05-20 15:30:00", deadline=0.2))
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 1
+    assert result["greeting"] == "Добрый день"
+    assert result["cards"] == []
+    assert result["currency_rates"] is None
+    assert result["stock_prices"] is None
+    assert result["missing"] == ["currency_rates", "stock_prices"]
+
+
+@patch("src.views.load_json", return_value={})
+@patch("src.views.get_currency", return_value=[])
+@patch("src.views.get_top", return_value=[])
+@patch("src.views.get_cards", return_value=[])
+@patch("src.views.get_filter_date_df")
+@patch("src.views.get_snapshot")
+@patch("src.views.get_time_greeting", return_value="Добрый день")
+def test_main_function_hung_api_does_not_block_other_sections(*_):
+    release = threading.Event()
+
+    def hanging_stock(_):
+        release.wait(10)
+        return []
+
+    n_requests = config.DASHBOARD_MAX_WORKERS + 2 * config.DASHBOARD_API_WORKERS + 1
+    try:
+        with patch("src.views.get_stock", side_effect=hanging_stock):
+            results = [json.loads(str_main("2020-05-20 15:30:00", deadline=0.2)) for _ in range(n_requests)]
+        stock_threads = [thread for thread in threading.enumerate() if thread.name.startswith("str_main_stock")]
+    finally:
+        release.set()
+
+    for result in results:
+        assert result["cards"] == []
+        assert result["top_transactions"] == []
+        assert result["currency_rates"] == []
+        assert result["missing"] == ["stock_prices"]
+    assert len(stock_threads) <= config.DASHBOARD_API_WORKERS